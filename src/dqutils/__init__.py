@@ -11,17 +11,68 @@ This package contains the following sub-packages:
 
 import sys
 from argparse import ArgumentParser
-from collections.abc import Callable, Iterable
-from typing import NamedTuple
+from collections.abc import Callable, Iterable, Mapping
+from importlib import import_module
+from typing import Any, NamedTuple
 
 # Release data
 from dqutils.release import __version__
+from dqutils.writer import WRITERS
+
+
+class Argument(NamedTuple):
+    flags: tuple[str, ...]
+    options: Mapping[str, Any]
 
 
 class Command(NamedTuple):
     name: str
     help: str
-    func: Callable
+    func: Callable | str
+    """The function, or its name such as ``"dqutils.dq6.string:print_all"``
+    to import it only when the command runs."""
+    arguments: tuple[Argument, ...] = ()
+
+
+JOBS_ARGUMENT = Argument(
+    ("-j", "--jobs"),
+    {
+        "type": int,
+        "default": 1,
+        "metavar": "N",
+        "help": "decode with N worker processes (default: 1); with the cache, they create a missing cache file",
+    },
+)
+
+STATS_ARGUMENT = Argument(
+    ("--stats",),
+    {"action": "store_true", "help": "print statistics of decoding to stderr in JSON"},
+)
+
+NO_CACHE_ARGUMENT = Argument(
+    ("--no-cache",),
+    {"dest": "cache", "action": "store_false", "help": "decode messages without the cache of decoded messages"},
+)
+
+FORMAT_ARGUMENT = Argument(
+    ("--format",),
+    {
+        "dest": "output_format",
+        "choices": tuple(WRITERS),
+        "default": "text",
+        "help": "the output format (default: text)",
+    },
+)
+
+TEXT_ARGUMENT = Argument(
+    ("text",),
+    {"help": "the text to search for"},
+)
+
+PATH_ARGUMENT = Argument(
+    ("path",),
+    {"help": "the path to the database file"},
+)
 
 
 def run(commands: Iterable[Command]) -> None:
@@ -42,6 +93,22 @@ def run(commands: Iterable[Command]) -> None:
     for i in commands:
         subp = subparsers.add_parser(i.name, help=i.help)
         subp.set_defaults(func=i.func)
+        for arg in i.arguments:
+            subp.add_argument(*arg.flags, **arg.options)
+        subp.add_argument(*STATS_ARGUMENT.flags, **STATS_ARGUMENT.options)
+
+    options = vars(parser.parse_args(sys.argv[1:] or ["--help"]))
+    func = options.pop("func")
+    if isinstance(func, str):
+        module, _, name = func.partition(":")
+        func = getattr(import_module(module), name)
+
+    if not options.pop("stats"):
+        func(**options)
+        return
+
+    from dqutils.stats import collect_stats  # noqa: PLC0415
 
-    options = parser.parse_args(sys.argv[1:] or ["--help"])
-    options.func()
+    with collect_stats() as stats:
+        func(**options)
+    print(stats.to_json(), file=sys.stderr)
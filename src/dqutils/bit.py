@@ -8,8 +8,11 @@ from itertools import islice
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    import mmap
     from collections.abc import Iterable
 
+    type BufferT = bytes | bytearray | memoryview | mmap.mmap
+
 
 def get_bits(byte_seq: bytes | bytearray | Iterable[int], index: int, mask: int) -> int:
     """Obtain specified bits as an integer value from a sequence of
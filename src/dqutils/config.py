@@ -7,14 +7,16 @@ from __future__ import annotations
 
 import os
 import sys
-from configparser import ConfigParser
+from functools import cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Self
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
+    from configparser import ConfigParser
 
 
+@cache
 def get_config() -> ConfigParser | None:
     """Return configuration data from :file:`config`.
 
@@ -23,9 +25,10 @@ def get_config() -> ConfigParser | None:
     read from it and returned. Otherwise, an empty parser will be
     returned.
 
-    Once configuration data is read and parsed, the data is cached
-    internally and will be reused after the second invocation of
-    :func:`get_config`.
+    The file is not read until the first invocation of
+    :func:`get_config`. Once configuration data is read and parsed,
+    the data is cached internally and will be reused after the second
+    invocation.
 
     An example of the contents of :file:`config` is as follows::
 
@@ -40,12 +43,17 @@ def get_config() -> ConfigParser | None:
         An object of the main configuration parser.
     """
 
-    return _CONFIG
+    try:
+        return _load_conf()
+    except ConfigNotFoundError:
+        return None
 
 
 def _load_conf() -> ConfigParser:
     """Read and parse configuration data from :file:`config`."""
 
+    from configparser import ConfigParser  # noqa: PLC0415
+
     with (confdir_home() / "config").open() as fin:
         confparser = ConfigParser()
         confparser.read_file(fin)
@@ -90,12 +98,5 @@ def confdir_home() -> Path:
     raise ConfigNotFoundError
 
 
-_CONFIG: ConfigParser | None
-try:
-    _CONFIG = _load_conf()
-except ConfigNotFoundError:
-    _CONFIG = None
-
-
 if __name__ == "__main__":
     sys.exit(1 if get_config() else 0)
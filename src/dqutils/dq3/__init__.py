@@ -1,17 +1,55 @@
 """This is the dqutils (Dragon Quest Utilities) dq3 subpackage."""
 
-from dqutils import Command, run
-from dqutils.dq3.message import print_all_battle, print_all_scenario
-from dqutils.dq3.string import print_all
+from dqutils import (
+    FORMAT_ARGUMENT,
+    JOBS_ARGUMENT,
+    NO_CACHE_ARGUMENT,
+    PATH_ARGUMENT,
+    TEXT_ARGUMENT,
+    Command,
+    run,
+)
 
 
 def main() -> None:
     """See :code:`python -m dqutils.dq3 --help`."""
 
     commands = (
-        Command(name="print-scenario-messages", help="print messages", func=print_all_scenario),
-        Command(name="print-battle-messages", help="print messages", func=print_all_battle),
-        Command(name="print-strings", help="print strings", func=print_all),
+        Command(
+            name="print-scenario-messages",
+            help="print messages",
+            func="dqutils.dq3.message:print_all_scenario",
+            arguments=(JOBS_ARGUMENT, NO_CACHE_ARGUMENT, FORMAT_ARGUMENT),
+        ),
+        Command(
+            name="update-message-cache",
+            help="update the cache of messages and print the IDs of changed ones",
+            func="dqutils.dq3.message:print_changed_scenario",
+        ),
+        Command(
+            name="search-scenario-messages",
+            help="print messages that contain a text",
+            func="dqutils.dq3.message:print_search_scenario",
+            arguments=(TEXT_ARGUMENT,),
+        ),
+        Command(
+            name="print-battle-messages",
+            help="print messages",
+            func="dqutils.dq3.message:print_all_battle",
+            arguments=(FORMAT_ARGUMENT,),
+        ),
+        Command(
+            name="print-strings",
+            help="print strings",
+            func="dqutils.dq3.string:print_all",
+            arguments=(FORMAT_ARGUMENT,),
+        ),
+        Command(
+            name="export-sqlite",
+            help="write all messages and strings to an SQLite database",
+            func="dqutils.dq3.export:export_sqlite",
+            arguments=(PATH_ARGUMENT,),
+        ),
     )
 
     run(commands)
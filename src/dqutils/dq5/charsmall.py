@@ -11,6 +11,7 @@ References
 # ruff: noqa: RUF001
 from __future__ import annotations
 
+import re
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -276,12 +277,79 @@ CHARMAP: Final[dict[int, str]] = {
 }
 
 
+_COMPOSED_KANA: Final[dict[str, str]] = {
+    "゜は": "ぱ",
+    "゜ひ": "ぴ",
+    "゜ふ": "ぷ",
+    "゜へ": "ぺ",
+    "゜ほ": "ぽ",
+    "゜ハ": "パ",
+    "゜ヒ": "ピ",
+    "゜フ": "プ",
+    "゜ヘ": "ペ",
+    "゜ホ": "ポ",
+    "゛か": "が",
+    "゛き": "ぎ",
+    "゛く": "ぐ",
+    "゛け": "げ",
+    "゛こ": "ご",
+    "゛さ": "ざ",
+    "゛し": "じ",
+    "゛す": "ず",
+    "゛せ": "ぜ",
+    "゛そ": "ぞ",
+    "゛た": "だ",
+    "゛ち": "ぢ",
+    "゛つ": "づ",
+    "゛て": "で",
+    "゛と": "ど",
+    "゛は": "ば",
+    "゛ひ": "び",
+    "゛ふ": "ぶ",
+    "゛へ": "べ",
+    "゛ほ": "ぼ",
+    "゛カ": "ガ",
+    "゛キ": "ギ",
+    "゛ク": "グ",
+    "゛ケ": "ゲ",
+    "゛コ": "ゴ",
+    "゛サ": "ザ",
+    "゛シ": "ジ",
+    "゛ス": "ズ",
+    "゛セ": "ゼ",
+    "゛ソ": "ゾ",
+    "゛タ": "ダ",
+    "゛チ": "ヂ",
+    "゛ツ": "ヅ",
+    "゛テ": "デ",
+    "゛ト": "ド",
+    "゛ハ": "バ",
+    "゛ヒ": "ビ",
+    "゛フ": "ブ",
+    "゛ヘ": "ベ",
+    "゛ホ": "ボ",
+}
+"""The kana character for each pair of a dakuten character and a kana
+character."""
+
+_COMPOSED_KANA_PATTERN: Final[re.Pattern[str]] = re.compile(
+    "|".join(
+        f"{mark}[{''.join(i[1] for i in _COMPOSED_KANA if i[0] == mark)}]"
+        for mark in dict.fromkeys(i[0] for i in _COMPOSED_KANA)
+    )
+)
+
+
 def process_dakuten(text: str) -> str:
     """Convert single dakuten characters into regular kana characters.
 
     Combine all character pairs of a dakuten character followed by a kana
     character into the corresponding single kana character.
 
+    The text is scanned only once. No combined character is a part of
+    any pair, so that this is the same as replacing the pairs one by
+    one.
+
     Args:
       text (string): A text in Japanse.
 
@@ -289,60 +357,6 @@ def process_dakuten(text: str) -> str:
       (string): Processed text.
     """
 
-    if "゜" in text:
-        text = (
-            text.replace("゜は", "ぱ")
-            .replace("゜ひ", "ぴ")
-            .replace("゜ふ", "ぷ")
-            .replace("゜へ", "ぺ")
-            .replace("゜ほ", "ぽ")
-            .replace("゜ハ", "パ")
-            .replace("゜ヒ", "ピ")
-            .replace("゜フ", "プ")
-            .replace("゜ヘ", "ペ")
-            .replace("゜ホ", "ポ")
-        )
-    if "゛" in text:
-        text = (
-            text.replace("゛か", "が")
-            .replace("゛き", "ぎ")
-            .replace("゛く", "ぐ")
-            .replace("゛け", "げ")
-            .replace("゛こ", "ご")
-            .replace("゛さ", "ざ")
-            .replace("゛し", "じ")
-            .replace("゛す", "ず")
-            .replace("゛せ", "ぜ")
-            .replace("゛そ", "ぞ")
-            .replace("゛た", "だ")
-            .replace("゛ち", "ぢ")
-            .replace("゛つ", "づ")
-            .replace("゛て", "で")
-            .replace("゛と", "ど")
-            .replace("゛は", "ば")
-            .replace("゛ひ", "び")
-            .replace("゛ふ", "ぶ")
-            .replace("゛へ", "べ")
-            .replace("゛ほ", "ぼ")
-            .replace("゛カ", "ガ")
-            .replace("゛キ", "ギ")
-            .replace("゛ク", "グ")
-            .replace("゛ケ", "ゲ")
-            .replace("゛コ", "ゴ")
-            .replace("゛サ", "ザ")
-            .replace("゛シ", "ジ")
-            .replace("゛ス", "ズ")
-            .replace("゛セ", "ゼ")
-            .replace("゛ソ", "ゾ")
-            .replace("゛タ", "ダ")
-            .replace("゛チ", "ヂ")
-            .replace("゛ツ", "ヅ")
-            .replace("゛テ", "デ")
-            .replace("゛ト", "ド")
-            .replace("゛ハ", "バ")
-            .replace("゛ヒ", "ビ")
-            .replace("゛フ", "ブ")
-            .replace("゛ヘ", "ベ")
-            .replace("゛ホ", "ボ")
-        )
-    return text
+    if "゛" not in text and "゜" not in text:
+        return text
+    return _COMPOSED_KANA_PATTERN.sub(lambda match: _COMPOSED_KANA[match[0]], text)
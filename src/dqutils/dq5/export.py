@@ -0,0 +1,43 @@
+"""dqutils.dq5.export - Export of all DQ5 message and string data."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING
+
+from dqutils.dq5.message import (
+    CONTEXT_MESSAGE_SCENARIO,
+    MessageGeneratorV,
+    battle_records,
+)
+from dqutils.dq5.string import CONTEXT_GROUP, group_records
+from dqutils.export import ExportSource
+from dqutils.export import export_sqlite as _export_sqlite
+from dqutils.message import scenario_records
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def export_sqlite(path: str | Path) -> None:
+    """Write all message and string data to an SQLite database.
+
+    Each group of `CONTEXT_GROUP` is exported as a context of its own,
+    e.g. ``"string_group_0"``. See `dqutils.export` for the tables.
+
+    Parameters
+    ----------
+    path : str or Path
+        The path to the database file.
+    """
+    _export_sqlite(
+        path,
+        CONTEXT_MESSAGE_SCENARIO["title"],
+        (
+            ExportSource(
+                "scenario", partial(scenario_records, CONTEXT_MESSAGE_SCENARIO, MessageGeneratorV, cache=True)
+            ),
+            ExportSource("battle", battle_records),
+            *(ExportSource(f"string_group_{i:d}", partial(group_records, i)) for i in range(len(CONTEXT_GROUP))),
+        ),
+    )
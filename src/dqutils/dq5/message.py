@@ -13,21 +13,30 @@ Special thanks to Mr. kobun_c.
 from __future__ import annotations
 
 from array import array
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from typing import Final
 
+from dqutils.message import MessageStore
 from dqutils.message import enum_scenario as _enum_scenario
+from dqutils.message import print_changed_scenario as _print_changed_scenario
+from dqutils.message import print_scenario as _print_scenario
+from dqutils.message import print_search_scenario as _print_search_scenario
+from dqutils.message import scenario_records as _scenario_records
+from dqutils.message import search_scenario as _search_scenario
 from dqutils.message_generator import MessageGeneratorV
-from dqutils.string import get_text
+from dqutils.string import LazyCharmap
+from dqutils.writer import write_records
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from dqutils.message_generator import IteratorT
+    from dqutils.writer import Record
 
-from dqutils.dq5.charlarge import CHARMAP as CHARMAP_LARGE
-from dqutils.dq5.charsmall import CHARMAP as CHARMAP_SMALL
-from dqutils.dq5.charsmall import process_dakuten
+CHARMAP_LARGE: Final = LazyCharmap("dqutils.dq5.charlarge")
+CHARMAP_SMALL: Final = LazyCharmap("dqutils.dq5.charsmall")
 
 CONTEXT_MESSAGE_BATTLE: Final[dict] = {
     "title": "DRAGONQUEST5",
@@ -42,7 +51,7 @@ CONTEXT_MESSAGE_BATTLE: Final[dict] = {
     "addr_huffman_on": 0x249C2E,
     "huffman_root": 0x00E8,
     "decoding_mask": 0x00FF,
-    "decoding_read_size": 1,
+    "decoding_engine": "bit",
 }
 
 CONTEXT_MESSAGE_SCENARIO: Final[dict] = {
@@ -58,7 +67,7 @@ CONTEXT_MESSAGE_SCENARIO: Final[dict] = {
     "addr_huffman_on": 0x248CB6,
     "huffman_root": 0x07BA,
     "decoding_mask": 0x1FFF,
-    "decoding_read_size": 2,
+    "decoding_engine": "bit",
 }
 
 
@@ -85,26 +94,40 @@ def enum_battle(first: int | None = None, last: int | None = None) -> IteratorT:
     yield from _enum_scenario(CONTEXT_MESSAGE_BATTLE, MessageGeneratorV, first, last)
 
 
-def print_all_battle() -> None:
-    """Print all message data of battle mode to sys.stdout."""
+def print_all_battle(output_format: str = "text") -> None:
+    """Print all message data of battle mode to sys.stdout.
+
+    Parameters
+    ----------
+    output_format : str, optional
+        The output format, e.g. ``"jsonl"``.
+    """
+    write_records(battle_records(), output_format)
+
 
-    context = CONTEXT_MESSAGE_BATTLE
+def battle_records() -> Iterator[Record]:
+    """Return a generator iterator of all message data of battle mode
+    with their texts.
 
-    first = context["message_id_first"]
-    last = context["message_id_last"]
-    assert isinstance(first, int)
-    assert isinstance(last, int)
-    assert first < last
+    Yields
+    ------
+    record : Record
+        The message data in the order of indices. See
+        `dqutils.writer.Record`.
+    """
+    from dqutils.dq5.charsmall import process_dakuten  # noqa: PLC0415
 
-    charmap = cast(dict[int, str], context["charmap"])
-    delims = cast(array, context["delimiters"])
-    for i, item in enumerate(enum_battle(first, last)):
-        address, shift, code_seq = item
-        text = process_dakuten(get_text(code_seq, charmap, delims))
-        print(f"{i:04X}:{address:06X}:{shift:02X}:{text}")
+    records = _scenario_records(CONTEXT_MESSAGE_BATTLE, MessageGeneratorV)
+    return (i._replace(text=process_dakuten(i.text)) for i in records)
 
 
-def enum_scenario(first: int | None = None, last: int | None = None) -> IteratorT:
+def enum_scenario(
+    first: int | None = None,
+    last: int | None = None,
+    jobs: int = 1,
+    engine: str | None = None,
+    cache: bool = False,
+) -> IteratorT:
     """Return generator iterators of message data by specifying
     their indices.
 
@@ -116,6 +139,12 @@ def enum_scenario(first: int | None = None, last: int | None = None) -> Iterator
         The first index of the range of indices you want.
     last : int, optional
         The last index + 1 of the range of indices you want.
+    jobs : int, optional
+        The number of worker processes.
+    engine : str, optional
+        The decoding engine, e.g. ``"numpy"``.
+    cache : bool, optional
+        If True, read messages from the cache file.
 
     Yields
     ------
@@ -126,21 +155,70 @@ def enum_scenario(first: int | None = None, last: int | None = None) -> Iterator
     code_seq : bytearray
         A sequence of characters locating in `addr`.
     """
-    yield from _enum_scenario(CONTEXT_MESSAGE_SCENARIO, MessageGeneratorV, first, last)
+    yield from _enum_scenario(CONTEXT_MESSAGE_SCENARIO, MessageGeneratorV, first, last, jobs, engine, cache)
+
+
+def scenario_store(cache_size: int = 1024) -> MessageStore:
+    """Return a store for random access to message data of
+    conversation mode.
+
+    Parameters
+    ----------
+    cache_size : int, optional
+        The maximum number of messages to cache.
+
+    Returns
+    -------
+    store : MessageStore
+        The store, which should be closed after use.
+    """
+    return MessageStore(CONTEXT_MESSAGE_SCENARIO, MessageGeneratorV, cache_size)
 
 
-def print_all_scenario() -> None:
-    """Print all message data of conversation mode to sys.stdout."""
+def print_all_scenario(jobs: int = 1, cache: bool = True, output_format: str = "text") -> None:
+    """Print all message data of conversation mode to sys.stdout.
 
-    context = CONTEXT_MESSAGE_SCENARIO
+    Parameters
+    ----------
+    jobs : int, optional
+        The number of worker processes.
+    cache : bool, optional
+        If True (default), read messages from the cache file.
+    output_format : str, optional
+        The output format, e.g. ``"jsonl"``.
+    """
+    _print_scenario(CONTEXT_MESSAGE_SCENARIO, MessageGeneratorV, jobs=jobs, cache=cache, output_format=output_format)
+
+
+def print_changed_scenario() -> None:
+    """Update the cache file of message data of conversation mode and
+    print the IDs of changed messages to sys.stdout."""
+    _print_changed_scenario(CONTEXT_MESSAGE_SCENARIO, MessageGeneratorV)
+
+
+def search_scenario(text: str) -> list[tuple[int, int]]:
+    """Search message data of conversation mode for a text.
+
+    Parameters
+    ----------
+    text : str
+        The text to search for.
+
+    Returns
+    -------
+    hits : list of tuple
+        The message ID and the position of each occurrence.
+    """
+    return _search_scenario(CONTEXT_MESSAGE_SCENARIO, MessageGeneratorV, text)
 
-    first = cast(int, context["message_id_first"])
-    last = cast(int, context["message_id_last"])
-    assert first < last
 
-    charmap = cast(dict[int, str], context["charmap"])
-    delims = cast(array, context["delimiters"])
-    for i, item in enumerate(enum_scenario(first, last)):
-        address, shift, code_seq = item
-        text = get_text(code_seq, charmap, delims)
-        print(f"{i:04X}:{address:06X}:{shift:02X}:{text}")
+def print_search_scenario(text: str) -> None:
+    """Print message data of conversation mode that contain a text to
+    sys.stdout.
+
+    Parameters
+    ----------
+    text : str
+        The text to search for.
+    """
+    _print_search_scenario(CONTEXT_MESSAGE_SCENARIO, MessageGeneratorV, text)
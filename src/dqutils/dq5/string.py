@@ -16,13 +16,15 @@ if TYPE_CHECKING:
     from collections.abc import Iterator
     from typing import Final
 
+from dqutils.string import LazyCharmap, get_texts, map_string_contexts
 from dqutils.string import enum_string as _enum_string
-from dqutils.string import get_text
 from dqutils.string_generator import StringGeneratorPascalStyle
+from dqutils.writer import Record, open_writer
 
 if TYPE_CHECKING:
     from dqutils.string_generator import ContextT, StringInfo
-from dqutils.dq5.charsmall import CHARMAP, process_dakuten
+
+CHARMAP: Final = LazyCharmap("dqutils.dq5.charsmall")
 
 CONTEXT_GROUP: Final[tuple[dict[str, int], ...]] = (
     # Partners (human beings).
@@ -84,13 +86,70 @@ def enum_string(context: ContextT, first: int | None = None, last: int | None =
     yield from _enum_string(context, StringGeneratorPascalStyle, first, last)
 
 
-def print_all() -> None:
-    """Print all of the string data to sys.stdout."""
+def print_all(jobs: int = 1, output_format: str = "text") -> None:
+    """Print all of the string data to sys.stdout.
+
+    Parameters
+    ----------
+    jobs : int, optional
+        The number of threads to process the groups.
+    output_format : str, optional
+        The output format, e.g. ``"jsonl"``.
+    """
+
+    with open_writer(output_format) as writer:
+        for groupid, records in enumerate(all_group_records(jobs)):
+            writer.begin_group(groupid)
+            for i in records:
+                writer.write(i)
+
+
+def all_group_records(jobs: int = 1) -> list[list[Record]]:
+    """Return the string data of all of the groups with their texts.
+
+    The ROM image is opened only once, see
+    `dqutils.string.map_string_contexts`.
+
+    Parameters
+    ----------
+    jobs : int, optional
+        The number of threads to process the groups.
+
+    Returns
+    -------
+    records : list of list of Record
+        The string data of each group in `CONTEXT_GROUP`.
+    """
+
+    return map_string_contexts(CONTEXT_GROUP, StringGeneratorPascalStyle, _make_group_records, jobs)
+
+
+def group_records(groupid: int) -> list[Record]:
+    """Return all of the string data of a group with their texts.
+
+    Parameters
+    ----------
+    groupid : int
+        The index of the group in `CONTEXT_GROUP`.
+
+    Returns
+    -------
+    records : list of Record
+        The string data in the order of indices. See
+        `dqutils.writer.Record`.
+    """
+
+    return _make_group_records(groupid, list(StringGeneratorPascalStyle(CONTEXT_GROUP[groupid])))
+
+
+def _make_group_records(groupid: int, items: list[StringInfo]) -> list[Record]:
+    """Return the records of the string data of a group."""
+
+    from dqutils.dq5.charsmall import process_dakuten  # noqa: PLC0415
 
-    for groupid, context in enumerate(CONTEXT_GROUP):
-        print(f"Group #{groupid:d}")
-        charmap = cast(dict[int, str], context["charmap"])
-        for i, entry in enumerate(StringGeneratorPascalStyle(context)):
-            address, code_seq = entry
-            text = process_dakuten(get_text(code_seq, charmap, None))
-            print(f"{i:04X}:{address:06X}:{text}")
+    charmap = cast(dict[int, str], CONTEXT_GROUP[groupid]["charmap"])
+    texts = get_texts((i[1] for i in items), charmap)
+    return [
+        Record(i, address, None, code_seq, process_dakuten(text), groupid)
+        for i, ((address, code_seq), text) in enumerate(zip(items, texts, strict=True))
+    ]
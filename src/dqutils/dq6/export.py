@@ -0,0 +1,41 @@
+"""dqutils.dq6.export - Export of all DQ6 message and string data."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING
+
+from dqutils.dq6.message import CONTEXT_MESSAGE_BATTLE, CONTEXT_MESSAGE_SCENARIO
+from dqutils.dq6.string import CONTEXT as CONTEXT_STRING
+from dqutils.export import ExportSource
+from dqutils.export import export_sqlite as _export_sqlite
+from dqutils.message import battle_records, scenario_records
+from dqutils.message_generator import MessageGeneratorW
+from dqutils.string import string_records
+from dqutils.string_generator import StringGeneratorCStyle
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def export_sqlite(path: str | Path) -> None:
+    """Write all message and string data to an SQLite database.
+
+    See `dqutils.export` for the tables.
+
+    Parameters
+    ----------
+    path : str or Path
+        The path to the database file.
+    """
+    _export_sqlite(
+        path,
+        CONTEXT_MESSAGE_SCENARIO["title"],
+        (
+            ExportSource(
+                "scenario", partial(scenario_records, CONTEXT_MESSAGE_SCENARIO, MessageGeneratorW, cache=True)
+            ),
+            ExportSource("battle", partial(battle_records, CONTEXT_MESSAGE_BATTLE)),
+            ExportSource("string", partial(string_records, CONTEXT_STRING, StringGeneratorCStyle)),
+        ),
+    )
@@ -9,18 +9,24 @@ if TYPE_CHECKING:
     from collections.abc import Iterator
     from typing import Final
 
-from dqutils.dq6.charlarge import CHARMAP as CHARMAP_LARGE
-from dqutils.dq6.charsmall import CHARMAP as CHARMAP_SMALL
+from dqutils.message import MessageStore
 from dqutils.message import enum_battle as _enum_battle
 from dqutils.message import enum_scenario as _enum_scenario
 from dqutils.message import print_battle as _print_battle
+from dqutils.message import print_changed_scenario as _print_changed_scenario
 from dqutils.message import print_scenario as _print_scenario
+from dqutils.message import print_search_scenario as _print_search_scenario
+from dqutils.message import search_scenario as _search_scenario
 from dqutils.message_generator import MessageGeneratorW
+from dqutils.string import LazyCharmap
 
 if TYPE_CHECKING:
     from dqutils.message_generator import IteratorT
     from dqutils.string_generator import StringInfo
 
+CHARMAP_LARGE: Final = LazyCharmap("dqutils.dq6.charlarge")
+CHARMAP_SMALL: Final = LazyCharmap("dqutils.dq6.charsmall")
+
 CONTEXT_MESSAGE_BATTLE: Final[dict] = {
     "title": "DRAGONQUEST6",
     "delimiters": b"\xac\xae",
@@ -28,7 +34,6 @@ CONTEXT_MESSAGE_BATTLE: Final[dict] = {
     "message_id_first": 0x0000,
     "message_id_last": 0x025B,
     "addr_message": 0xF6DEBD,
-    "decoding_read_size": 2,
 }
 
 CONTEXT_MESSAGE_SCENARIO: Final[dict] = {
@@ -49,7 +54,7 @@ CONTEXT_MESSAGE_SCENARIO: Final[dict] = {
     "addr_huffman_off": 0xC167BE,
     "addr_huffman_on": 0xC1700E,
     "huffman_root": 0x084E,
-    "decoding_read_size": 2,
+    "decoding_engine": "bit",
 }
 
 
@@ -76,12 +81,24 @@ def enum_battle(first: int | None = None, last: int | None = None) -> Iterator[S
     yield from _enum_battle(CONTEXT_MESSAGE_BATTLE, first, last)
 
 
-def print_all_battle() -> None:
-    """Print all message data of battle mode to sys.stdout."""
-    _print_battle(CONTEXT_MESSAGE_BATTLE)
+def print_all_battle(output_format: str = "text") -> None:
+    """Print all message data of battle mode to sys.stdout.
+
+    Parameters
+    ----------
+    output_format : str, optional
+        The output format, e.g. ``"jsonl"``.
+    """
+    _print_battle(CONTEXT_MESSAGE_BATTLE, output_format=output_format)
 
 
-def enum_scenario(first: int | None = None, last: int | None = None) -> IteratorT:
+def enum_scenario(
+    first: int | None = None,
+    last: int | None = None,
+    jobs: int = 1,
+    engine: str | None = None,
+    cache: bool = False,
+) -> IteratorT:
     """Return generator iterators of message data by specifying
     their indices.
 
@@ -93,6 +110,12 @@ def enum_scenario(first: int | None = None, last: int | None = None) -> Iterator
         The first index of the range of indices you want.
     last : int, optional
         The last index + 1 of the range of indices you want.
+    jobs : int, optional
+        The number of worker processes.
+    engine : str, optional
+        The decoding engine, e.g. ``"numpy"``.
+    cache : bool, optional
+        If True, read messages from the cache file.
 
     Yields
     ------
@@ -103,9 +126,70 @@ def enum_scenario(first: int | None = None, last: int | None = None) -> Iterator
     code_seq : bytearray
         A sequence of characters locating in `addr`.
     """
-    yield from _enum_scenario(CONTEXT_MESSAGE_SCENARIO, MessageGeneratorW, first, last)
+    yield from _enum_scenario(CONTEXT_MESSAGE_SCENARIO, MessageGeneratorW, first, last, jobs, engine, cache)
+
+
+def scenario_store(cache_size: int = 1024) -> MessageStore:
+    """Return a store for random access to message data of
+    conversation mode.
+
+    Parameters
+    ----------
+    cache_size : int, optional
+        The maximum number of messages to cache.
+
+    Returns
+    -------
+    store : MessageStore
+        The store, which should be closed after use.
+    """
+    return MessageStore(CONTEXT_MESSAGE_SCENARIO, MessageGeneratorW, cache_size)
 
 
-def print_all_scenario() -> None:
-    """Print all message data of conversation mode to sys.stdout."""
-    _print_scenario(CONTEXT_MESSAGE_SCENARIO, MessageGeneratorW)
+def print_all_scenario(jobs: int = 1, cache: bool = True, output_format: str = "text") -> None:
+    """Print all message data of conversation mode to sys.stdout.
+
+    Parameters
+    ----------
+    jobs : int, optional
+        The number of worker processes.
+    cache : bool, optional
+        If True (default), read messages from the cache file.
+    output_format : str, optional
+        The output format, e.g. ``"jsonl"``.
+    """
+    _print_scenario(CONTEXT_MESSAGE_SCENARIO, MessageGeneratorW, jobs=jobs, cache=cache, output_format=output_format)
+
+
+def print_changed_scenario() -> None:
+    """Update the cache file of message data of conversation mode and
+    print the IDs of changed messages to sys.stdout."""
+    _print_changed_scenario(CONTEXT_MESSAGE_SCENARIO, MessageGeneratorW)
+
+
+def search_scenario(text: str) -> list[tuple[int, int]]:
+    """Search message data of conversation mode for a text.
+
+    Parameters
+    ----------
+    text : str
+        The text to search for.
+
+    Returns
+    -------
+    hits : list of tuple
+        The message ID and the position of each occurrence.
+    """
+    return _search_scenario(CONTEXT_MESSAGE_SCENARIO, MessageGeneratorW, text)
+
+
+def print_search_scenario(text: str) -> None:
+    """Print message data of conversation mode that contain a text to
+    sys.stdout.
+
+    Parameters
+    ----------
+    text : str
+        The text to search for.
+    """
+    _print_search_scenario(CONTEXT_MESSAGE_SCENARIO, MessageGeneratorW, text)
@@ -8,7 +8,7 @@ if TYPE_CHECKING:
     from collections.abc import Iterator
     from typing import Final
 
-from dqutils.dq6.charsmall import CHARMAP
+from dqutils.string import LazyCharmap
 from dqutils.string import enum_string as _enum_string
 from dqutils.string import print_string as _print_string
 from dqutils.string_generator import StringGeneratorCStyle
@@ -16,6 +16,8 @@ from dqutils.string_generator import StringGeneratorCStyle
 if TYPE_CHECKING:
     from dqutils.string_generator import StringInfo
 
+CHARMAP: Final = LazyCharmap("dqutils.dq6.charsmall")
+
 CONTEXT: Final[dict] = {
     "title": "DRAGONQUEST6",
     "delimiters": b"\xac",
@@ -49,7 +51,7 @@ def enum_string(first: int | None = None, last: int | None = None) -> Iterator[S
     yield from _enum_string(CONTEXT, StringGeneratorCStyle, first, last)
 
 
-def print_string(first: int | None = None, last: int | None = None) -> None:
+def print_string(first: int | None = None, last: int | None = None, output_format: str = "text") -> None:
     """Print string data to sys.stdout.
 
     String data those indices in [`first`, `last`) will be used.
@@ -60,10 +62,18 @@ def print_string(first: int | None = None, last: int | None = None) -> None:
         The first index of the range of indices you want.
     last : int, optional
         The last index + 1 of the range of indices you want.
+    output_format : str, optional
+        The output format, e.g. ``"jsonl"``.
     """
-    _print_string(CONTEXT, StringGeneratorCStyle, first, last)
+    _print_string(CONTEXT, StringGeneratorCStyle, first, last, output_format)
+
 
+def print_all(output_format: str = "text") -> None:
+    """Print all of the string data to sys.stdout.
 
-def print_all() -> None:
-    """Print all of the string data to sys.stdout."""
-    print_string()
+    Parameters
+    ----------
+    output_format : str, optional
+        The output format, e.g. ``"jsonl"``.
+    """
+    print_string(output_format=output_format)
@@ -0,0 +1,118 @@
+"""This module provides the export of message and string data to an
+SQLite database.
+
+A database may hold the data of several games. Each export replaces
+the data of one game in a single transaction, and consists of the
+following tables:
+
+- ``contexts``: the game title and the name of each context, e.g.
+  ``("DRAGONQUEST6", "scenario")``.
+- ``codes``: the address, the shift and the raw character codes in
+  little-endian ``uint16`` of each message or string.
+- ``texts``: the rendered text of each message or string.
+- ``texts_fts``: the FTS5 index of ``texts`` with the trigram
+  tokenizer, so that any substring of three or more characters can be
+  searched with ``MATCH``.
+
+The view ``records`` joins them together, e.g.
+``SELECT * FROM records WHERE text_id IN (SELECT rowid FROM texts_fts
+WHERE texts_fts MATCH 'ゆうしゃ')``.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from typing import TYPE_CHECKING, NamedTuple
+
+from dqutils.writer import pack_codes
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from pathlib import Path
+    from typing import Final
+
+    from dqutils.writer import Record
+
+_SCHEMA: Final[str] = """
+CREATE TABLE IF NOT EXISTS contexts (
+    context_id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    name TEXT NOT NULL,
+    UNIQUE (title, name)
+);
+CREATE TABLE IF NOT EXISTS codes (
+    context_id INTEGER NOT NULL REFERENCES contexts,
+    item_id INTEGER NOT NULL,
+    address INTEGER NOT NULL,
+    shift INTEGER,
+    codes BLOB NOT NULL,
+    PRIMARY KEY (context_id, item_id)
+);
+CREATE TABLE IF NOT EXISTS texts (
+    context_id INTEGER NOT NULL REFERENCES contexts,
+    item_id INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (context_id, item_id)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS texts_fts USING fts5(text, content='texts', tokenize='trigram');
+CREATE VIEW IF NOT EXISTS records AS
+    SELECT
+        contexts.title, contexts.name, codes.item_id, codes.address, codes.shift, codes.codes,
+        texts.rowid AS text_id, texts.text
+    FROM contexts
+    JOIN codes USING (context_id)
+    JOIN texts USING (context_id, item_id);
+"""
+
+
+class ExportSource(NamedTuple):
+    """A context to export."""
+
+    name: str
+    """The name of the context, e.g. ``"scenario"``."""
+
+    records: Callable[[], Iterable[Record]]
+    """Return the message or string data of the context."""
+
+
+def export_sqlite(path: str | Path, title: str, sources: Iterable[ExportSource]) -> None:
+    """Write message and string data of a game to an SQLite database.
+
+    The data of `title` already in the database are replaced.
+
+    Parameters
+    ----------
+    path : str or Path
+        The path to the database file, which is created if missing.
+    title : str
+        The game title.
+    sources : iterable of ExportSource
+        The contexts to export.
+    """
+
+    with closing(sqlite3.connect(path)) as conn:
+        conn.executescript(_SCHEMA)
+        with conn:
+            _delete_title(conn, title)
+            for name, records in sources:
+                cursor = conn.execute("INSERT INTO contexts (title, name) VALUES (?, ?)", (title, name))
+                context_id = cursor.lastrowid
+                items = list(records())
+                conn.executemany(
+                    "INSERT INTO codes VALUES (?, ?, ?, ?, ?)",
+                    ((context_id, i.item_id, i.address, i.shift, pack_codes(i.codes)) for i in items),
+                )
+                conn.executemany(
+                    "INSERT INTO texts VALUES (?, ?, ?)",
+                    ((context_id, i.item_id, i.text) for i in items),
+                )
+            conn.execute("INSERT INTO texts_fts (texts_fts) VALUES ('rebuild')")
+
+
+def _delete_title(conn: sqlite3.Connection, title: str) -> None:
+    """Delete the data of a game."""
+
+    conn.execute("DELETE FROM codes WHERE context_id IN (SELECT context_id FROM contexts WHERE title = ?)", (title,))
+    conn.execute("DELETE FROM texts WHERE context_id IN (SELECT context_id FROM contexts WHERE title = ?)", (title,))
+    conn.execute("DELETE FROM contexts WHERE title = ?", (title,))
@@ -14,19 +14,28 @@ For all of the programs, conversational message data are compressed.
 from __future__ import annotations
 
 from array import array
+from collections import OrderedDict
+from contextlib import suppress
+from functools import partial
+from itertools import batched
 from typing import TYPE_CHECKING, cast
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, Mapping
-    from typing import Any
+    from collections.abc import Iterable, Iterator, Mapping
+    from types import TracebackType
+    from typing import Any, Self
 
-from dqutils.string import get_hex, get_text
+from dqutils.snescpu.rom_image import RomImage
+from dqutils.string import TEXT_CHUNK_SIZE, encode_text, get_hex, get_text, get_texts
 from dqutils.string_generator import StringGeneratorCStyle
+from dqutils.writer import Record, write_records
 
 if TYPE_CHECKING:
     from dqutils.message_generator import AbstractMessageGenerator, IteratorT
     from dqutils.string_generator import StringInfo
 
+    type MessageInfo = tuple[int, int, array]
+
 
 def enum_battle(context: Mapping[str, Any], first: int | None = None, last: int | None = None) -> Iterator[StringInfo]:
     """Return generator iterators of message data by specifying
@@ -65,7 +74,9 @@ def enum_battle(context: Mapping[str, Any], first: int | None = None, last: int
     yield from StringGeneratorCStyle(context, first, last)
 
 
-def print_battle(context: Mapping[str, Any], first: int | None = None, last: int | None = None) -> None:
+def print_battle(
+    context: Mapping[str, Any], first: int | None = None, last: int | None = None, output_format: str = "text"
+) -> None:
     """Print message data to sys.stdout.
 
     Message data those indices in [`first`, `last`) will be used.
@@ -91,13 +102,41 @@ def print_battle(context: Mapping[str, Any], first: int | None = None, last: int
         The first index of the range of indices you want.
     last : int, optional
         The last index + 1 of the range of indices you want.
+    output_format : str, optional
+        The output format, e.g. ``"jsonl"``. See `dqutils.writer`.
+    """
+
+    write_records(battle_records(context, first, last), output_format)
+
+
+def battle_records(context: Mapping[str, Any], first: int | None = None, last: int | None = None) -> Iterator[Record]:
+    """Return a generator iterator of message data with their texts.
+
+    Message data those indices in [`first`, `last`) will be yielded.
+
+    Parameters
+    ----------
+    context : dict
+        The message context. See `print_battle` for details.
+    first : int, optional
+        The first index of the range of indices you want.
+    last : int, optional
+        The last index + 1 of the range of indices you want.
+
+    Yields
+    ------
+    record : Record
+        The message data in the order of indices. See
+        `dqutils.writer.Record`.
     """
 
     charmap = cast(dict, context["charmap"])
     delims = cast(bytes, context["delimiters"])
-    for i, item in enumerate(enum_battle(context, first, last)):
-        text = get_text(item[1], charmap, delims) if charmap else get_hex(item[1])
-        print(f"{i:04X}:{item[0]:06X}:{text}")
+    for chunk in batched(enumerate(enum_battle(context, first, last)), TEXT_CHUNK_SIZE):
+        code_seqs = [code_seq for _, (_, code_seq) in chunk]
+        texts = get_texts(code_seqs, charmap, delims) if charmap else [get_hex(i) for i in code_seqs]
+        for (i, (address, code_seq)), text in zip(chunk, texts, strict=True):
+            yield Record(i, address, None, code_seq, text)
 
 
 def enum_scenario(
@@ -105,6 +144,9 @@ def enum_scenario(
     generator_t: type[AbstractMessageGenerator],
     first: int | None = None,
     last: int | None = None,
+    jobs: int = 1,
+    engine: str | None = None,
+    cache: bool = False,
 ) -> IteratorT:
     """Return generator iterators of message data by specifying
     their indices.
@@ -134,6 +176,18 @@ def enum_scenario(
         The first index of the range of indices you want.
     last : int, optional
         The last index + 1 of the range of indices you want.
+    jobs : int, optional
+        The number of worker processes. If greater than 1, message
+        groups are decoded in parallel and yielded in ID order.
+    engine : str, optional
+        The decoding engine to use instead of ``decoding_engine`` of
+        `context`, e.g. ``"numpy"`` to decode all message groups at
+        once. See `~AbstractMessageGenerator` for details.
+    cache : bool, optional
+        If True, read messages from the cache file of `context`,
+        which is created at the first call for each ROM. `jobs` is
+        used to create the file then. See `dqutils.message_cache` for
+        details.
 
     Yields
     ------
@@ -144,7 +198,131 @@ def enum_scenario(
     code_seq : bytearray
         A sequence of characters locating in `addr`.
     """
-    yield from generator_t(context, first, last)
+    if engine:
+        context = {**context, "decoding_engine": engine}
+    if cache:
+        context = {**context, "message_cache": True}
+
+    generator = generator_t(context, first, last)
+    if cache and jobs > 1:
+        messages = _update_message_cache(context, generator_t, jobs)
+        if messages is not None:
+            yield from messages[generator.first : generator.last]
+            return
+
+    if jobs <= 1 or cache:
+        yield from generator
+        return
+
+    shards = _split_message_groups(generator.first, generator.last, generator.messages_per_group, jobs)
+    if not shards:
+        return
+
+    firsts, lasts = zip(*shards, strict=True)
+    from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+    with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(context, generator_t)) as executor:
+        for messages in executor.map(_decode_messages, firsts, lasts):
+            yield from messages
+
+
+def _split_message_groups(first: int, last: int, group_size: int, jobs: int) -> list[tuple[int, int]]:
+    """Split [`first`, `last`) into ranges aligned to message groups.
+
+    Every range but the first begins at a message group, so that a
+    worker locates it without decoding any other message.
+
+    Parameters
+    ----------
+    first : int
+        The first index of the range of indices.
+    last : int
+        The last index + 1 of the range of indices.
+    group_size : int
+        The number of messages in a group.
+    jobs : int
+        The number of worker processes.
+
+    Returns
+    -------
+    shards : list of tuple
+        The ranges of indices in ascending order.
+    """
+
+    # A few shards per worker keep all of them busy until the end.
+    num_groups = -(-(last - first) // group_size)
+    step = group_size * max(1, -(-num_groups // (jobs * 4)))
+
+    shards = []
+    while first < last:
+        stop = min(last, (first // step + 1) * step)
+        shards.append((first, stop))
+        first = stop
+    return shards
+
+
+_WORKER_STORES: list[MessageStore] = []
+"""The message store of a worker process of `enum_scenario`."""
+
+
+def _init_worker(context: Mapping[str, Any], generator_t: type[AbstractMessageGenerator]) -> None:
+    """Open the ROM image and set up the generator once per worker
+    process."""
+
+    store = MessageStore(context, generator_t, cache_size=0)
+    store.open()
+    _WORKER_STORES[:] = [store]
+
+
+def _decode_messages(first: int, last: int) -> list[MessageInfo]:
+    """Decode messages in [`first`, `last`) in a worker process."""
+
+    return _WORKER_STORES[0].get_many(range(first, last))
+
+
+def _decode_message_group(first: int, last: int) -> tuple[list[MessageInfo], int]:
+    """Decode the message group [`first`, `last`) in a worker process
+    for the message cache."""
+
+    store = _WORKER_STORES[0]
+    return store.generator.decode_group(store._get_view(), first, last)
+
+
+def _update_message_cache(
+    context: Mapping[str, Any], generator_t: type[AbstractMessageGenerator], jobs: int
+) -> list[MessageInfo] | None:
+    """Create the cache file of message data with worker processes,
+    unless it is up to date.
+
+    Parameters
+    ----------
+    context : dict
+        The message context. See `enum_scenario` for details.
+    generator_t : `~AbstractMessageGenerator`
+        The type of message generator. See the module
+        dqutils.message_generator for details.
+    jobs : int
+        The number of worker processes.
+
+    Returns
+    -------
+    messages : list of tuple or None
+        All messages of the context, or None if the cache file is up
+        to date.
+    """
+
+    generator = generator_t(context)
+    with RomImage(generator.title) as mem, memoryview(mem) as view:
+        generator.setup(mem)
+        with suppress(OSError, ValueError):
+            generator.open_message_cache(view).close()
+            return None
+
+        from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+        with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(context, generator_t)) as executor:
+            messages, _ = generator.update_message_cache(view, partial(executor.map, _decode_message_group))
+    return messages
 
 
 def print_scenario(
@@ -152,6 +330,9 @@ def print_scenario(
     generator_t: type[AbstractMessageGenerator],
     first: int | None = None,
     last: int | None = None,
+    jobs: int = 1,
+    cache: bool = False,
+    output_format: str = "text",
 ) -> None:
     """Print message data to sys.stdout.
 
@@ -180,11 +361,373 @@ def print_scenario(
         The first index of the range of indices you want.
     last : int, optional
         The last index + 1 of the range of indices you want.
+    jobs : int, optional
+        The number of worker processes.
+    cache : bool, optional
+        If True, read messages from the cache file of `context`.
+    output_format : str, optional
+        The output format, e.g. ``"jsonl"``. See `dqutils.writer`.
+    """
+
+    write_records(scenario_records(context, generator_t, first, last, jobs, cache), output_format)
+
+
+def scenario_records(
+    context: Mapping[str, Any],
+    generator_t: type[AbstractMessageGenerator],
+    first: int | None = None,
+    last: int | None = None,
+    jobs: int = 1,
+    cache: bool = False,
+) -> Iterator[Record]:
+    """Return a generator iterator of message data with their texts.
+
+    Message data those indices in [`first`, `last`) will be yielded.
+
+    Parameters
+    ----------
+    context : dict
+        The message context. See `print_scenario` for details.
+    generator_t : `~AbstractMessageGenerator`
+        The type of message generator. See the module
+        dqutils.message_generator for details.
+    first : int, optional
+        The first index of the range of indices you want.
+    last : int, optional
+        The last index + 1 of the range of indices you want.
+    jobs : int, optional
+        The number of worker processes.
+    cache : bool, optional
+        If True, read messages from the cache file of `context`.
+
+    Yields
+    ------
+    record : Record
+        The message data in the order of indices. See
+        `dqutils.writer.Record`.
     """
 
     charmap = cast(dict, context["charmap"])
     delims = cast(array, context["delimiters"])
-    for i, item in enumerate(enum_scenario(context, generator_t, first, last)):
-        address, shift, code_seq = item
-        text = get_text(code_seq, charmap, delims)
-        print(f"{i:04X}:{address:06X}:{shift:02X}:{text}")
+    messages = enum_scenario(context, generator_t, first, last, jobs, cache=cache)
+    for chunk in batched(enumerate(messages), TEXT_CHUNK_SIZE):
+        texts = get_texts((code_seq for _, (_, _, code_seq) in chunk), charmap, delims)
+        for (i, (address, shift, code_seq)), text in zip(chunk, texts, strict=True):
+            yield Record(i, address, shift, code_seq, text)
+
+
+def update_scenario_cache(context: Mapping[str, Any], generator_t: type[AbstractMessageGenerator]) -> list[int]:
+    """Bring the cache file of message data up to date with the ROM
+    image.
+
+    Only message groups that have changed since the previous cache
+    file are decoded again.
+
+    Parameters
+    ----------
+    context : dict
+        The message context. See `enum_scenario` for details.
+    generator_t : `~AbstractMessageGenerator`
+        The type of message generator. See the module
+        dqutils.message_generator for details.
+
+    Returns
+    -------
+    changed : list of int
+        The IDs of messages whose characters differ from the previous
+        cache file, or all IDs if there is none.
+    """
+
+    generator = generator_t(context)
+    with RomImage(generator.title) as mem, memoryview(mem) as view:
+        generator.setup(mem)
+        _, changed = generator.update_message_cache(view)
+    return changed
+
+
+def print_changed_scenario(context: Mapping[str, Any], generator_t: type[AbstractMessageGenerator]) -> None:
+    """Update the cache file of message data and print the IDs of
+    changed messages to sys.stdout.
+
+    Parameters
+    ----------
+    context : dict
+        The message context. See `enum_scenario` for details.
+    generator_t : `~AbstractMessageGenerator`
+        The type of message generator. See the module
+        dqutils.message_generator for details.
+    """
+
+    for message_id in update_scenario_cache(context, generator_t):
+        print(f"{message_id:04X}")
+
+
+def search_scenario(
+    context: Mapping[str, Any], generator_t: type[AbstractMessageGenerator], text: str
+) -> list[tuple[int, int]]:
+    """Search message data for a text.
+
+    The text is converted to character codes and looked up in the
+    search index of `context`, which is built from the cache file of
+    message data at the first call for each ROM. See
+    `dqutils.message_search` for details.
+
+    Parameters
+    ----------
+    context : dict
+        The message context. See `enum_scenario` for details.
+        ``charmap`` is also required.
+    generator_t : `~AbstractMessageGenerator`
+        The type of message generator. See the module
+        dqutils.message_generator for details.
+    text : str
+        The text to search for, e.g. "ゆうしゃ".
+
+    Returns
+    -------
+    hits : list of tuple
+        The message ID and the position of the first character of
+        each occurrence, in ascending order.
+
+    Raises
+    ------
+    ValueError
+        If `text` contains a character not in ``charmap``.
+    """
+
+    pattern = encode_text(text, cast(dict, context["charmap"]))
+    generator = generator_t(context)
+    with RomImage(generator.title) as mem, memoryview(mem) as view:
+        generator.setup(mem)
+        with generator.open_search_index(view) as index:
+            return index.find(pattern)
+
+
+def print_search_scenario(context: Mapping[str, Any], generator_t: type[AbstractMessageGenerator], text: str) -> None:
+    """Search message data for a text and print the messages found to
+    sys.stdout.
+
+    Parameters
+    ----------
+    context : dict
+        The message context. See `search_scenario` for details.
+    generator_t : `~AbstractMessageGenerator`
+        The type of message generator. See the module
+        dqutils.message_generator for details.
+    text : str
+        The text to search for.
+    """
+
+    hits = search_scenario(context, generator_t, text)
+    with MessageStore(context, generator_t) as store:
+        for message_id, position in hits:
+            print(f"{message_id:04X}:{position:04X}:{store.get_text(message_id)}")
+
+
+class MessageStore:
+    """Random access to the scenario messages of a context.
+
+    The store keeps the ROM image open and the generator set up for
+    its lifetime, and caches the most recently used messages, so that
+    many point queries cost no more than a lookup each.
+
+    Examples
+    --------
+    >>> with MessageStore(CONTEXT_MESSAGE_SCENARIO, MessageGeneratorW) as store:
+    ...     addr, shift, code_seq = store.get(0x1B00)
+    ...     text = store.get_text(0x1B00)
+    """
+
+    def __init__(
+        self: Self,
+        context: Mapping[str, Any],
+        generator_t: type[AbstractMessageGenerator],
+        cache_size: int = 1024,
+    ) -> None:
+        """Create an object of class MessageStore.
+
+        Parameters
+        ----------
+        context : dict
+            The same as for `enum_scenario`. ``charmap`` is also
+            required to call `get_text`.
+        generator_t : `~AbstractMessageGenerator`
+            The type of message generator. See the module
+            dqutils.message_generator for details.
+        cache_size : int, optional
+            The maximum number of messages to cache. Both decoded
+            code sequences and rendered texts are cached up to this
+            number.
+        """
+
+        assert cache_size >= 0
+
+        self.context = context
+        self.generator = generator_t(context)
+        self.cache_size = cache_size
+        self._codes: OrderedDict[int, MessageInfo] = OrderedDict()
+        self._texts: OrderedDict[int, str] = OrderedDict()
+        self._rom: RomImage | None = None
+        self._view: memoryview | None = None
+
+    def open(self: Self) -> None:
+        """Open the ROM image and set up the generator."""
+
+        if self._rom:
+            return
+
+        rom = RomImage(self.generator.title)
+        mem = rom.__enter__()
+        try:
+            self.generator.setup(mem)
+        except Exception:
+            rom.__exit__(None, None, None)
+            raise
+
+        self._rom, self._view = rom, memoryview(mem)
+
+    def close(self: Self) -> None:
+        """Close the ROM image. Cached messages remain available."""
+
+        if self._view:
+            self._view.release()
+            self._view = None
+        if self._rom:
+            self._rom.__exit__(None, None, None)
+            self._rom = None
+
+    def __enter__(self: Self) -> Self:
+        self.open()
+        return self
+
+    def __exit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self: Self) -> int:
+        return self.generator.message_count or 0
+
+    def get(self: Self, message_id: int) -> MessageInfo:
+        """Return a message.
+
+        Parameters
+        ----------
+        message_id : int
+            An ID of a message data.
+
+        Returns
+        -------
+        addr : int
+            The address of the message data.
+        shift_bits : int
+            The shift from `addr`.
+        code_seq : array
+            A sequence of characters locating in `addr`.
+
+        Raises
+        ------
+        IndexError
+            If `message_id` is out of the range of the context.
+        """
+
+        item = self._codes.get(message_id)
+        if item:
+            self._codes.move_to_end(message_id)
+            return item
+
+        self._check_id(message_id)
+        view = self._get_view()
+        addr, shift = self.generator.locate_message(view, message_id)
+        _, _, code_seq = self.generator.decode_message(view, addr, shift)
+        return self._store(self._codes, message_id, (addr, shift, code_seq))
+
+    def get_many(self: Self, message_ids: Iterable[int]) -> list[MessageInfo]:
+        """Return messages.
+
+        Messages not cached are decoded in the order of their IDs, so
+        that runs of consecutive IDs are decoded in a single pass.
+
+        Parameters
+        ----------
+        message_ids : iterable of int
+            IDs of message data.
+
+        Returns
+        -------
+        messages : list
+            The messages in the order of `message_ids`. See `get` for
+            the items.
+        """
+
+        message_ids = list(message_ids)
+        found = {i: self._codes[i] for i in message_ids if i in self._codes}
+
+        generator = self.generator
+        addr = shift = 0
+        prev_id: int | None = None
+        for i in sorted(set(message_ids).difference(found)):
+            self._check_id(i)
+            view = self._get_view()
+            if prev_id is None or i != prev_id + 1:
+                addr, shift = generator.locate_message(view, i)
+            addr_next, shift_next, code_seq = generator.decode_message(view, addr, shift)
+            found[i] = (addr, shift, code_seq)
+            addr, shift, prev_id = addr_next, shift_next, i
+
+        for i in message_ids:
+            self._store(self._codes, i, found[i])
+        return [found[i] for i in message_ids]
+
+    def get_text(self: Self, message_id: int) -> str:
+        """Return a text representation of a message.
+
+        Parameters
+        ----------
+        message_id : int
+            An ID of a message data.
+
+        Returns
+        -------
+        text : str
+            A human-readble text.
+        """
+
+        text = self._texts.get(message_id)
+        if text is not None:
+            self._texts.move_to_end(message_id)
+            return text
+
+        charmap = cast(dict, self.context["charmap"])
+        code_seq = self.get(message_id)[2]
+        return self._store(self._texts, message_id, get_text(code_seq, charmap, self.generator.delimiters))
+
+    def _check_id(self: Self, message_id: int) -> None:
+        """Raise IndexError if `message_id` is out of range."""
+
+        if not 0 <= message_id < len(self):
+            msg = f"message ID out of range: {message_id:#x}"
+            raise IndexError(msg)
+
+    def _get_view(self: Self) -> memoryview:
+        """Return the view of the ROM image, opening it if necessary."""
+
+        self.open()
+        assert self._view
+        return self._view
+
+    def _store[T](self: Self, cache: OrderedDict[int, T], message_id: int, value: T) -> T:
+        """Store `value` to `cache` and evict the least recently used
+        entries."""
+
+        if not self.cache_size:
+            return value
+
+        cache[message_id] = value
+        cache.move_to_end(message_id)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return value
@@ -0,0 +1,195 @@
+"""
+This module provides a vectorised decoder of Huffman-encoded messages
+built on NumPy.
+
+Message groups are independent of each other, so that all of them
+can be decoded in lock-step: each step consumes one bit of every
+group at once with array operations on the flattened Huffman tree of
+the generator. This pays off when a whole message bank is to be
+decoded, e.g. for a full export.
+
+NumPy is an optional dependency of dqutils. This module is imported
+only if the ``"numpy"`` decoding engine is selected.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from array import array
+    from collections.abc import Sequence
+    from typing import Final, Literal, Self
+
+    from dqutils.bit import BufferT
+
+_BITS_PER_BYTE: Final[int] = 8
+_LEAF_NODE: Final[int] = 0x10000
+_LEAF_CODE_MASK: Final[int] = 0xFFFF
+_CHUNK_SIZE: Final[int] = 0x10000
+
+
+class DecodedMessages(NamedTuple):
+    """Messages decoded in bulk."""
+
+    codes: np.ndarray
+    """The decoded characters of all messages in a ``uint16`` array."""
+
+    offsets: np.ndarray
+    """The characters of the ``i``-th message are
+    ``codes[offsets[i]:offsets[i + 1]]``."""
+
+    ends: np.ndarray
+    """The bit position just after the ``i``-th message."""
+
+
+class _BitStream:
+    """The bits of the ROM image unpacked on demand from an offset."""
+
+    def __init__(self: Self, mem: BufferT, offset: int, bitorder: Literal["big", "little"]) -> None:
+        self.mem = mem
+        self.base = offset * _BITS_PER_BYTE
+        self.end = offset
+        self.bitorder: Literal["big", "little"] = bitorder
+        self.bits = np.empty(0, dtype=np.uint8)
+
+    def ensure(self: Self, position: int) -> None:
+        """Unpack bytes until the bit at `position` is available."""
+
+        if position < self.base + len(self.bits):
+            return
+
+        size = max(_CHUNK_SIZE, len(self.bits) // _BITS_PER_BYTE)
+        stop = min(len(self.mem), max(self.end + size, position // _BITS_PER_BYTE + 1))
+        chunk = np.frombuffer(self.mem[self.end : stop], dtype=np.uint8)
+        self.bits = np.concatenate((self.bits, np.unpackbits(chunk, bitorder=self.bitorder)))
+        self.end = stop
+
+
+# pylint: disable=too-many-arguments
+def decode_bulk(  # noqa: PLR0913
+    mem: BufferT,
+    positions: Sequence[int] | np.ndarray,
+    counts: Sequence[int],
+    tree: array,
+    root: int,
+    delims: array,
+    bitorder: Literal["big", "little"],
+) -> DecodedMessages:
+    """Decode consecutive messages from each of several bit positions.
+
+    Parameters
+    ----------
+    mem : mmap.mmap or memoryview
+        The ROM image.
+    positions : sequence of int or np.ndarray
+        The bit position, i.e. the offset in the ROM image times eight
+        plus the bits already consumed, from which each run of
+        messages is stored.
+    counts : sequence of int
+        The number of messages to decode from each position.
+    tree : array
+        The flattened Huffman tree.
+    root : int
+        The value of the root.
+    delims : array
+        The codes that terminate a message.
+    bitorder : {"big", "little"}
+        ``"big"`` if the bits of a byte are consumed from the MSB,
+        ``"little"`` if from the LSB.
+
+    Returns
+    -------
+    messages : DecodedMessages
+        The messages in the order of `positions`.
+    """
+
+    if not len(positions):
+        empty = np.empty(0, dtype=np.int64)
+        return DecodedMessages(empty.astype(np.uint16), np.zeros(1, dtype=np.int64), empty)
+
+    starts = np.array(positions, dtype=np.int64)
+    stream = _BitStream(mem, int(starts.min()) // _BITS_PER_BYTE, bitorder)
+    tree_np = np.array(tree, dtype=np.uint32)
+    delims_np = np.array(delims, dtype=np.uint32)
+
+    event_cursors, event_codes, event_ends = _run_cursors(stream, starts, np.array(counts), tree_np, root, delims_np)
+
+    # Gather the characters of each cursor in the order of decoding.
+    order = np.argsort(event_cursors, kind="stable")
+    codes = event_codes[order].astype(np.uint16)
+    delim_indexes = np.flatnonzero(np.isin(codes, delims_np))
+    offsets = np.concatenate(([0], delim_indexes + 1))
+    return DecodedMessages(codes, offsets, event_ends[order][delim_indexes])
+
+
+def _run_cursors(
+    stream: _BitStream, positions: np.ndarray, counts: np.ndarray, tree: np.ndarray, root: int, delims: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Advance all cursors bit by bit until each of them has decoded
+    its messages.
+
+    Parameters
+    ----------
+    stream : _BitStream
+        The bits of the ROM image.
+    positions : np.ndarray
+        The bit position of each cursor.
+    counts : np.ndarray
+        The number of messages to decode from each cursor.
+    tree : np.ndarray
+        The flattened Huffman tree.
+    root : int
+        The value of the root.
+    delims : np.ndarray
+        The codes that terminate a message.
+
+    Returns
+    -------
+    cursors : np.ndarray
+        The cursor of each decoded character.
+    codes : np.ndarray
+        The decoded characters in the order of decoding.
+    ends : np.ndarray
+        The bit position just after each decoded character.
+    """
+
+    cursors = np.arange(len(positions))
+    positions = positions.copy()
+    remaining = counts.copy()
+    nodes = np.full(len(positions), root, dtype=np.uint32)
+
+    event_cursors: list[np.ndarray] = []
+    event_codes: list[np.ndarray] = []
+    event_ends: list[np.ndarray] = []
+
+    while len(cursors):
+        stream.ensure(int(positions.max()))
+        nodes = tree[nodes + stream.bits[positions - stream.base]]
+        positions += 1
+
+        leaves = np.flatnonzero(nodes & _LEAF_NODE)
+        if not len(leaves):
+            continue
+
+        codes = nodes[leaves] & _LEAF_CODE_MASK
+        event_cursors.append(cursors[leaves])
+        event_codes.append(codes)
+        event_ends.append(positions[leaves])
+        nodes[leaves] = root
+
+        terminated = leaves[np.isin(codes, delims)]
+        if not len(terminated):
+            continue
+
+        remaining[terminated] -= 1
+        active = remaining > 0
+        if not active.all():
+            cursors = cursors[active]
+            positions = positions[active]
+            remaining = remaining[active]
+            nodes = nodes[active]
+
+    return np.concatenate(event_cursors), np.concatenate(event_codes), np.concatenate(event_ends)
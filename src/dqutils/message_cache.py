@@ -0,0 +1,434 @@
+"""This module provides a persistent cache of decoded messages.
+
+Decoding every message of a context takes a while, even though the
+result never changes as long as the ROM image does not. The cache
+stores the decoded characters of all messages of a context in a file
+under ``confdir_home()/cache``, so that later runs just map the file
+into memory.
+
+A cache file consists of a header, the packed location of each
+message, the offset of each message in the character blob, the end
+and the fingerprint of each message group, and the blob of ``uint16``
+characters itself. All values are in the native byte order, which is
+a part of the key of the file.
+
+The fingerprints let a patched ROM image reuse the cache of the
+previous build: only the message groups whose fingerprints differ
+have to be decoded again. See
+`AbstractMessageGenerator.build_message_cache`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from contextlib import suppress
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Buffer, Iterable, Iterator
+    from pathlib import Path
+    from types import TracebackType
+    from typing import BinaryIO, Final, Self
+
+    from dqutils.bit import BufferT
+    from dqutils.snescpu.rom_image import FileIdentity
+
+    type IteratorT = Iterator[tuple[int, int, array]]
+
+from dqutils.config import confdir_home
+from dqutils.snescpu.rom_image import ROM_POOL
+
+_MAGIC: Final[bytes] = b"DQMC"
+_VERSION: Final[int] = 2
+_HEADER: Final[struct.Struct] = struct.Struct("=4sIIII16s")
+"""The magic number, the format version, the number of messages, the
+number of message groups, the number of characters and the digest of
+the decoding tables."""
+
+DIGEST_SIZE: Final[int] = 16
+"""The size of a fingerprint in bytes."""
+
+MAX_FILES: Final[int] = 4
+"""The number of cache files kept for each context, i.e. for as many
+ROM images. The least recently used ones beyond it are removed."""
+
+_DIGESTS: dict[FileIdentity, str] = {}
+"""The digests of ROM images computed so far, keyed by the identity of
+the ROM file. See `rom_digest`."""
+
+
+class MessageCacheData(NamedTuple):
+    """The contents of a cache file."""
+
+    messages: list[tuple[int, int, array]]
+    """All messages of the context in ID order, as
+    `AbstractMessageGenerator` yields."""
+
+    group_ends: array
+    """The bit position, i.e. the offset in the ROM image times eight
+    plus the bits already consumed, just after each message group."""
+
+    group_digests: list[bytes]
+    """The fingerprint of each message group."""
+
+    tables_digest: bytes
+    """The fingerprint of the Huffman tree and the shift bit array."""
+
+
+def cache_dir() -> Path:
+    """Return the directory path to cache files.
+
+    Returns
+    -------
+    path : Path
+        ``cache`` under the directory that `confdir_home` returns.
+    """
+
+    return confdir_home() / "cache"
+
+
+def rom_digest(mem: BufferT) -> str:
+    """Return the digest of the contents of a ROM image.
+
+    The digest of a ROM image in `ROM_POOL` is computed once per ROM
+    file.
+
+    Parameters
+    ----------
+    mem : mmap.mmap or memoryview
+        The ROM image.
+
+    Returns
+    -------
+    digest : str
+        The SHA-256 digest in hexadecimal.
+    """
+
+    identity = ROM_POOL.get_identity(mem)
+    digest = _DIGESTS.get(identity) if identity else None
+    if digest is None:
+        digest = hashlib.sha256(mem).hexdigest()
+        if identity:
+            _DIGESTS[identity] = digest
+    return digest
+
+
+def fingerprint(*chunks: BufferT) -> bytes:
+    """Return the fingerprint of data.
+
+    Parameters
+    ----------
+    *chunks : bytes-like objects
+        The data.
+
+    Returns
+    -------
+    digest : bytes
+        The BLAKE2b digest of `DIGEST_SIZE` bytes.
+    """
+
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for i in chunks:
+        digest.update(i)
+    return digest.digest()
+
+
+def cache_path(title: str, context_key: tuple, digest: str) -> Path:
+    """Return the path to the cache file of a context.
+
+    Parameters
+    ----------
+    title : str
+        The title of the game.
+    context_key : tuple
+        The parameters that identify the message context.
+    digest : str
+        The digest of the ROM image, see `rom_digest`.
+
+    Returns
+    -------
+    path : Path
+        The path to the cache file, which may not exist.
+    """
+
+    key = repr((_VERSION, sys.byteorder, context_key)).encode()
+    return cache_dir() / f"{title}-{hashlib.sha256(key).hexdigest()[:16]}-{digest[:16]}.bin"
+
+
+def find_previous(path: Path) -> Path | None:
+    """Return the cache file of the same context as `path`, for any
+    ROM image.
+
+    Parameters
+    ----------
+    path : Path
+        The path to a cache file, see `cache_path`.
+
+    Returns
+    -------
+    path : Path or None
+        `path` itself if it exists, otherwise the most recent cache
+        file of the same context, or None if there is none.
+    """
+
+    if path.is_file():
+        return path
+
+    # The ROM digest is the last part of the name.
+    prefix = path.name.rsplit("-", 1)[0]
+    candidates = [i for i in path.parent.glob(f"{prefix}-*.bin") if i.is_file()]
+    return max(candidates, key=lambda i: i.stat().st_mtime, default=None)
+
+
+def prune(path: Path, suffix: str = ".bin") -> None:
+    """Remove the least recently used files of the same context as
+    `path`, so that at most `MAX_FILES` remain.
+
+    Files are used when they are written or opened, which updates
+    their modification times.
+
+    Parameters
+    ----------
+    path : Path
+        The path to the file just written, see `cache_path`.
+    suffix : str, optional
+        The suffix of the files to prune.
+    """
+
+    # The ROM digest is the last part of the name.
+    prefix = path.name.rsplit("-", 1)[0]
+    others = []
+    for i in path.parent.glob(f"{prefix}-*{suffix}"):
+        with suppress(OSError):
+            if i != path:
+                others.append((i.stat().st_mtime_ns, i))
+
+    others.sort(reverse=True)
+    for _, stale in others[MAX_FILES - 1 :]:
+        with suppress(OSError):
+            stale.unlink()
+
+
+def write_atomic(path: Path, chunks: Iterable[Buffer]) -> None:
+    """Write a file under a temporary name and then rename it, so that
+    another process never sees a partial file.
+
+    Parameters
+    ----------
+    path : Path
+        The path to the file.
+    chunks : iterable of bytes-like objects
+        The contents of the file.
+
+    Raises
+    ------
+    OSError
+        If the file cannot be written. The temporary file is removed
+        then.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with temp.open("wb") as fout:
+            for i in chunks:
+                fout.write(i)
+        temp.replace(path)
+    except BaseException:
+        with suppress(OSError):
+            temp.unlink()
+        raise
+
+
+def touch(path: Path) -> None:
+    """Mark a file as used now, see `prune`."""
+
+    with suppress(OSError):
+        os.utime(path)
+
+
+class MessageCache:
+    """A read-only view of a cache file.
+
+    The file is mapped into memory, and each message is copied out of
+    it only when it is accessed.
+    """
+
+    def __init__(self: Self, path: Path) -> None:
+        """Create an object of class MessageCache.
+
+        Parameters
+        ----------
+        path : Path
+            The path to the cache file.
+        """
+
+        self.path = path
+        self.fin: BinaryIO | None = None
+        self.image: mmap.mmap | None = None
+        self.views: list[memoryview] = []
+        self.locations: memoryview
+        self.offsets: memoryview
+        self.group_ends: memoryview
+        self.group_digests: memoryview
+        self.codes: memoryview
+        self.tables_digest: bytes
+
+    def open(self: Self) -> Self:
+        """Map the cache file into memory.
+
+        Raises
+        ------
+        OSError
+            If the file does not exist.
+        ValueError
+            If the file is broken or of another format version.
+        """
+
+        fin = self.path.open("rb")
+        try:
+            image = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            fin.close()
+            raise
+
+        self.fin, self.image = fin, image
+        try:
+            self._map(memoryview(image))
+        except ValueError:
+            self.close()
+            raise
+        touch(self.path)
+        return self
+
+    def _map(self: Self, view: memoryview) -> None:
+        """Divide the file into arrays."""
+
+        self.views.append(view)
+        if len(view) < _HEADER.size:
+            raise ValueError(self.path)
+
+        magic, version, count, num_groups, size, self.tables_digest = _HEADER.unpack_from(view)
+        start_offsets = _HEADER.size + 4 * count
+        start_ends = start_offsets + 4 * (count + 1)
+        start_digests = start_ends + 4 * num_groups
+        start_codes = start_digests + DIGEST_SIZE * num_groups
+        if magic != _MAGIC or version != _VERSION or len(view) != start_codes + 2 * size:
+            raise ValueError(self.path)
+
+        self.locations = view[_HEADER.size : start_offsets].cast("I")
+        self.offsets = view[start_offsets:start_ends].cast("I")
+        self.group_ends = view[start_ends:start_digests].cast("I")
+        self.group_digests = view[start_digests:start_codes]
+        self.codes = view[start_codes:].cast("H")
+        self.views += (self.locations, self.offsets, self.group_ends, self.group_digests, self.codes)
+
+    def close(self: Self) -> None:
+        """Unmap the cache file."""
+
+        # The memory map cannot be closed while any view exports it.
+        while self.views:
+            self.views.pop().release()
+        if self.image:
+            self.image.close()
+            self.image = None
+        if self.fin:
+            self.fin.close()
+            self.fin = None
+
+    def __enter__(self: Self) -> Self:
+        return self.open()
+
+    def __exit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self: Self) -> int:
+        return len(self.locations)
+
+    def get(self: Self, message_id: int) -> tuple[int, int, array]:
+        """Return a message.
+
+        Parameters
+        ----------
+        message_id : int
+            An ID of a message data.
+
+        Returns
+        -------
+        addr : int
+            The address of the message data.
+        shift : int
+            The shift from `addr`.
+        code_seq : array
+            The decoded characters including the delimiter.
+        """
+
+        value = self.locations[message_id]
+        code_seq = array("H")
+        code_seq.frombytes(self.codes[self.offsets[message_id] : self.offsets[message_id + 1]].cast("B"))
+        return value >> 8, value & 0xFF, code_seq
+
+    def iter_range(self: Self, first: int, last: int) -> IteratorT:
+        """Return a generator iterator of messages [`first`, `last`)."""
+
+        for i in range(first, last):
+            yield self.get(i)
+
+    def group_digest(self: Self, group: int) -> bytes:
+        """Return the fingerprint of a message group.
+
+        Parameters
+        ----------
+        group : int
+            The index of the message group.
+
+        Returns
+        -------
+        digest : bytes
+            The fingerprint.
+        """
+
+        return bytes(self.group_digests[group * DIGEST_SIZE : (group + 1) * DIGEST_SIZE])
+
+    @staticmethod
+    def write(path: Path, data: MessageCacheData) -> None:
+        """Write a cache file, removing the least recently used ones
+        of the same context for other ROM images, see `prune`.
+
+        The file is written under a temporary name and then renamed,
+        so that another process never sees a partial file.
+
+        Parameters
+        ----------
+        path : Path
+            The path to the cache file, see `cache_path`.
+        data : MessageCacheData
+            The contents of the file.
+
+        Raises
+        ------
+        OSError
+            If the file cannot be written.
+        """
+
+        locations = array("I")
+        offsets = array("I", (0,))
+        codes = array("H")
+        for addr, shift, code_seq in data.messages:
+            locations.append((addr << 8) | shift)
+            codes.extend(code_seq)
+            offsets.append(len(codes))
+
+        header = _HEADER.pack(_MAGIC, _VERSION, len(locations), len(data.group_ends), len(codes), data.tables_digest)
+        write_atomic(path, (header, locations, offsets, data.group_ends, b"".join(data.group_digests), codes))
+        prune(path)
@@ -11,29 +11,59 @@ from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
 from array import array
+from contextlib import suppress
+from functools import partial
 from typing import TYPE_CHECKING, cast
 
 if TYPE_CHECKING:
     import mmap
-    from collections.abc import Iterator, Mapping
-    from typing import Any, Final, Self
+    from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+    from typing import Any, Final, Literal, Self
 
     type IteratorT = Iterator[tuple[int, int, array]]
+    type GroupMapT = Callable[[list[int], list[int]], Iterable[tuple[list[tuple[int, int, array]], int]]]
 
 from dqutils.bit import get_bits, get_int
-from dqutils.snescpu.mapper import make_mapper
-from dqutils.snescpu.rom_image import RomImage
+from dqutils.snescpu.rom_image import ROM_POOL, RomImage, read_at
+from dqutils.stats import CountingBuffer, active_stats
 
 if TYPE_CHECKING:
+    from dqutils.bit import BufferT
+    from dqutils.message_cache import MessageCache, MessageCacheData
+    from dqutils.message_search import MessageSearchIndex
     from dqutils.snescpu.mapper import AbstractMapper
+    from dqutils.snescpu.rom_image import FileIdentity
+    from dqutils.stats import DecoderRun
 
 _DUMMY_CODE: Final[int] = 0xFFFFFFFF
 _SHIFTBIT_ARRAY_SIZE: Final[int] = 8
+_BITS_PER_BYTE: Final[int] = 8
+_LEAF_NODE: Final[int] = 0x10000
+_LEAF_CODE_MASK: Final[int] = 0xFFFF
+
+_MESSAGE_INDEXES: dict[tuple[tuple, FileIdentity], MessageIndex] = {}
+"""The message indexes loaded so far, keyed by context and the identity
+of the ROM file."""
 
 
 class AbstractMessageGenerator(metaclass=ABCMeta):
     """The base class of MessageGenerator subclasses."""
 
+    _SHIFT_ORDER: tuple[int, ...]
+    """The shift bits in the order in which the bits of a byte are
+    consumed."""
+
+    _BYTE_ORDER: Literal["big", "little"]
+    """Either ``"big"`` if the bits of a byte are consumed from the
+    MSB, or ``"little"`` if from the LSB."""
+
+    _decode_kernel: Callable[[BufferT, int, int, array, int, Sequence[int]], tuple[int, int, array]]
+    """Decode a message bit by bit with the flattened Huffman tree."""
+
+    messages_per_group: int
+    """The number of messages that share an entry of the group table.
+    Each group can be decoded independently of the others."""
+
     # pylint: disable=too-many-instance-attributes
     def __init__(self: Self, context: Mapping[str, Any], first: int | None = None, last: int | None = None) -> None:
         """Create an object of class AbstractMessageGenerator.
@@ -61,8 +91,21 @@ class AbstractMessageGenerator(metaclass=ABCMeta):
               `first` is not specified.
             - ``message_id_last``: this value is referred when
               `last` is not specified.
-            - ``decoding_read_size``: the size of an encoded code.
             - ``decoding_mask``: the mask for an decoded code.
+            - ``decoding_engine``: either ``"bit"`` (default) to walk
+              the Huffman tree one bit at a time, ``"table"`` to
+              decode a whole byte per step with
+              `HuffmanDecodingTable`, or ``"numpy"`` to decode all
+              message groups at once with `dqutils.message_batch`
+              when iterating, which requires NumPy.
+            - ``message_index``: if True (default), `locate_message`
+              looks up a `MessageIndex` of the whole context, taken
+              from the message cache of the ROM if there is one,
+              instead of decoding preceding messages.
+            - ``message_cache``: if True, iteration reads messages
+              from a cache file under ``confdir_home()``, created at
+              the first run for each ROM. See
+              `dqutils.message_cache`. False by default.
 
         first : int, optional
             The first index of the range of indices you want.
@@ -79,6 +122,7 @@ class AbstractMessageGenerator(metaclass=ABCMeta):
             last = context["message_id_last"]
         self.first = cast(int, first)
         self.last = cast(int, last)
+        self.message_count: int | None = context.get("message_id_last")
 
         self.addr_group = context["addr_group"]
         self.addr_shiftbit_array = context["addr_shiftbit_array"]
@@ -90,9 +134,13 @@ class AbstractMessageGenerator(metaclass=ABCMeta):
         self.shiftbit_array: bytes
         self.huffman_off: bytes | None = None
         self.huffman_on: bytes | None = None
+        self.huffman_tree: array | None = None
 
-        self.decoding_read_size = context.get("decoding_read_size", 2)
         self.decoding_mask = context.get("decoding_mask", 0xFFFF)
+        self.decoding_engine = context.get("decoding_engine", "bit")
+        self.decoding_table: HuffmanDecodingTable | None = None
+        self.use_message_index: bool = context.get("message_index", True)
+        self.use_message_cache: bool = context.get("message_cache", False)
 
         self.mapper: type[AbstractMapper]
 
@@ -114,6 +162,9 @@ class AbstractMessageGenerator(metaclass=ABCMeta):
         assert len(self.huffman_off) == self.huffman_root + 2
         assert self.huffman_on
         assert len(self.huffman_on) == self.huffman_root + 2
+        assert self.huffman_tree
+        assert len(self.huffman_tree) == self.huffman_root + 2
+        assert self.decoding_engine in ("bit", "table", "numpy")
 
     def _assert_range(self: Self) -> None:
         """Test if both self.first and self.last are valid."""
@@ -130,11 +181,17 @@ class AbstractMessageGenerator(metaclass=ABCMeta):
             The input stream of ROM.
         """
 
-        self.mapper = make_mapper(rom=mem)
+        self.mapper = ROM_POOL.get_mapper(mem)
 
         self._setup_huffman_tree(mem)
         self._setup_shiftbit_array(mem)
 
+        if not self.huffman_tree:
+            self.huffman_tree = self._flatten_huffman_tree()
+
+        if self.decoding_engine == "table" and not self.decoding_table:
+            self.decoding_table = HuffmanDecodingTable(self.huffman_tree, self.huffman_root, self._SHIFT_ORDER)
+
         self.assert_valid()
 
     def _setup_huffman_tree(self: Self, mem: mmap.mmap) -> None:
@@ -152,17 +209,46 @@ class AbstractMessageGenerator(metaclass=ABCMeta):
         assert self.addr_huffman_on
 
         if not self.huffman_off:
-            mem.seek(self.mapper.from_cpu(self.addr_huffman_off))
-            self.huffman_off = mem.read(self.huffman_root + 2)
+            self.huffman_off = read_at(mem, self.mapper, self.addr_huffman_off, self.huffman_root + 2)
 
         if not self.huffman_on:
-            mem.seek(self.mapper.from_cpu(self.addr_huffman_on))
-            self.huffman_on = mem.read(self.huffman_root + 2)
+            self.huffman_on = read_at(mem, self.mapper, self.addr_huffman_on, self.huffman_root + 2)
 
         # Test postconditions.
         assert len(self.huffman_off) == self.huffman_root + 2
         assert len(self.huffman_on) == self.huffman_root + 2
 
+    def _flatten_huffman_tree(self: Self) -> array:
+        """Merge both branches of the Huffman tree into one array with
+        leaf nodes resolved in advance.
+
+        The children of the node at offset ``n`` are stored at
+        ``tree[n]`` (OFF) and ``tree[n + 1]`` (ON). A child is either
+        the offset of the next node, or the decoded character with
+        `_LEAF_NODE` set, so that decoding no longer depends on the
+        node format of each generator.
+
+        Returns
+        -------
+        tree : array
+            The flattened Huffman tree.
+        """
+
+        huffman_on, huffman_off = self.huffman_on, self.huffman_off
+        assert huffman_on
+        assert huffman_off
+
+        tree = array("I")
+        for offset in range(0, self.huffman_root + 2, 2):
+            for branch in (huffman_off, huffman_on):
+                node = get_int(branch, offset, 2)
+                if self._do_is_leaf_node(node):
+                    tree.append(_LEAF_NODE | (node & self.decoding_mask))
+                else:
+                    tree.append(self._do_next_node(node))
+
+        return tree
+
     def _setup_shiftbit_array(self: Self, mem: mmap.mmap) -> None:
         """Initialize the shiftbit array.
 
@@ -174,18 +260,17 @@ class AbstractMessageGenerator(metaclass=ABCMeta):
 
         assert self.addr_shiftbit_array
 
-        mem.seek(self.mapper.from_cpu(self.addr_shiftbit_array))
-        self.shiftbit_array = mem.read(_SHIFTBIT_ARRAY_SIZE)
+        self.shiftbit_array = read_at(mem, self.mapper, self.addr_shiftbit_array, _SHIFTBIT_ARRAY_SIZE)
 
         assert len(self.shiftbit_array) == _SHIFTBIT_ARRAY_SIZE
 
-    def locate_message(self: Self, mem: mmap.mmap, message_id: int) -> tuple[int, int]:
+    def locate_message(self: Self, mem: BufferT, message_id: int) -> tuple[int, int]:
         """Return the location where the messege data is stored.
 
         Parameters
         ----------
-        mem : mmap.mmap
-            The input stream of ROM.
+        mem : mmap.mmap or memoryview
+            The ROM image.
         message_id : int
             An ID of a message data.
 
@@ -197,37 +282,186 @@ class AbstractMessageGenerator(metaclass=ABCMeta):
             The shift from `addr`.
         """
 
+        count, addr, shift = self._locate_message_group(mem, message_id)
+        if not count:
+            return addr, shift
+
+        index = self.get_message_index(mem)
+        if index and message_id < len(index):
+            return index[message_id]
+
+        # The loop counter depends on message id & 0x0007.
+        for _ in range(count):
+            addr, shift, _ = self.decode_message(mem, addr, shift)
+
+        return addr, shift
+
+    def _locate_message_group(self: Self, mem: BufferT, message_id: int) -> tuple[int, int, int]:
+        """Return the location where the group of a message is stored.
+
+        Parameters
+        ----------
+        mem : mmap.mmap or memoryview
+            The ROM image.
+        message_id : int
+            An ID of a message data.
+
+        Returns
+        -------
+        count : int
+            The number how many message data are stored before the
+            message in the group.
+        addr : int
+            The address of the first message data of the group.
+        shift : int
+            The shift from `addr`.
+        """
+
         count, group = self._do_select_message_group(message_id)
 
-        mem.seek(self.mapper.from_cpu(self.addr_group) + group)
-        buffer1 = mem.read(3)
+        offset = self.mapper.from_cpu(self.addr_group) + group
+        buffer1 = mem[offset : offset + 3]
 
         # In fact, the array in RHS is
         # {0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80}.
         shift = self.shiftbit_array[buffer1[0] & 0x07]
         addr = get_bits(buffer1, 0, 0xFFFFF8) + self.addr_message
-        delims = self.delimiters
+        return count, addr, shift
 
-        # The loop counter depends on message id & 0x0007.
-        for _ in range(count):
-            code = _DUMMY_CODE
-            while code not in delims:
-                addr, shift, code = self.decode(mem, addr, shift)
+    def get_message_index(self: Self, mem: BufferT) -> MessageIndex | None:
+        """Return the index of the start locations of all messages.
 
-        return addr, shift
+        The index is taken from the message cache file of the ROM
+        image if any, see `update_message_cache`, or else built by
+        `build_message_index`. Either way it is shared by every
+        generator of the same context and ROM file thereafter.
 
-    def decode(self: Self, mem: mmap.mmap, addr: int, shift: int) -> tuple[int, int, int]:
-        """Decoding algorithm of Huffman coding.
+        Parameters
+        ----------
+        mem : mmap.mmap or memoryview
+            The ROM image.
 
-        Decode a Huffman-encoded bit string and return a decoded character.
+        Returns
+        -------
+        index : MessageIndex or None
+            The index, or None if ``message_index`` of the context is
+            False, the number of messages is unknown or `mem` is not
+            in `ROM_POOL`.
+        """
+
+        if not self.use_message_index or not self.message_count:
+            return None
+
+        identity = ROM_POOL.get_identity(mem)
+        if not identity:
+            return None
+
+        key = (self._message_index_key(), identity)
+        index = _MESSAGE_INDEXES.get(key)
+        if index is None:
+            index = self._load_message_index(mem) or self.build_message_index(mem)
+            _MESSAGE_INDEXES[key] = index
+        return index
+
+    def _load_message_index(self: Self, mem: BufferT) -> MessageIndex | None:
+        """Return the index of the start locations of all messages in
+        the message cache file of a ROM image, if any."""
+
+        from dqutils.message_cache import MessageCache, cache_path, rom_digest  # noqa: PLC0415
+
+        path = cache_path(self.title, self._message_index_key(), rom_digest(mem))
+        try:
+            with MessageCache(path) as cache:
+                if len(cache) != self.message_count:
+                    return None
+                starts = array("I")
+                starts.frombytes(cache.locations.cast("B"))
+        except (OSError, ValueError):
+            return None
+        return MessageIndex(starts)
+
+    def _message_index_key(self: Self) -> tuple:
+        """Return the key to identify the message index and the
+        message cache of this context."""
+
+        return (
+            type(self).__name__,
+            self.title,
+            self.addr_group,
+            self.addr_message,
+            self.addr_huffman_off,
+            self.addr_huffman_on,
+            self.huffman_root,
+            self.decoding_mask,
+            tuple(self.delimiters),
+        )
+
+    def build_message_index(self: Self, mem: BufferT) -> MessageIndex:
+        """Build the index of the start locations of all messages by
+        decoding them in a single pass.
+
+        This is as slow as decoding all messages. See
+        `get_message_index` for the index that is shared.
+
+        Parameters
+        ----------
+        mem : mmap.mmap or memoryview
+            The ROM image.
+
+        Returns
+        -------
+        index : MessageIndex
+            The index.
+        """
+
+        assert self.message_count
+
+        # The first message begins a group, so that it is located
+        # without the index.
+        messages = self._iter_messages(mem, 0, self.message_count)
+        return MessageIndex(array("I", (MessageIndex.pack(addr, shift) for addr, shift, _ in messages)))
+
+    def _locate_offset(self: Self, addr: int, offset: int, bit: int) -> tuple[int, int]:
+        """Convert a position in the ROM image into a location.
+
+        The message is a variable length-bit string. Its bits are
+        stored contiguously in the ROM image, even where the CPU
+        address crosses a bank boundary.
 
         Parameters
         ----------
-        mem : mmap.mmap
-            The input stream of ROM.
         addr : int
-            The initial address from which to read the variable
-            length-bit string.
+            An address at or before the position.
+        offset : int
+            The offset of the byte in the ROM image.
+        bit : int
+            The number of bits of the byte already consumed.
+
+        Returns
+        -------
+        addr : int
+            The address of the byte.
+        shift : int
+            The shift from `addr`.
+        """
+
+        return self.mapper.make_bank_map(addr).from_rom(offset), self._SHIFT_ORDER[bit]
+
+    def decode_message(self: Self, mem: BufferT, addr: int, shift: int) -> tuple[int, int, array]:
+        """Decode a whole message, i.e. characters up to and including
+        a delimiter.
+
+        The work is done bit by bit by the decoding kernel of the
+        generator, or by `self.decoding_table` according to
+        ``decoding_engine`` of the context. Both return the same
+        result.
+
+        Parameters
+        ----------
+        mem : mmap.mmap or memoryview
+            The ROM image.
+        addr : int
+            The address from which the message is stored.
         shift : int
             The initial shift bit of the address.
 
@@ -237,36 +471,61 @@ class AbstractMessageGenerator(metaclass=ABCMeta):
             the location of the next message data.
         shift : int
             The shift from `addr`.
-        value : int
-            A decoded character code.
+        code_seq : array
+            The decoded characters including the delimiter.
         """
 
-        # Test preconditions
-        assert addr & 0xFF000000 == 0
-        assert shift & 0xFFFFFF00 == 0
+        offset, bit, code_seq = self._decode_at(mem, self.mapper.from_cpu(addr), self._SHIFT_ORDER.index(shift))
+        return (*self._locate_offset(addr, offset, bit), code_seq)
 
-        huffman_on, huffman_off = self.huffman_on, self.huffman_off
-        assert huffman_off
-        assert huffman_on
-        node = self.huffman_root
-        from_cpu_addr = self.mapper.from_cpu
-        read_size = self.decoding_read_size
+    def _decode_at(self: Self, mem: BufferT, offset: int, bit: int) -> tuple[int, int, array]:
+        """Decode a whole message in ROM address space.
 
-        # Traverse the Huffman tree downward beginning at the root node.
-        while True:
-            # The message is a variable length-bit string.
-            # We take successive bits from the initial `addr`.
-            mem.seek(from_cpu_addr(addr))
+        Parameters
+        ----------
+        mem : mmap.mmap or memoryview
+            The ROM image.
+        offset : int
+            The offset of the byte from which the message is stored.
+        bit : int
+            The number of bits of the byte already consumed.
 
-            bit = get_int(mem.read(read_size), 0, read_size) & shift
-            addr, shift = self._do_next_location(addr, shift)
-            node = get_int(huffman_on if bit else huffman_off, node, 2)
-            if self._do_is_leaf_node(node):
-                break
+        Returns
+        -------
+        offset : int
+            The offset of the byte of the next message.
+        bit : int
+            The number of bits of the byte already consumed.
+        code_seq : array
+            The decoded characters including the delimiter.
+        """
 
-            node = self._do_next_node(node)
+        delims = self.delimiters
+        table = self.decoding_table
+        if not table:
+            tree = self.huffman_tree
+            assert tree
+            return self._decode_kernel(mem, offset, bit, tree, self.huffman_root, delims)
+
+        # Array of unsigned short values.
+        code_seq = array("H")
+        entries = table.entries
+        node = self.huffman_root
 
-        return addr, shift, node & self.decoding_mask
+        # Decode the rest of the current byte, then whole bytes.
+        while True:
+            key = table.make_key(node, bit, mem[offset])
+            entry = entries.get(key) or table.build_entry(key)
+            codes, ends, node = entry
+            for code, end in zip(codes, ends, strict=True):
+                code_seq.append(code)
+                if code in delims:
+                    if end < _BITS_PER_BYTE:
+                        return offset, end, code_seq
+                    return offset + 1, 0, code_seq
+
+            offset += 1
+            bit = 0
 
     def __iter__(self: Self) -> IteratorT:
         """Return a generator iterator."""
@@ -274,28 +533,453 @@ class AbstractMessageGenerator(metaclass=ABCMeta):
         if self.first >= self.last:
             return
 
-        with RomImage(self.title) as mem:
+        stats = active_stats()
+        with RomImage(self.title) as mem, memoryview(mem) as view:
+            if stats:
+                yield from self._iter_instrumented(stats.start_run(self.title, self), mem)
+                return
+
             self.setup(mem)
             self._assert_range()
 
-            # Locate the first data location.
-            addr_cur, shift_cur = self.locate_message(mem, self.first)
+            if self.use_message_cache and self.message_count:
+                yield from self._iter_cached(view)
+            else:
+                yield from self._iter_messages(view, self.first, self.last)
 
-            delims = self.delimiters
-            assert isinstance(delims, array)
-            assert delims.typecode == "H"
+    def _iter_instrumented(self: Self, run: DecoderRun, mem: mmap.mmap) -> IteratorT:
+        """Decode messages one by one, recording statistics.
 
-            for _ in range(self.first, self.last):
-                addr, shift = addr_cur, shift_cur
+        The message cache and the ``"numpy"`` engine are bypassed, and
+        every access to the ROM image is counted.
 
-                # Array of unsigned short values.
-                code_seq = array("H")
-                code = _DUMMY_CODE
-                while code not in delims:
-                    addr_cur, shift_cur, code = self.decode(mem, addr_cur, shift_cur)
-                    code_seq.append(code)
+        Parameters
+        ----------
+        run : DecoderRun
+            The record of statistics.
+        mem : mmap.mmap
+            The ROM image.
+
+        Yields
+        ------
+        addr : int
+            The address of the message data.
+        shift : int
+            The shift from `addr`.
+        code_seq : array
+            The decoded characters including the delimiter.
+        """
+
+        reader = cast("mmap.mmap", CountingBuffer(mem, run))
+        self.setup(reader)
+        self._assert_range()
+
+        addr, shift = self.locate_message(reader, self.first)
+        position = self._bit_position(addr, shift)
+        run.setup_time = run.restart_clock()
+
+        group_size = self.messages_per_group
+        for message_id in range(self.first, self.last):
+            addr_next, shift_next, code_seq = self.decode_message(reader, addr, shift)
+            position_next = self._bit_position(addr_next, shift_next)
+
+            # The tree is walked down one node per bit.
+            bits = position_next - position
+            run.record(message_id, message_id // group_size, len(code_seq), bits, bits)
+            yield addr, shift, code_seq
+
+            run.restart_clock()
+            addr, shift, position = addr_next, shift_next, position_next
+
+    def _bit_position(self: Self, addr: int, shift: int) -> int:
+        """Return the offset in the ROM image times eight plus the
+        bits already consumed."""
+
+        return self.mapper.from_cpu(addr) * _BITS_PER_BYTE + self._SHIFT_ORDER.index(shift)
+
+    def _iter_messages(self: Self, mem: BufferT, first: int, last: int) -> IteratorT:
+        """Decode messages [`first`, `last`) with the decoding engine.
+
+        Parameters
+        ----------
+        mem : mmap.mmap or memoryview
+            The ROM image.
+        first : int
+            The first index of the range of indices.
+        last : int
+            The last index + 1 of the range of indices.
+
+        Yields
+        ------
+        addr : int
+            The address of the message data.
+        shift : int
+            The shift from `addr`.
+        code_seq : array
+            The decoded characters including the delimiter.
+        """
+
+        if self.decoding_engine == "numpy":
+            yield from self._iter_bulk(mem, first, last)
+            return
+
+        # Locate the first data location.
+        addr, shift = self.locate_message(mem, first)
+
+        delims = self.delimiters
+        assert isinstance(delims, array)
+        assert delims.typecode == "H"
+
+        # Decode in ROM address space, and convert locations back
+        # into CPU addresses only to yield them.
+        from_rom = self.mapper.make_bank_map(addr).from_rom
+        shift_order = self._SHIFT_ORDER
+        offset, bit = self.mapper.from_cpu(addr), shift_order.index(shift)
+        for _ in range(first, last):
+            offset_next, bit_next, code_seq = self._decode_at(mem, offset, bit)
+            yield from_rom(offset), shift_order[bit], code_seq
+            offset, bit = offset_next, bit_next
+
+    def _iter_cached(self: Self, mem: BufferT) -> IteratorT:
+        """Read messages from the cache file of the context, decoding
+        all of them to create one if it is missing or out of date.
+
+        Parameters
+        ----------
+        mem : mmap.mmap or memoryview
+            The ROM image.
+
+        Yields
+        ------
+        addr : int
+            The address of the message data.
+        shift : int
+            The shift from `addr`.
+        code_seq : array
+            The decoded characters including the delimiter.
+        """
+
+        try:
+            cache = self.open_message_cache(mem)
+        except (OSError, ValueError):
+            messages, _ = self.update_message_cache(mem)
+            yield from messages[self.first : self.last]
+            return
+
+        try:
+            yield from cache.iter_range(self.first, self.last)
+        finally:
+            cache.close()
 
-                yield addr, shift, code_seq
+    def open_message_cache(self: Self, mem: BufferT) -> MessageCache:
+        """Open the cache file of the context for the ROM image.
+
+        Parameters
+        ----------
+        mem : mmap.mmap or memoryview
+            The ROM image.
+
+        Returns
+        -------
+        cache : MessageCache
+            The open cache file, which should be closed after use.
+
+        Raises
+        ------
+        OSError
+            If the file cannot be opened, e.g. it does not exist yet.
+        ValueError
+            If the file is broken or of another format version.
+        """
+
+        from dqutils.message_cache import MessageCache, cache_path, rom_digest  # noqa: PLC0415
+
+        return MessageCache(cache_path(self.title, self._message_index_key(), rom_digest(mem))).open()
+
+    def update_message_cache(
+        self: Self, mem: BufferT, map_groups: GroupMapT | None = None
+    ) -> tuple[list[tuple[int, int, array]], list[int]]:
+        """Bring the cache file of the context up to date with the ROM
+        image.
+
+        The cache file of the previous ROM image, if any, is reused
+        for message groups that have not changed since. Failing to
+        write the file is not an error.
+
+        Parameters
+        ----------
+        mem : mmap.mmap or memoryview
+            The ROM image.
+        map_groups : callable, optional
+            See `build_message_cache`.
+
+        Returns
+        -------
+        messages : list of tuple
+            All messages of the context.
+        changed : list of int
+            The IDs of messages whose characters differ from the
+            previous cache file, or all IDs if there is none.
+        """
+
+        from dqutils.message_cache import (  # noqa: PLC0415
+            MessageCache,
+            cache_path,
+            find_previous,
+            rom_digest,
+        )
+
+        path = cache_path(self.title, self._message_index_key(), rom_digest(mem))
+        previous = None
+        with suppress(OSError, ValueError):
+            if previous_path := find_previous(path):
+                previous = MessageCache(previous_path).open()
+
+        try:
+            data, changed = self.build_message_cache(mem, previous, map_groups)
+        finally:
+            if previous:
+                previous.close()
+
+        with suppress(OSError):
+            MessageCache.write(path, data)
+
+        if self.use_message_index and (identity := ROM_POOL.get_identity(mem)):
+            starts = array("I", (MessageIndex.pack(addr, shift) for addr, shift, _ in data.messages))
+            _MESSAGE_INDEXES[self._message_index_key(), identity] = MessageIndex(starts)
+        return data.messages, changed
+
+    def open_search_index(self: Self, mem: BufferT) -> MessageSearchIndex:
+        """Open the search index of the context, building it from the
+        message cache if it is missing or out of date.
+
+        Failing to write the index file is not an error; the index is
+        kept in memory then.
+
+        Parameters
+        ----------
+        mem : mmap.mmap or memoryview
+            The ROM image.
+
+        Returns
+        -------
+        index : MessageSearchIndex
+            The open index, which should be closed after use. See
+            `dqutils.message_search` for details.
+        """
+
+        from dqutils.message_cache import MessageCache, cache_path, rom_digest  # noqa: PLC0415
+        from dqutils.message_search import SUFFIX as SEARCH_INDEX_SUFFIX  # noqa: PLC0415
+        from dqutils.message_search import MessageSearchIndex  # noqa: PLC0415
+
+        path = cache_path(self.title, self._message_index_key(), rom_digest(mem)).with_suffix(SEARCH_INDEX_SUFFIX)
+        with suppress(OSError, ValueError):
+            return MessageSearchIndex(path).open()
+
+        try:
+            with MessageCache(path.with_suffix(".bin")) as cache:
+                data = MessageSearchIndex.build((i, cache.get(i)[2]) for i in range(len(cache)))
+        except (OSError, ValueError):
+            messages, _ = self.update_message_cache(mem)
+            data = MessageSearchIndex.build((i, code_seq) for i, (_, _, code_seq) in enumerate(messages))
+
+        with suppress(OSError):
+            MessageSearchIndex.write(path, data)
+            return MessageSearchIndex(path).open()
+        return MessageSearchIndex(None).load(data)
+
+    def build_message_cache(
+        self: Self, mem: BufferT, previous: MessageCache | None = None, map_groups: GroupMapT | None = None
+    ) -> tuple[MessageCacheData, list[int]]:
+        """Decode all messages of the context for a cache file.
+
+        Each message group is fingerprinted by its entry of the group
+        table and the bytes in which its messages are encoded. Given
+        the cache of a previous ROM image, only the groups whose
+        fingerprints differ are decoded; the others are copied from
+        `previous`.
+
+        Parameters
+        ----------
+        mem : mmap.mmap or memoryview
+            The ROM image.
+        previous : MessageCache, optional
+            The open cache file of a previous ROM image.
+        map_groups : callable, optional
+            A function like ``Executor.map`` which takes the first and
+            the last IDs of the message groups to decode, and returns
+            what `decode_group` returns for each of them in order,
+            e.g. from worker processes. The groups are decoded one by
+            one by default.
+
+        Returns
+        -------
+        data : MessageCacheData
+            The contents of the cache file.
+        changed : list of int
+            The IDs of messages whose characters differ from
+            `previous`, or all IDs if `previous` is None.
+        """
+
+        from dqutils.message_cache import MessageCacheData, fingerprint  # noqa: PLC0415
+
+        assert self.message_count
+        assert self.huffman_on
+        assert self.huffman_off
+
+        count = self.message_count
+        group_size = self.messages_per_group
+        tables_digest = fingerprint(self.huffman_on, self.huffman_off, self.shiftbit_array)
+        if previous and (previous.tables_digest != tables_digest or len(previous) != count):
+            previous = None
+
+        ranges = [(first, min(first + group_size, count)) for first in range(0, count, group_size)]
+        reused: list[bytes | None] = [None] * len(ranges)
+        if previous:
+            for group, (first, _) in enumerate(ranges):
+                digest = self._fingerprint_group(mem, first, previous.group_ends[group])
+                if digest == previous.group_digest(group):
+                    reused[group] = digest
+
+        if map_groups is None:
+            map_groups = partial(map, partial(self.decode_group, mem))
+        stale = [i for i, digest in zip(ranges, reused, strict=True) if digest is None]
+        decoded = iter(map_groups([i[0] for i in stale], [i[1] for i in stale]))
+
+        data = MessageCacheData([], array("I"), [], tables_digest)
+        changed: list[int] = []
+        for group, ((first, last), kept) in enumerate(zip(ranges, reused, strict=True)):
+            if previous and kept:
+                data.messages.extend(previous.iter_range(first, last))
+                data.group_ends.append(previous.group_ends[group])
+                data.group_digests.append(kept)
+                continue
+
+            messages, end = next(decoded)
+            data.messages.extend(messages)
+            data.group_ends.append(end)
+            data.group_digests.append(self._fingerprint_group(mem, first, end))
+            for message_id, (_, _, code_seq) in enumerate(messages, first):
+                if not previous or previous.get(message_id)[2] != code_seq:
+                    changed.append(message_id)
+
+        return data, changed
+
+    def decode_group(self: Self, mem: BufferT, first: int, last: int) -> tuple[list[tuple[int, int, array]], int]:
+        """Decode the messages [`first`, `last`) of a message group.
+
+        Parameters
+        ----------
+        mem : mmap.mmap or memoryview
+            The ROM image.
+        first : int
+            The ID of the first message of the group.
+        last : int
+            The last index + 1 of the messages of the group.
+
+        Returns
+        -------
+        messages : list of tuple
+            The messages.
+        end : int
+            The bit position just after the messages.
+        """
+
+        _, addr, shift = self._locate_message_group(mem, first)
+        messages = []
+        for _ in range(first, last):
+            addr_next, shift_next, code_seq = self.decode_message(mem, addr, shift)
+            messages.append((addr, shift, code_seq))
+            addr, shift = addr_next, shift_next
+
+        return messages, self._bit_position(addr, shift)
+
+    def _fingerprint_group(self: Self, mem: BufferT, first: int, end: int) -> bytes:
+        """Return the fingerprint of a message group.
+
+        Parameters
+        ----------
+        mem : mmap.mmap or memoryview
+            The ROM image.
+        first : int
+            The ID of the first message of the group.
+        end : int
+            The bit position just after the messages of the group.
+
+        Returns
+        -------
+        digest : bytes
+            The fingerprint of the entry of the group table and the
+            bytes from the group up to `end`.
+        """
+
+        from dqutils.message_cache import fingerprint  # noqa: PLC0415
+
+        _, group = self._do_select_message_group(first)
+        offset = self.mapper.from_cpu(self.addr_group) + group
+        _, addr, _ = self._locate_message_group(mem, first)
+        start = self.mapper.from_cpu(addr)
+        return fingerprint(mem[offset : offset + 3], mem[start : max(start, -(-end // _BITS_PER_BYTE))])
+
+    def _iter_bulk(self: Self, mem: BufferT, first: int, last: int) -> IteratorT:
+        """Decode messages [`first`, `last`) at once with NumPy.
+
+        Parameters
+        ----------
+        mem : mmap.mmap or memoryview
+            The ROM image.
+        first : int
+            The first index of the range of indices.
+        last : int
+            The last index + 1 of the range of indices.
+
+        Yields
+        ------
+        addr : int
+            The address of the message data.
+        shift : int
+            The shift from `addr`.
+        code_seq : array
+            The decoded characters including the delimiter.
+        """
+
+        import numpy as np  # noqa: PLC0415
+
+        from dqutils.message_batch import decode_bulk  # noqa: PLC0415
+
+        assert self.huffman_tree
+
+        # A run of messages per group, the first of which may begin in
+        # the middle of a group.
+        group_size = self.messages_per_group
+        boundary = (first // group_size + 1) * group_size
+        starts = [self.locate_message(mem, first)]
+        counts = [min(last, boundary) - first]
+        for message_id in range(boundary, last, group_size):
+            _, addr, shift = self._locate_message_group(mem, message_id)
+            starts.append((addr, shift))
+            counts.append(min(group_size, last - message_id))
+
+        start_addrs = np.array([addr for addr, _ in starts], dtype=np.int64)
+        start_bits = np.array([self._SHIFT_ORDER.index(shift) for _, shift in starts], dtype=np.int64)
+        positions = self.mapper.from_cpu_array(start_addrs) * _BITS_PER_BYTE + start_bits
+        codes, offsets, ends = decode_bulk(
+            mem, positions, counts, self.huffman_tree, self.huffman_root, self.delimiters, self._BYTE_ORDER
+        )
+
+        # Every message but the first of a run begins where the
+        # preceding one ends.
+        end_offsets, end_bits = np.divmod(ends, _BITS_PER_BYTE)
+        message_id = 0
+        for (addr, shift), count in zip(starts, counts, strict=True):
+            rest = slice(message_id, message_id + count - 1)
+            addrs = [addr, *self.mapper.make_bank_map(addr).from_rom_array(end_offsets[rest]).tolist()]
+            shifts = [shift, *(self._SHIFT_ORDER[bit] for bit in end_bits[rest].tolist())]
+            for msg_addr, msg_shift in zip(addrs, shifts, strict=True):
+                code_seq = array("H")
+                code_seq.frombytes(codes[offsets[message_id] : offsets[message_id + 1]].tobytes())
+                yield msg_addr, msg_shift, code_seq
+                message_id += 1
 
     @abstractmethod
     def _do_select_message_group(self: Self, message_id: int) -> tuple[int, int]:
@@ -330,25 +1014,6 @@ class AbstractMessageGenerator(metaclass=ABCMeta):
             True if `node` is a leaf, False otherwise.
         """
 
-    @abstractmethod
-    def _do_next_location(self: Self, addr: int, shift: int) -> tuple[int, int]:
-        """Return the next address to read data encoded.
-
-        Parameters
-        ----------
-        addr : int
-            The current address in CPU space.
-        shift : int
-            An one-byte value for mask.
-
-        Returns
-        --------
-        addr : int
-            The next address.
-        shift : int
-            The shift from `addr`.
-        """
-
     @abstractmethod
     def _do_next_node(self: Self, node: int) -> int:
         """Return the next node to traverse in the Huffman tree.
@@ -366,12 +1031,94 @@ class AbstractMessageGenerator(metaclass=ABCMeta):
 
 
 _ONLY_MSB_ON_16BIT = 0x8000
-_ONLY_MSB_ON_8BIT = 0x80
+
+
+def _decode_message_msb_first(
+    buf: BufferT, offset: int, bit: int, tree: array, root: int, delims: Sequence[int]
+) -> tuple[int, int, array]:
+    """Decode a message whose bits are consumed from the MSB of each
+    byte.
+
+    Parameters
+    ----------
+    buf : mmap.mmap or memoryview
+        The ROM image.
+    offset : int
+        The offset of the first byte of the message.
+    bit : int
+        The number of bits of the first byte already consumed.
+    tree : array
+        The flattened Huffman tree.
+    root : int
+        The value of the root.
+    delims : sequence of int
+        The codes that terminate the message.
+
+    Returns
+    -------
+    offset : int
+        The offset of the byte of the next message.
+    bit : int
+        The number of bits of the byte already consumed.
+    code_seq : array
+        The decoded characters including the delimiter.
+    """
+
+    code_seq = array("H")
+    node = root
+    while True:
+        byte = buf[offset]
+        while bit < _BITS_PER_BYTE:
+            node = tree[node + ((byte >> (7 - bit)) & 1)]
+            bit += 1
+            if node & _LEAF_NODE:
+                code = node & _LEAF_CODE_MASK
+                code_seq.append(code)
+                if code in delims:
+                    if bit == _BITS_PER_BYTE:
+                        return offset + 1, 0, code_seq
+                    return offset, bit, code_seq
+                node = root
+        offset += 1
+        bit = 0
+
+
+def _decode_message_lsb_first(
+    buf: BufferT, offset: int, bit: int, tree: array, root: int, delims: Sequence[int]
+) -> tuple[int, int, array]:
+    """Decode a message whose bits are consumed from the LSB of each
+    byte.
+
+    See `_decode_message_msb_first` for the parameters.
+    """
+
+    code_seq = array("H")
+    node = root
+    while True:
+        byte = buf[offset]
+        while bit < _BITS_PER_BYTE:
+            node = tree[node + ((byte >> bit) & 1)]
+            bit += 1
+            if node & _LEAF_NODE:
+                code = node & _LEAF_CODE_MASK
+                code_seq.append(code)
+                if code in delims:
+                    if bit == _BITS_PER_BYTE:
+                        return offset + 1, 0, code_seq
+                    return offset, bit, code_seq
+                node = root
+        offset += 1
+        bit = 0
 
 
 class MessageGeneratorW(AbstractMessageGenerator):
     """This class is for DQ3 and DQ6."""
 
+    _SHIFT_ORDER = (0x80, 0x40, 0x20, 0x10, 0x08, 0x04, 0x02, 0x01)
+    _BYTE_ORDER = "big"
+    _decode_kernel = staticmethod(_decode_message_msb_first)
+    messages_per_group = 8
+
     def _do_select_message_group(self: Self, message_id: int) -> tuple[int, int]:
         # The message ID gives the folowing information:
         # 1. 0007h bits: the number of AEh occurrences,
@@ -386,13 +1133,6 @@ class MessageGeneratorW(AbstractMessageGenerator):
     def _do_is_leaf_node(self: Self, node: int) -> bool:
         return node & _ONLY_MSB_ON_16BIT == 0
 
-    def _do_next_location(self: Self, addr: int, shift: int) -> tuple[int, int]:
-        shift >>= 1
-        if shift == 0:
-            shift = _ONLY_MSB_ON_8BIT
-            addr = self.mapper.increment_address(addr)
-        return addr, shift
-
     def _do_next_node(self: Self, node: int) -> int:
         return node & 0x7FFF
 
@@ -400,6 +1140,11 @@ class MessageGeneratorW(AbstractMessageGenerator):
 class MessageGeneratorV(AbstractMessageGenerator):
     """This class is for DQ5."""
 
+    _SHIFT_ORDER = (0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80)
+    _BYTE_ORDER = "little"
+    _decode_kernel = staticmethod(_decode_message_lsb_first)
+    messages_per_group = 16
+
     def _do_select_message_group(self: Self, message_id: int) -> tuple[int, int]:
         count = message_id & 0x000F
         group = message_id // 16 * 3
@@ -408,14 +1153,156 @@ class MessageGeneratorV(AbstractMessageGenerator):
     def _do_is_leaf_node(self: Self, node: int) -> bool:
         return node & _ONLY_MSB_ON_16BIT == _ONLY_MSB_ON_16BIT
 
-    def _do_next_location(self: Self, addr: int, shift: int) -> tuple[int, int]:
-        shift <<= 1
-        if shift > _ONLY_MSB_ON_8BIT:
-            shift = 0x01
-            addr = self.mapper.increment_address(addr)
-        return addr, shift
-
     def _do_next_node(self: Self, node: int) -> int:
         node &= 0x1FFF
         node <<= 1
         return node
+
+
+class HuffmanDecodingTable:
+    """A lookup table that decodes a byte of a Huffman-encoded bit
+    string in one step.
+
+    An entry is keyed by a node of the Huffman tree, the first bit to
+    consume and the byte itself. It holds the characters decoded from
+    the rest of the byte, the bit positions where each of them ends,
+    and the node from which the next byte is to be decoded.
+
+    Entries are built lazily by walking the tree of the generator, so
+    that only the reachable ones cost anything.
+    """
+
+    def __init__(self: Self, huffman_tree: array, huffman_root: int, shift_order: tuple[int, ...]) -> None:
+        """Create an object of class HuffmanDecodingTable.
+
+        Parameters
+        ----------
+        huffman_tree : array
+            The flattened Huffman tree of the generator.
+        huffman_root : int
+            The value of the root.
+        shift_order : tuple of int
+            The shift bits in the order in which the bits of a byte
+            are consumed.
+        """
+
+        self.huffman_tree = huffman_tree
+        self.huffman_root = huffman_root
+        self.shift_order = shift_order
+        self.entries: dict[int, tuple[tuple[int, ...], tuple[int, ...], int]] = {}
+
+    @staticmethod
+    def make_key(node: int, first_bit: int, byte: int) -> int:
+        """Return the key of an entry.
+
+        Parameters
+        ----------
+        node : int
+            The node from which to decode.
+        first_bit : int
+            The number of bits in `byte` already consumed.
+        byte : int
+            The byte to decode.
+
+        Returns
+        -------
+        key : int
+            The key of `self.entries`.
+        """
+        return (node << 11) | (first_bit << 8) | byte
+
+    def build_entry(self: Self, key: int) -> tuple[tuple[int, ...], tuple[int, ...], int]:
+        """Build and store the entry for `key`.
+
+        Parameters
+        ----------
+        key : int
+            A value returned by `make_key`.
+
+        Returns
+        -------
+        codes : tuple of int
+            The decoded characters.
+        ends : tuple of int
+            The bit position just after each character in `codes`.
+        node : int
+            The node from which the next byte is to be decoded.
+        """
+
+        tree = self.huffman_tree
+        shift_order = self.shift_order
+
+        node, first_bit, byte = key >> 11, (key >> 8) & 0x07, key & 0xFF
+        codes: list[int] = []
+        ends: list[int] = []
+        for i in range(first_bit, _BITS_PER_BYTE):
+            node = tree[node + (1 if byte & shift_order[i] else 0)]
+            if node & _LEAF_NODE:
+                codes.append(node & _LEAF_CODE_MASK)
+                ends.append(i + 1)
+                node = self.huffman_root
+
+        entry = (tuple(codes), tuple(ends), node)
+        self.entries[key] = entry
+        return entry
+
+
+class MessageIndex:
+    """The start locations of all messages of a context.
+
+    A location is packed into an unsigned integer of an array so that
+    the index of thousands of messages stays compact.
+    """
+
+    def __init__(self: Self, starts: array) -> None:
+        """Create an object of class MessageIndex.
+
+        Parameters
+        ----------
+        starts : array
+            The packed locations of messages, ordered by message ID.
+            See `pack`.
+        """
+
+        assert starts.typecode == "I"
+        self.starts = starts
+
+    @staticmethod
+    def pack(addr: int, shift: int) -> int:
+        """Pack the location of a message.
+
+        Parameters
+        ----------
+        addr : int
+            The address of the message data.
+        shift : int
+            The shift from `addr`.
+
+        Returns
+        -------
+        value : int
+            The packed location.
+        """
+        return (addr << 8) | shift
+
+    def __len__(self: Self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self: Self, message_id: int) -> tuple[int, int]:
+        """Return the location of a message.
+
+        Parameters
+        ----------
+        message_id : int
+            An ID of a message data.
+
+        Returns
+        -------
+        addr : int
+            The address of the message data.
+        shift : int
+            The shift from `addr`.
+        """
+
+        value = self.starts[message_id]
+        return value >> 8, value & 0xFF
@@ -0,0 +1,287 @@
+"""This module provides an inverted index to search messages by
+characters.
+
+The index maps each pair of adjacent character codes, i.e. a bigram,
+to the sorted locations where it occurs in decoded messages. A query
+is converted to codes rather than the decoded messages to texts, so
+that the characters of messages are never rendered to search them.
+
+An index file consists of a header, the sorted bigrams, the offset of
+the postings of each bigram, and the postings themselves. A posting
+is a message ID and a position in the message packed into an integer.
+All values are in the native byte order, and the file is mapped into
+memory as is, so that a lookup only bisects the arrays.
+
+Index files are stored next to the cache files of decoded messages,
+from which they are built. See `dqutils.message_cache`.
+
+Examples
+--------
+>>> with generator.open_search_index(mem) as index:
+...     hits = index.find(encode_text("ゆうしゃ", charmap))
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from functools import partial
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Sequence
+    from pathlib import Path
+    from types import TracebackType
+    from typing import BinaryIO, Final, Self
+
+from dqutils.message_cache import prune, touch, write_atomic
+
+_MAGIC: Final[bytes] = b"DQMS"
+_VERSION: Final[int] = 1
+_HEADER: Final[struct.Struct] = struct.Struct("=4sIII")
+"""The magic number, the format version, the number of bigrams and
+the number of postings."""
+
+_CODE_BITS: Final[int] = 16
+_POSITION_BITS: Final[int] = 32
+_POSITION_MASK: Final[int] = (1 << _POSITION_BITS) - 1
+
+SUFFIX: Final[str] = ".idx"
+"""The suffix of index files. The rest of the name is the same as that
+of the cache file of the messages."""
+
+
+class MessageSearchIndex:
+    """A read-only view of an index file.
+
+    Every character of a message but the last one, which is a
+    delimiter, is the first character of a bigram. Hence a query of a
+    single character is also answered by the index.
+    """
+
+    def __init__(self: Self, path: Path | None) -> None:
+        """Create an object of class MessageSearchIndex.
+
+        Parameters
+        ----------
+        path : Path or None
+            The path to the index file, or None if the index is to be
+            loaded with `load`.
+        """
+
+        self.path = path
+        self.fin: BinaryIO | None = None
+        self.image: mmap.mmap | None = None
+        self.views: list[memoryview] = []
+        self.grams: memoryview
+        self.starts: memoryview
+        self.postings: memoryview
+
+    def open(self: Self) -> Self:
+        """Map the index file into memory.
+
+        Raises
+        ------
+        OSError
+            If the file does not exist.
+        ValueError
+            If the file is broken or of another format version.
+        """
+
+        assert self.path
+        fin = self.path.open("rb")
+        try:
+            image = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            fin.close()
+            raise
+
+        self.fin, self.image = fin, image
+        try:
+            self._map(memoryview(image))
+        except ValueError:
+            self.close()
+            raise
+        touch(self.path)
+        return self
+
+    def load(self: Self, data: bytes) -> Self:
+        """Use the contents of an index file in memory.
+
+        Parameters
+        ----------
+        data : bytes
+            The contents, see `build`.
+
+        Raises
+        ------
+        ValueError
+            If the data is broken or of another format version.
+        """
+
+        self._map(memoryview(data))
+        return self
+
+    def _map(self: Self, view: memoryview) -> None:
+        """Divide the file into arrays."""
+
+        self.views.append(view)
+        if len(view) < _HEADER.size:
+            raise ValueError(self.path)
+
+        magic, version, num_grams, num_postings = _HEADER.unpack_from(view)
+        start_starts = _HEADER.size + 4 * num_grams
+        start_postings = start_starts + 4 * (num_grams + 1)
+        if magic != _MAGIC or version != _VERSION or len(view) != start_postings + 8 * num_postings:
+            raise ValueError(self.path)
+
+        self.grams = view[_HEADER.size : start_starts].cast("I")
+        self.starts = view[start_starts:start_postings].cast("I")
+        self.postings = view[start_postings:].cast("Q")
+        self.views += (self.grams, self.starts, self.postings)
+
+    def close(self: Self) -> None:
+        """Unmap the index file."""
+
+        # The memory map cannot be closed while any view exports it.
+        while self.views:
+            self.views.pop().release()
+        if self.image:
+            self.image.close()
+            self.image = None
+        if self.fin:
+            self.fin.close()
+            self.fin = None
+
+    def __enter__(self: Self) -> Self:
+        return self if self.views else self.open()
+
+    def __exit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def find(self: Self, pattern: Sequence[Collection[int]]) -> list[tuple[int, int]]:
+        """Return the locations of a sequence of characters.
+
+        The postings of the rarest bigram of `pattern` give the
+        candidates, and each of them is checked against the postings
+        of the other bigrams by bisection.
+
+        Parameters
+        ----------
+        pattern : sequence of collection of int
+            The alternative codes of each character, see
+            `dqutils.string.encode_text`.
+
+        Returns
+        -------
+        hits : list of tuple
+            The message ID and the position of the first character of
+            each occurrence, in ascending order.
+        """
+
+        if not pattern:
+            return []
+
+        if len(pattern) == 1:
+            # The bigrams that begin with a code are adjacent.
+            candidates: set[int] = set()
+            for code in pattern[0]:
+                lower = bisect_left(self.grams, code << _CODE_BITS)
+                upper = bisect_left(self.grams, (code + 1) << _CODE_BITS)
+                candidates.update(self.postings[self.starts[lower] : self.starts[upper]])
+            return [(i >> _POSITION_BITS, i & _POSITION_MASK) for i in sorted(candidates)]
+
+        spans = [self._find_spans(pattern[k], pattern[k + 1]) for k in range(len(pattern) - 1)]
+        rarest = min(range(len(spans)), key=lambda k: sum(stop - start for start, stop in spans[k]))
+        found = [
+            i - rarest
+            for start, stop in spans[rarest]
+            for i in self.postings[start:stop]
+            if (i & _POSITION_MASK) >= rarest
+        ]
+        for k, spans_k in enumerate(spans):
+            if k != rarest:
+                found = [i for i in found if any(self._contains(start, stop, i + k) for start, stop in spans_k)]
+
+        return [(i >> _POSITION_BITS, i & _POSITION_MASK) for i in sorted(found)]
+
+    def _find_spans(self: Self, firsts: Collection[int], seconds: Collection[int]) -> list[tuple[int, int]]:
+        """Return the ranges of the postings of the bigrams of any of
+        `firsts` followed by any of `seconds`."""
+
+        spans = []
+        for first in firsts:
+            for second in seconds:
+                gram = (first << _CODE_BITS) | second
+                i = bisect_left(self.grams, gram)
+                if i < len(self.grams) and self.grams[i] == gram:
+                    spans.append((self.starts[i], self.starts[i + 1]))
+        return spans
+
+    def _contains(self: Self, start: int, stop: int, posting: int) -> bool:
+        """Return True if `posting` is in the range of the postings."""
+
+        i = bisect_left(self.postings, posting, start, stop)
+        return i < stop and self.postings[i] == posting
+
+    @staticmethod
+    def build(messages: Iterable[tuple[int, Sequence[int]]]) -> bytes:
+        """Build the contents of an index file.
+
+        Parameters
+        ----------
+        messages : iterable of tuple
+            The ID and the decoded characters of each message, in
+            ascending order of IDs.
+
+        Returns
+        -------
+        data : bytes
+            The contents of the index file.
+        """
+
+        postings: defaultdict[int, array] = defaultdict(partial(array, "Q"))
+        for message_id, code_seq in messages:
+            base = message_id << _POSITION_BITS
+            for position in range(len(code_seq) - 1):
+                postings[(code_seq[position] << _CODE_BITS) | code_seq[position + 1]].append(base | position)
+
+        grams = array("I", sorted(postings))
+        starts = array("I", (0,))
+        joined = array("Q")
+        for gram in grams:
+            joined.extend(postings[gram])
+            starts.append(len(joined))
+
+        header = _HEADER.pack(_MAGIC, _VERSION, len(grams), len(joined))
+        return b"".join((header, grams.tobytes(), starts.tobytes(), joined.tobytes()))
+
+    @staticmethod
+    def write(path: Path, data: bytes) -> None:
+        """Write an index file, removing the least recently used ones
+        of the same context for other ROM images. See
+        `dqutils.message_cache.prune`.
+
+        Parameters
+        ----------
+        path : Path
+            The path to the index file.
+        data : bytes
+            The contents of the file, see `build`.
+
+        Raises
+        ------
+        OSError
+            If the file cannot be written.
+        """
+
+        write_atomic(path, (data,))
+        prune(path, SUFFIX)
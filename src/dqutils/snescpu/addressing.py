@@ -4,6 +4,7 @@ This module offers the addressing modes of the 65816 Processor.
 
 from __future__ import annotations
 
+from functools import cache
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -118,10 +119,13 @@ class AbstractAddressingMode:
     formatter: Callable[[DisassembleState], str] | None
 
 
-def _build_addressing_mode_classes() -> None:
-    """Register newly generated types to this module."""
+@cache
+def _build_addressing_mode_classes() -> dict[str, type[AbstractAddressingMode]]:
+    """Return newly generated types by their names.
+
+    The types are not generated until one of them is needed.
+    """
 
-    global_dicts = globals()
     addr_classes = {}
     for cols in ADDRESSING_MODE_TABLE:
         class_name = cols[0].strip()
@@ -137,10 +141,10 @@ def _build_addressing_mode_classes() -> None:
 
         addr_classes[class_name] = type(class_name, (AbstractAddressingMode,), attrs)
 
-    global_dicts.update(addr_classes)
+    return addr_classes
 
 
-def get_addressing_mode(name: str) -> AbstractAddressingMode | None:
+def get_addressing_mode(name: str) -> type[AbstractAddressingMode] | None:
     """Return the addressing mode object by its name.
 
     If `name` is empty, ``None`` is returned.
@@ -162,10 +166,17 @@ def get_addressing_mode(name: str) -> AbstractAddressingMode | None:
     """
 
     if name_stripped := name.strip():
-        return globals()[name_stripped]
+        return _build_addressing_mode_classes()[name_stripped]
 
     # WDM
     return None
 
 
-_build_addressing_mode_classes()
+def __getattr__(name: str) -> type[AbstractAddressingMode]:
+    """Return the addressing mode class of `name` as a module attribute."""
+
+    try:
+        return _build_addressing_mode_classes()[name]
+    except KeyError:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg) from None
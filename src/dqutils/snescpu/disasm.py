@@ -8,8 +8,7 @@ from argparse import ArgumentParser
 from typing import TYPE_CHECKING
 
 from dqutils.release import __version__
-from dqutils.snescpu.mapper import make_mapper
-from dqutils.snescpu.rom_image import RomImage
+from dqutils.snescpu.rom_image import ROM_POOL, RomImage
 from dqutils.snescpu.statemachine import StateMachine
 
 if TYPE_CHECKING:
@@ -97,7 +96,7 @@ def create_args(rom: mmap.mmap, cmdline_args: Sequence[str] = []) -> tuple[dict[
 
     context = {}
     # properties for DQ6.
-    mapper = make_mapper(rom=rom)
+    mapper = ROM_POOL.get_mapper(rom)
 
     # Initialize register flags, nvmxdizc.
     flags = 0x00
@@ -31,8 +31,7 @@ if TYPE_CHECKING:
 
 from dqutils.bit import get_bits
 from dqutils.release import __version__
-from dqutils.snescpu.mapper import make_mapper
-from dqutils.snescpu.rom_image import RomImage
+from dqutils.snescpu.rom_image import ROM_POOL, RomImage
 
 
 def int_wrapper(string: str) -> int:
@@ -97,10 +96,11 @@ def dump(
     fmts = [formatter(i[COLUMN_MASK_BITS]) for i in members]
 
     with RomImage(title) as rom:
-        mapper = make_mapper(rom)
-        rom.seek(mapper.from_cpu(address))
+        mapper = ROM_POOL.get_mapper(rom)
+        offset = mapper.from_cpu(address)
         for i in range(sizeof_array):
-            chunk = rom.read(sizeof_object)
+            chunk = rom[offset : offset + sizeof_object]
+            offset += sizeof_object
 
             output = [f"{i:04X}"]
             output.extend(
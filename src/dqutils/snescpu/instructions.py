@@ -4,6 +4,7 @@ Instructions of the 65816 Processor.
 
 from __future__ import annotations
 
+from functools import cache
 from typing import TYPE_CHECKING, Any
 
 from dqutils.snescpu.addressing import get_addressing_mode
@@ -378,7 +379,7 @@ class AbstractInstruction:
 
 
 def _build_instruction_classes() -> list[type[AbstractInstruction]]:
-    """Register newly generated types to this module."""
+    """Return newly generated types in the order of opcodes."""
 
     global_dicts = globals()
     # inst_classes = {}
@@ -430,7 +431,30 @@ def get_instruction(opcode: bytes | int) -> type[AbstractInstruction]:
         opcode = int.from_bytes(opcode, "little")
 
     assert isinstance(opcode, int)
-    return DEFAULT_INSTRUCTIONS[opcode]
+    return get_instructions()[opcode]
 
 
-DEFAULT_INSTRUCTIONS = tuple(_build_instruction_classes())
+@cache
+def get_instructions() -> tuple[type[AbstractInstruction], ...]:
+    """Return the instruction objects in the order of opcodes.
+
+    The objects are not generated until one of them is needed. They are
+    also available as `DEFAULT_INSTRUCTIONS`.
+
+    Returns
+    -------
+    instructions : tuple of AbstractInstruction
+        The objects for all of the instructions of the 65816 Processor.
+    """
+
+    return tuple(_build_instruction_classes())
+
+
+def __getattr__(name: str) -> tuple[type[AbstractInstruction], ...]:
+    """Return `DEFAULT_INSTRUCTIONS` on the first access."""
+
+    if name == "DEFAULT_INSTRUCTIONS":
+        return get_instructions()
+
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
@@ -3,12 +3,22 @@
 from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
+from array import array
+from functools import cache
 from typing import TYPE_CHECKING, Self
 
 if TYPE_CHECKING:
     import mmap
+    from collections.abc import Callable
+    from typing import Any
 
-from dqutils.snescpu.rom_image import get_snes_header
+    import numpy as np
+
+    from dqutils.snescpu.rom_image import SnesHeader
+
+    type AddressArrayT = array | np.ndarray
+
+from dqutils.snescpu.rom_image import parse_snes_header
 
 
 class AbstractMapper(metaclass=ABCMeta):
@@ -89,6 +99,227 @@ class AbstractMapper(metaclass=ABCMeta):
             A CPU address.
         """
 
+    @staticmethod
+    @abstractmethod
+    def _increment_addresses(addrs: Any) -> Any:
+        """Increment CPU addresses in the same way as
+        `increment_address` without branches, so that this works on
+        both an int and a NumPy array."""
+
+    @classmethod
+    def from_rom_array(cls: type[Self], romaddrs: AddressArrayT) -> AddressArrayT:
+        """Convert ROM addresses to CPU addresses at once.
+
+        Parameters
+        ----------
+        romaddrs : array or numpy.ndarray
+            ROM addresses, e.g. in ``array("I")``.
+
+        Returns
+        -------
+        cpuaddrs : array or numpy.ndarray
+            The CPU addresses in the same type as `romaddrs`.
+        """
+
+        return _map_addresses(cls.from_rom, romaddrs)
+
+    @classmethod
+    def from_cpu_array(cls: type[Self], cpuaddrs: AddressArrayT) -> AddressArrayT:
+        """Convert CPU addresses to ROM addresses at once.
+
+        Parameters
+        ----------
+        cpuaddrs : array or numpy.ndarray
+            CPU addresses, e.g. in ``array("I")``.
+
+        Returns
+        -------
+        romaddrs : array or numpy.ndarray
+            The ROM addresses in the same type as `cpuaddrs`.
+        """
+
+        return _map_addresses(cls.from_cpu, cpuaddrs)
+
+    @classmethod
+    def increment_address_array(cls: type[Self], addrs: AddressArrayT) -> AddressArrayT:
+        """Increment CPU addresses at once.
+
+        Parameters
+        ----------
+        addrs : array or numpy.ndarray
+            CPU addresses, e.g. in ``array("I")``.
+
+        Returns
+        -------
+        cpuaddrs : array or numpy.ndarray
+            The next CPU addresses in the same type as `addrs`.
+        """
+
+        return _map_addresses(cls._increment_addresses, addrs)
+
+    @classmethod
+    def rom_spans(cls: type[Self], first: int, last: int) -> list[tuple[int, int]]:
+        """Return the ranges of ROM addresses that a range of CPU
+        addresses occupies.
+
+        Parameters
+        ----------
+        first : int
+            The first CPU address.
+        last : int
+            The CPU address next to the range, which is reached from
+            `first` by `increment_address`.
+
+        Returns
+        -------
+        spans : list of tuple
+            The first ROM address and the one next to the last of each
+            contiguous range, in the order of CPU addresses.
+
+        Examples
+        --------
+        >>> LoROM.rom_spans(0x00FFF0, 0x018010)
+        [(32752, 32784)]
+        """
+
+        spans: list[tuple[int, int]] = []
+        addr = first
+        while addr < last:
+            # The end of the CPU bank.
+            stop = min(last, (addr | 0xFFFF) + 1)
+            start = cls.from_cpu(addr)
+            end = start + stop - addr
+            if spans and spans[-1][1] == start:
+                spans[-1] = (spans[-1][0], end)
+            else:
+                spans.append((start, end))
+            addr = cls.increment_address(stop - 1)
+        return spans
+
+    @classmethod
+    def make_bank_map(cls: type[Self], addr: int) -> BankMap:
+        """Return the map of banks reached by incrementing a CPU
+        address.
+
+        Maps are shared between addresses in the same bank.
+
+        Parameters
+        ----------
+        addr : int
+            A CPU address.
+
+        Returns
+        -------
+        bank_map : BankMap
+            The map that converts ROM addresses at or after `addr`.
+        """
+
+        return _make_bank_map(cls, addr - cls.from_cpu(addr) % cls.bank_offset_size)
+
+
+def _map_addresses(func: Callable[[Any], Any], addrs: AddressArrayT) -> AddressArrayT:
+    """Apply an address conversion of int operators to all addresses
+    at once, with NumPy if it is available."""
+
+    if not isinstance(addrs, array):
+        return func(addrs).astype(addrs.dtype, copy=False)
+
+    try:
+        import numpy as np  # noqa: PLC0415
+    except ImportError:
+        return array(addrs.typecode, map(func, addrs))
+
+    dtype = np.dtype(addrs.typecode)
+    return array(addrs.typecode, func(np.frombuffer(addrs, dtype=dtype)).astype(dtype, copy=False).tobytes())
+
+
+@cache
+def _make_bank_map(mapper: type[AbstractMapper], bank_addr: int) -> BankMap:
+    return BankMap(mapper, bank_addr)
+
+
+class BankMap:
+    """A table of the CPU addresses at which ROM banks begin, as
+    reached by `AbstractMapper.increment_address` from an address.
+
+    It converts a ROM address into a CPU address with a lookup,
+    whereas stepping `increment_address` costs one call per byte.
+    This lets data that runs across bank boundaries, such as encoded
+    messages, be scanned in linear ROM address space.
+    """
+
+    def __init__(self: Self, mapper: type[AbstractMapper], addr: int) -> None:
+        """Create an object of class BankMap.
+
+        Parameters
+        ----------
+        mapper : type[AbstractMapper]
+            The mapper type.
+        addr : int
+            The CPU address from which to increment.
+        """
+
+        self.increment_address = mapper.increment_address
+        self.bank_size = mapper.bank_offset_size
+        self.first_bank = mapper.from_cpu(addr) // self.bank_size
+        self.bank_addrs = [addr - mapper.from_cpu(addr) % self.bank_size]
+
+    def from_rom(self: Self, romaddr: int) -> int:
+        """Convert from a ROM address to a CPU address.
+
+        Parameters
+        ----------
+        romaddr : int
+            A ROM address at or after the bank of the address from
+            which the map is made.
+
+        Returns
+        -------
+        cpuaddr : int
+            The CPU address.
+        """
+
+        bank, offset = divmod(romaddr, self.bank_size)
+        index = bank - self.first_bank
+        assert index >= 0
+
+        self._extend(index)
+        return self.bank_addrs[index] + offset
+
+    def from_rom_array(self: Self, romaddrs: np.ndarray) -> np.ndarray:
+        """Convert ROM addresses to CPU addresses at once.
+
+        Parameters
+        ----------
+        romaddrs : numpy.ndarray
+            ROM addresses at or after the bank of the address from
+            which the map is made.
+
+        Returns
+        -------
+        cpuaddrs : numpy.ndarray
+            The CPU addresses in ``int64``.
+        """
+
+        import numpy as np  # noqa: PLC0415
+
+        if not len(romaddrs):
+            return np.empty(0, dtype=np.int64)
+
+        banks, offsets = np.divmod(romaddrs.astype(np.int64), self.bank_size)
+        indexes = banks - self.first_bank
+        assert indexes.min() >= 0
+
+        self._extend(int(indexes.max()))
+        return np.array(self.bank_addrs, dtype=np.int64)[indexes] + offsets
+
+    def _extend(self: Self, index: int) -> None:
+        """Add the CPU addresses of banks up to `index`."""
+
+        bank_addrs = self.bank_addrs
+        while len(bank_addrs) <= index:
+            bank_addrs.append(self.increment_address(bank_addrs[-1] + self.bank_size - 1))
+
 
 class HiROM(AbstractMapper):
     """HiROM mapper.
@@ -182,6 +413,10 @@ class HiROM(AbstractMapper):
         """
         return addr + 1
 
+    @staticmethod
+    def _increment_addresses(addrs: Any) -> Any:
+        return addrs + 1
+
 
 class LoROM(AbstractMapper):
     """LoROM mapper.
@@ -275,6 +510,12 @@ class LoROM(AbstractMapper):
             addr = (addr & 0xFF0000) | 0x8000
         return addr
 
+    @staticmethod
+    def _increment_addresses(addrs: Any) -> Any:
+        addrs = addrs + 1
+        # Skip [$8000, $10000) of the next bank if the bank is over.
+        return addrs + ((addrs & 0xFFFF) == 0) * 0x8000
+
 
 class MapperNotFoundError(Exception):
     def __init__(self: Self) -> None:
@@ -284,7 +525,9 @@ class MapperNotFoundError(Exception):
 HEADER_LENGTH = 0x40
 
 
-def make_mapper(rom: mmap.mmap | None = None, name: str | None = None) -> type[AbstractMapper]:
+def make_mapper(
+    rom: mmap.mmap | None = None, name: str | None = None, header: SnesHeader | None = None
+) -> type[AbstractMapper]:
     """Return a mapper type.
 
     You may also directly use subclasses of class AbstractMapper.
@@ -295,6 +538,9 @@ def make_mapper(rom: mmap.mmap | None = None, name: str | None = None) -> type[A
         A ROM image object.
     name : str
         Mapper's name. Either 'HiROM' or 'LoROM' may be specified.
+    header : SnesHeader, optional
+        The parsed SNES header of a ROM image, which saves reading the
+        header from `rom`.
 
     Returns
     -------
@@ -306,21 +552,32 @@ def make_mapper(rom: mmap.mmap | None = None, name: str | None = None) -> type[A
     get_snes_header
     """
 
-    assert rom or name
+    assert rom or name or header
 
-    # pylint: disable=no-member
-    mappers = AbstractMapper.__subclasses__()
-
-    if rom:
-        header = get_snes_header(rom)
-        assert isinstance(header, bytes)
-        assert len(header) == HEADER_LENGTH
+    if rom and not header:
+        header = parse_snes_header(rom)
 
-        # ROM makeup byte.
-        mapper_byte = header[0x15]
-        return next(cls for cls in mappers if cls.check_header_mapper_byte(mapper_byte))
+    if header:
+        assert len(header.raw) == HEADER_LENGTH
+        return _find_mapper_by_byte(header.map_mode)
 
     if name:
-        return next(cls for cls in mappers if cls.__name__ == name)
+        return _find_mapper_by_name(name)
 
     raise MapperNotFoundError
+
+
+@cache
+def _find_mapper_by_byte(mapper_byte: int) -> type[AbstractMapper]:
+    """Return the mapper type that matches the ROM makeup byte."""
+
+    # pylint: disable=no-member
+    return next(cls for cls in AbstractMapper.__subclasses__() if cls.check_header_mapper_byte(mapper_byte))
+
+
+@cache
+def _find_mapper_by_name(name: str) -> type[AbstractMapper]:
+    """Return the mapper type of a name."""
+
+    # pylint: disable=no-member
+    return next(cls for cls in AbstractMapper.__subclasses__() if cls.__name__ == name)
@@ -3,18 +3,256 @@
 from __future__ import annotations
 
 import mmap
-from typing import TYPE_CHECKING
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
     from types import TracebackType
-    from typing import BinaryIO, Self
+    from typing import BinaryIO, Final, Self
+
+    from dqutils.snescpu.mapper import AbstractMapper
+
+    type FileIdentity = tuple[str, int, int]
 
 from dqutils.config import get_config, ConfigNotFoundError
 
 
 # pylint: disable=too-few-public-methods
+class RomHandle:
+    """A memory-mapped ROM image shared in the process.
+
+    See `RomPool`.
+    """
+
+    def __init__(self: Self, key: tuple[str, str], fin: BinaryIO, image: mmap.mmap) -> None:
+        """Create an object of class RomHandle.
+
+        Parameters
+        ----------
+        key : tuple of str
+            The title and the path of the ROM image.
+        fin : BinaryIO
+            The file of the ROM image.
+        image : mmap.mmap
+            The read-only mapping of `fin`.
+        """
+
+        self.key = key
+        self.fin = fin
+        self.image = image
+        self.identity = file_identity(key[1], os.fstat(fin.fileno()))
+        self.refcount = 0
+        self.header: SnesHeader | None = None
+
+
+class RomPool:
+    """A pool of memory-mapped ROM images shared in the process.
+
+    `RomImage` acquires a handle from the pool on entry and releases it
+    on exit. Every user of the same title and path gets the same
+    mapping, which is closed when the last user releases it. Use
+    `hold` to keep a mapping open across many short uses, e.g. in a
+    service. The pool may be used from several threads.
+
+    Examples
+    --------
+    >>> with ROM_POOL.hold("DRAGONQUEST6"):
+    ...     for i in requests:
+    ...         answer(enum_battle(i, i + 1))
+    """
+
+    def __init__(self: Self) -> None:
+        """Create an object of class RomPool."""
+
+        self._handles: dict[tuple[str, str], RomHandle] = {}
+        self._images: dict[int, RomHandle] = {}
+        self._release_hooks: list[Callable[[FileIdentity], None]] = []
+        self._lock = threading.Lock()
+
+    def acquire(self: Self, title: str) -> RomHandle:
+        """Return the handle of a ROM image, opening it if necessary.
+
+        Parameters
+        ----------
+        title : str
+            The title of SNES ROM to read.
+
+        Returns
+        -------
+        handle : RomHandle
+            The handle, which shall be passed to `release` later.
+
+        Raises
+        ------
+        ConfigNotFoundError
+            If the configuration is not found.
+        """
+
+        conf = get_config()
+        if not conf:
+            raise ConfigNotFoundError
+        key = (title, conf.get("ROM", title))
+
+        with self._lock:
+            handle = self._handles.get(key)
+            if not handle:
+                fin = open(key[1], "rb")  # noqa: SIM115
+                try:
+                    image = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError):
+                    fin.close()
+                    raise
+                handle = RomHandle(key, fin, image)
+                self._handles[key] = self._images[id(image)] = handle
+            handle.refcount += 1
+            return handle
+
+    def release(self: Self, handle: RomHandle) -> None:
+        """Release a handle, closing the ROM image if it is no longer
+        used.
+
+        Parameters
+        ----------
+        handle : RomHandle
+            The handle that `acquire` has returned.
+        """
+
+        with self._lock:
+            assert handle.refcount > 0
+            handle.refcount -= 1
+            if handle.refcount:
+                return
+            del self._handles[handle.key]
+            del self._images[id(handle.image)]
+
+        handle.image.close()
+        handle.fin.close()
+        for hook in self._release_hooks:
+            hook(handle.identity)
+
+    def add_release_hook(self: Self, hook: Callable[[FileIdentity], None]) -> None:
+        """Register a function called whenever a ROM image is closed.
+
+        Use this to drop data derived from the contents of the image.
+
+        Parameters
+        ----------
+        hook : callable
+            The function, which is called with the identity of the
+            file of the closed image, see `get_identity`.
+        """
+
+        self._release_hooks.append(hook)
+
+    @contextmanager
+    def hold(self: Self, title: str) -> Iterator[mmap.mmap]:
+        """Keep a ROM image open in the block.
+
+        Parameters
+        ----------
+        title : str
+            The title of SNES ROM to read.
+
+        Yields
+        ------
+        mem : mmap.mmap
+            The ROM image.
+        """
+
+        handle = self.acquire(title)
+        try:
+            yield handle.image
+        finally:
+            self.release(handle)
+
+    def get_header(self: Self, mem: mmap.mmap) -> SnesHeader:
+        """Return the SNES header of a ROM image.
+
+        The header of a mapping in the pool is parsed from the mapping
+        once and kept while it is open, so that it always describes
+        the bytes being read even if the file has been replaced since.
+
+        Parameters
+        ----------
+        mem : mmap.mmap
+            The ROM image, which need not be in the pool.
+
+        Returns
+        -------
+        header : SnesHeader
+            The parsed header.
+        """
+
+        handle = self._find(mem)
+        if not handle:
+            return parse_snes_header(mem)
+        if not handle.header:
+            handle.header = parse_snes_header(handle.image)
+        return handle.header
+
+    def get_identity(self: Self, mem: object) -> FileIdentity | None:
+        """Return the identity of the file of a ROM image.
+
+        Data derived from the contents of a ROM image may be kept by
+        this identity, which changes whenever the file is modified.
+
+        Parameters
+        ----------
+        mem : mmap.mmap or memoryview
+            The ROM image, or a view of it. Any other buffer is not in
+            the pool.
+
+        Returns
+        -------
+        identity : tuple or None
+            The resolved path, the size and the modification time in
+            nanoseconds of the file when it was opened, or None if
+            `mem` is not in the pool.
+        """
+
+        handle = self._find(mem)
+        return handle.identity if handle else None
+
+    def _find(self: Self, mem: object) -> RomHandle | None:
+        """Return the handle of a ROM image or a view of it, if any."""
+
+        image = mem.obj if isinstance(mem, memoryview) else mem
+        handle = self._images.get(id(image))
+        return handle if handle and handle.image is image else None
+
+    def get_mapper(self: Self, mem: mmap.mmap) -> type[AbstractMapper]:
+        """Return the mapper of a ROM image.
+
+        Parameters
+        ----------
+        mem : mmap.mmap
+            The ROM image, which need not be in the pool.
+
+        Returns
+        -------
+        mapper : type[AbstractMapper]
+            The mapper type.
+        """
+
+        from dqutils.snescpu.mapper import make_mapper  # noqa: PLC0415
+
+        return make_mapper(header=self.get_header(mem))
+
+
+ROM_POOL = RomPool()
+"""The pool of ROM images that `RomImage` uses."""
+
+
 class RomImage:
-    """This class manages the file handler of given SNES ROM image."""
+    """This class manages the file handler of given SNES ROM image.
+
+    The ROM image is shared with the other objects of the same title,
+    see `RomPool`.
+    """
 
     def __init__(self: Self, title: str) -> None:
         """Create an object of RomImage.
@@ -35,19 +273,12 @@ class RomImage:
         """
 
         self.title = title
-        self.fin: BinaryIO
-        self.image: mmap.mmap
+        self.handle: RomHandle | None = None
 
     def __enter__(self: Self) -> mmap.mmap:
-        conf = get_config()
-        if not conf:
-            raise ConfigNotFoundError
-
-        fin = open(conf.get("ROM", self.title), "rb")  # noqa: SIM115
-        image = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
-
-        self.fin, self.image = fin, image
-        return self.image
+        assert not self.handle
+        self.handle = ROM_POOL.acquire(self.title)
+        return self.handle.image
 
     def __exit__(
         self: Self,
@@ -55,10 +286,37 @@ class RomImage:
         exc_value: BaseException | None,
         traceback: TracebackType | None,
     ) -> None:
-        if self.image:
-            self.image.close()
-        if self.fin:
-            self.fin.close()
+        if self.handle:
+            ROM_POOL.release(self.handle)
+            self.handle = None
+
+
+def read_at(mem: mmap.mmap, mapper: type[AbstractMapper], cpu_addr: int, size: int) -> bytes:
+    """Return the bytes at a CPU address of a ROM image.
+
+    Unlike ``mem.seek`` and ``mem.read``, this function does not move
+    the file position of `mem`, so that several threads may read the
+    same ROM image at once. Slice `mem` itself to read by ROM offset.
+
+    Parameters
+    ----------
+    mem : mmap.mmap
+        The ROM image.
+    mapper : type[AbstractMapper]
+        The mapper of `mem`.
+    cpu_addr : int
+        The CPU address of the bytes.
+    size : int
+        The number of bytes, which are contiguous in the ROM image.
+
+    Returns
+    -------
+    data : bytes
+        The bytes, which are shorter than `size` at the end of `mem`.
+    """
+
+    offset = mapper.from_cpu(cpu_addr)
+    return mem[offset : offset + size]
 
 
 class RomHeaderNotFoundError(Exception):
@@ -66,6 +324,184 @@ class RomHeaderNotFoundError(Exception):
         super().__init__("ROM header not found")
 
 
+_HEADER_OFFSETS: Final[tuple[int, ...]] = (0x7FC0, 0xFFC0)
+"""The ROM offsets of the SNES header of LoROM and HiROM images."""
+
+_HEADER_SIZE: Final[int] = 64
+
+_HEADERS: dict[FileIdentity, SnesHeader] = {}
+"""The headers parsed so far, keyed by the identity of the ROM file.
+See `read_snes_header`."""
+
+_HEADERS_LOCK = threading.Lock()
+
+
+class SnesHeader(NamedTuple):
+    """The SNES header of a ROM image.
+
+    Use `parse_snes_header` or `read_snes_header` to create one.
+    """
+
+    raw: bytes
+    """The 64 bytes of the header."""
+
+    offset: int
+    """The ROM offset of the header."""
+
+    title: str
+    """The game title, e.g. ``"DRAGONQUEST6"``."""
+
+    map_mode: int
+    """The ROM makeup byte, whose lowest bit is set for HiROM."""
+
+    rom_size: int
+    """The size of the ROM in bytes."""
+
+    checksum: int
+    """The checksum of the ROM."""
+
+    @classmethod
+    def from_bytes(cls: type[Self], raw: bytes, offset: int) -> Self:
+        """Parse the 64 bytes of the header.
+
+        Parameters
+        ----------
+        raw : bytes
+            The bytes of the header.
+        offset : int
+            The ROM offset of the header.
+
+        Returns
+        -------
+        header : SnesHeader
+            The parsed header.
+        """
+
+        return cls(
+            raw,
+            offset,
+            raw[:0x15].decode("ascii", "replace").rstrip(" \0"),
+            raw[0x15],
+            0x400 << raw[0x17],
+            int.from_bytes(raw[0x1E:0x20], "little"),
+        )
+
+
+def parse_snes_header(mem: mmap.mmap | bytes) -> SnesHeader:
+    """Return the parsed SNES header of a ROM image.
+
+    Parameters
+    ----------
+    mem : mmap.mmap or bytes
+        The ROM image, or its first 64 KiB at least.
+
+    Returns
+    -------
+    header : SnesHeader
+        The parsed header.
+
+    Raises
+    ------
+    RomHeaderNotFoundError
+        If there is no valid header.
+    """
+
+    # Detect which ROM type it is.
+    # For LoROM, SNES header is located in [$7FC0, $8000),
+    # while for HiROM, in [$FFC0, $10000).
+    for i in _HEADER_OFFSETS:
+        buffer = mem[i : i + _HEADER_SIZE]
+
+        # [$xFDC, $xFDE): checksum complement (inverse).
+        # [$xFDE, $xFE0): checksum bytes.
+        chksum1 = int.from_bytes(buffer[0x1C:0x1E], "little")
+        chksum2 = int.from_bytes(buffer[0x1E:0x20], "little")
+        if len(buffer) == _HEADER_SIZE and chksum1 ^ chksum2 == 0xFFFF:  # noqa: PLR2004
+            return SnesHeader.from_bytes(buffer, i)
+    raise RomHeaderNotFoundError
+
+
+def file_identity(path: str | Path, stat: os.stat_result) -> FileIdentity:
+    """Return the identity of a file.
+
+    Parameters
+    ----------
+    path : str or Path
+        The path to the file.
+    stat : os.stat_result
+        The status of the file.
+
+    Returns
+    -------
+    identity : tuple
+        The resolved path, the size and the modification time in
+        nanoseconds of the file.
+    """
+
+    return (str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+
+
+def read_snes_header(path: str | Path) -> SnesHeader:
+    """Return the parsed SNES header of a ROM file.
+
+    The header is parsed only once for each path, size and
+    modification time of the file.
+
+    Parameters
+    ----------
+    path : str or Path
+        The path to the ROM file.
+
+    Returns
+    -------
+    header : SnesHeader
+        The parsed header.
+
+    Raises
+    ------
+    OSError
+        If the file cannot be read.
+    RomHeaderNotFoundError
+        If there is no valid header.
+    """
+
+    path = Path(path)
+    key = file_identity(path, path.stat())
+    header = _HEADERS.get(key)
+    if header:
+        return header
+
+    with path.open("rb") as fin:
+        header = parse_snes_header(fin.read(_HEADER_OFFSETS[-1] + _HEADER_SIZE))
+    with _HEADERS_LOCK:
+        _HEADERS[key] = header
+    return header
+
+
+def scan_snes_headers(paths: Iterable[str | Path]) -> dict[str | Path, SnesHeader | None]:
+    """Return the parsed SNES headers of many ROM files.
+
+    Parameters
+    ----------
+    paths : iterable of str or Path
+        The paths to the ROM files.
+
+    Returns
+    -------
+    headers : dict
+        The header of each path, or None if the file cannot be read or
+        has no valid header.
+    """
+
+    headers: dict[str | Path, SnesHeader | None] = {}
+    for i in paths:
+        try:
+            headers[i] = read_snes_header(i)
+        except (OSError, RomHeaderNotFoundError):
+            headers[i] = None
+    return headers
+
+
 def get_snes_header(mem: mmap.mmap) -> bytes:
     """Return the 64 bytes of cartridge information a.k.a. SNES
     header.
@@ -83,22 +519,4 @@ def get_snes_header(mem: mmap.mmap) -> bytes:
     """
 
     assert not mem.closed
-
-    bkp = mem.tell()
-    try:
-        # Detect which ROM type it is.
-        # For LoROM, SNES header is located in [$7FC0, $8000),
-        # while for HiROM, in [$FFC0, $10000).
-        for i in (0x7FC0, 0xFFC0):
-            mem.seek(i)
-            buffer = mem.read(64)
-
-            # [$xFDC, $xFDE): checksum complement (inverse).
-            # [$xFDE, $xFE0): checksum bytes.
-            chksum1 = int.from_bytes(buffer[0x1C:0x1E], "little")
-            chksum2 = int.from_bytes(buffer[0x1E:0x20], "little")
-            if chksum1 ^ chksum2 == 0xFFFF:  # noqa: PLR2004
-                return buffer
-        raise RomHeaderNotFoundError
-    finally:
-        mem.seek(bkp)
+    return parse_snes_header(mem).raw
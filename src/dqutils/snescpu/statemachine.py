@@ -7,7 +7,7 @@ from __future__ import annotations
 import sys
 from typing import TYPE_CHECKING
 
-from dqutils.snescpu.mapper import make_mapper
+from dqutils.snescpu.rom_image import ROM_POOL
 
 if TYPE_CHECKING:
     import mmap
@@ -50,7 +50,8 @@ class StateMachine:
         """
 
         self.rom = rom
-        self.mapper = mapper if mapper else make_mapper(rom=rom)
+        self.mapper = mapper if mapper else ROM_POOL.get_mapper(rom)
+        self.rom_addr = 0
         self.last_rom_addr: int
 
         self.initial_state = initial_state
@@ -70,7 +71,30 @@ class StateMachine:
         """
         assert self.rom
         assert self.mapper
-        return self.mapper.from_rom(self.rom.tell())
+        return self.mapper.from_rom(self.rom_addr)
+
+    def read(self: Self, size: int) -> bytes:
+        """Read bytes at the program counter and advance it.
+
+        The file position of `rom` is never used, so that several
+        state machines may run on the same ROM image at once.
+
+        Parameters
+        ----------
+        size : int
+            The number of bytes.
+
+        Returns
+        -------
+        data : bytes
+            The bytes, which are shorter than `size` at the end of the
+            ROM image.
+        """
+
+        start = self.rom_addr
+        data = self.rom[start : start + size]
+        self.rom_addr = start + len(data)
+        return data
 
     def unlink(self: Self) -> None:
         """Remove circular references.
@@ -131,8 +155,8 @@ class StateMachine:
         first = kwargs.get("first", 0)
         last = kwargs.get("last", -1)
 
-        self.rom.seek(self.mapper.from_cpu(first))
-        self.last_rom_addr = self.mapper.from_cpu(last) if last != -1 else self.rom.size()
+        self.rom_addr = self.mapper.from_cpu(first)
+        self.last_rom_addr = self.mapper.from_cpu(last) if last != -1 else len(self.rom)
         self.runtime_init(**kwargs)
 
         state = self.get_state()
@@ -14,7 +14,7 @@ if TYPE_CHECKING:
 
     type ContextT = MutableMapping[str, Any]
 
-from dqutils.snescpu.instructions import DEFAULT_INSTRUCTIONS
+from dqutils.snescpu.instructions import get_instructions
 
 if TYPE_CHECKING:
     from dqutils.snescpu.instructions import AbstractInstruction
@@ -124,7 +124,7 @@ class DisassembleState(AbstractState):
         self.until_return = False
 
         # Initialize this own instruction table.
-        instructions = list(DEFAULT_INSTRUCTIONS)
+        instructions = list(get_instructions())
         overrides = self._init_instructions()
         for opcode, instruction in overrides.items():
             instructions[opcode] = instruction
@@ -206,7 +206,7 @@ class DisassembleState(AbstractState):
         if self.until_return and self.current_opcode in (b"\x40", b"\x60", b"\x6b"):
             return True
 
-        return fsm.last_rom_addr <= fsm.rom.tell()
+        return fsm.last_rom_addr <= fsm.rom_addr
 
     def _read_instruction(self: Self) -> tuple[type[AbstractInstruction], bytes, bool]:
         """Read the current instruction and return as an object."""
@@ -215,7 +215,7 @@ class DisassembleState(AbstractState):
         fsm = self.state_machine
 
         # Read the opcode.
-        opcode = fsm.rom.read(1)
+        opcode = fsm.read(1)
         self.current_opcode = opcode
         instruction = self.get_instruction(opcode)
 
@@ -238,7 +238,7 @@ class DisassembleState(AbstractState):
 
         # Read the operand if necessary.
         if self.current_operand_size:
-            operand_raw = fsm.rom.read(self.current_operand_size)
+            operand_raw = fsm.read(self.current_operand_size)
             self.current_operand = int.from_bytes(operand_raw, "little")
         else:
             operand_raw, self.current_operand = b"", None
@@ -414,14 +414,13 @@ class DumpState(AbstractState):
             return context, None
 
         fsm = self.state_machine
-        rom = fsm.rom
         out = fsm.destination
         byte_count_seq = chain.from_iterable(repeat(self.byte_count, self.record_count))
         for i in byte_count_seq:
             cpu_address = fsm.program_counter
             bank = (cpu_address & 0xFF0000) >> 16
             offset = cpu_address & 0x00FFFF
-            data = rom.read(BANK_SIZE - offset if offset + i > BANK_SIZE else i)
+            data = fsm.read(BANK_SIZE - offset if offset + i > BANK_SIZE else i)
 
             print(FORMAT_STRING.format(bank, offset, data.hex().upper()), file=out)
 
@@ -0,0 +1,274 @@
+"""This module provides instrumentation of the generators of message
+and string data.
+
+Statistics are collected only inside `collect_stats`. Each generator
+looks for the active collector once when iteration begins, and takes
+its usual code path if there is none, so that instrumentation costs
+nothing unless it is enabled.
+
+Examples
+--------
+>>> with collect_stats() as stats:
+...     messages = list(enum_scenario(0x0000, 0x0100))
+>>> report = stats.report()
+"""
+
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from contextlib import contextmanager
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    import mmap
+    from collections.abc import Iterator
+    from typing import Any, Self
+
+_NANOSECONDS_PER_SECOND = 1_000_000_000
+
+_COLLECTORS: list[DecoderStats] = []
+"""The stack of active collectors."""
+
+
+@contextmanager
+def collect_stats() -> Iterator[DecoderStats]:
+    """Collect statistics of every generator iterated in the block.
+
+    Yields
+    ------
+    stats : DecoderStats
+        The collector.
+    """
+
+    stats = DecoderStats()
+    _COLLECTORS.append(stats)
+    try:
+        yield stats
+    finally:
+        _COLLECTORS.remove(stats)
+
+
+def active_stats() -> DecoderStats | None:
+    """Return the innermost active collector.
+
+    Returns
+    -------
+    stats : DecoderStats or None
+        The collector, or None if statistics are not being collected.
+    """
+
+    return _COLLECTORS[-1] if _COLLECTORS else None
+
+
+class MessageStats(NamedTuple):
+    """The statistics of a decoded message or string."""
+
+    message_id: int
+    group: int | None
+    characters: int
+    bits: int
+    nodes: int
+    elapsed: int
+    """The wall time to decode in nanoseconds."""
+
+
+class DecoderStats:
+    """A collector of statistics of generators."""
+
+    def __init__(self: Self) -> None:
+        """Create an object of class DecoderStats."""
+        self.runs: list[DecoderRun] = []
+
+    def start_run(self: Self, title: str, generator: object) -> DecoderRun:
+        """Begin to record an iteration of a generator.
+
+        Parameters
+        ----------
+        title : str
+            The title of the game.
+        generator : object
+            The generator.
+
+        Returns
+        -------
+        run : DecoderRun
+            The record of the iteration.
+        """
+
+        run = DecoderRun(title, type(generator).__name__)
+        self.runs.append(run)
+        return run
+
+    def report(self: Self) -> dict[str, Any]:
+        """Return the statistics as a structure of plain values.
+
+        Returns
+        -------
+        report : dict
+            ``{"runs": [...]}``, see `DecoderRun.report`.
+        """
+
+        return {"runs": [i.report() for i in self.runs]}
+
+    def to_json(self: Self) -> str:
+        """Return the report in JSON."""
+        return json.dumps(self.report(), indent=2)
+
+
+class DecoderRun:
+    """The statistics of an iteration of a generator."""
+
+    def __init__(self: Self, title: str, generator: str) -> None:
+        """Create an object of class DecoderRun.
+
+        Parameters
+        ----------
+        title : str
+            The title of the game.
+        generator : str
+            The class name of the generator.
+        """
+
+        self.title = title
+        self.generator = generator
+        self.seeks = 0
+        self.reads = 0
+        self.bytes_read = 0
+        self.setup_time = 0
+        self.messages: list[MessageStats] = []
+        self._clock = perf_counter_ns()
+
+    def record(self: Self, message_id: int, group: int | None, characters: int, bits: int, nodes: int) -> None:
+        """Record a decoded message.
+
+        The time is measured from the previous call of `record` or
+        `restart_clock`.
+
+        Parameters
+        ----------
+        message_id : int
+            The ID of the message.
+        group : int or None
+            The message group, or None if the data is not grouped.
+        characters : int
+            The number of decoded characters.
+        bits : int
+            The number of bits consumed.
+        nodes : int
+            The number of nodes of the Huffman tree visited.
+        """
+
+        now = perf_counter_ns()
+        self.messages.append(MessageStats(message_id, group, characters, bits, nodes, now - self._clock))
+        self._clock = now
+
+    def restart_clock(self: Self) -> int:
+        """Begin to measure the time to decode the next message.
+
+        Returns
+        -------
+        elapsed : int
+            The nanoseconds since the clock was started last.
+        """
+
+        now = perf_counter_ns()
+        elapsed, self._clock = now - self._clock, now
+        return elapsed
+
+    def report(self: Self) -> dict[str, Any]:
+        """Return the statistics as a structure of plain values.
+
+        Times are in seconds.
+
+        Returns
+        -------
+        report : dict
+            The totals, the statistics of each message group, and
+            those of each message.
+        """
+
+        groups: dict[int, list[MessageStats]] = defaultdict(list)
+        for i in self.messages:
+            if i.group is not None:
+                groups[i.group].append(i)
+
+        return {
+            "title": self.title,
+            "generator": self.generator,
+            "totals": {
+                **_sum_messages(self.messages),
+                "seeks": self.seeks,
+                "reads": self.reads,
+                "bytes_read": self.bytes_read,
+                "setup_time": self.setup_time / _NANOSECONDS_PER_SECOND,
+            },
+            "groups": [{"group": group, **_sum_messages(items)} for group, items in groups.items()],
+            "messages": [{**i._asdict(), "elapsed": i.elapsed / _NANOSECONDS_PER_SECOND} for i in self.messages],
+        }
+
+
+def _sum_messages(messages: list[MessageStats]) -> dict[str, Any]:
+    """Return the totals of statistics of messages."""
+
+    return {
+        "messages": len(messages),
+        "characters": sum(i.characters for i in messages),
+        "bits": sum(i.bits for i in messages),
+        "nodes": sum(i.nodes for i in messages),
+        "elapsed": sum(i.elapsed for i in messages) / _NANOSECONDS_PER_SECOND,
+    }
+
+
+class CountingBuffer:
+    """A proxy of a ROM image that counts seeks and reads.
+
+    It provides the subset of the interface of `mmap.mmap` that the
+    generators use.
+    """
+
+    def __init__(self: Self, mem: mmap.mmap, run: DecoderRun) -> None:
+        """Create an object of class CountingBuffer.
+
+        Parameters
+        ----------
+        mem : mmap.mmap
+            The ROM image.
+        run : DecoderRun
+            The record to count in.
+        """
+
+        self.mem = mem
+        self.run = run
+
+    @property
+    def closed(self: Self) -> bool:
+        return self.mem.closed
+
+    def seek(self: Self, pos: int) -> None:
+        self.run.seeks += 1
+        self.mem.seek(pos)
+
+    def tell(self: Self) -> int:
+        return self.mem.tell()
+
+    def read(self: Self, n: int | None = None) -> bytes:
+        data = self.mem.read(n)
+        self.run.reads += 1
+        self.run.bytes_read += len(data)
+        return data
+
+    def read_byte(self: Self) -> int:
+        self.run.reads += 1
+        self.run.bytes_read += 1
+        return self.mem.read_byte()
+
+    def __getitem__(self: Self, key: Any) -> Any:
+        value = self.mem[key]
+        self.run.reads += 1
+        self.run.bytes_read += len(value) if isinstance(key, slice) else 1
+        return value
+
+    def __len__(self: Self) -> int:
+        return len(self.mem)
@@ -10,17 +10,80 @@ forms of raw bytes or human-readable texts.
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, cast
+import re
+from collections.abc import Mapping
+from importlib import import_module
+from itertools import batched
+from typing import TYPE_CHECKING, Self, cast
+
+from dqutils.snescpu.rom_image import ROM_POOL, RomImage
+from dqutils.stats import active_stats
+from dqutils.writer import Record, write_records
 
 if TYPE_CHECKING:
     from array import array
-    from collections.abc import Iterator, Mapping
+    from collections.abc import Callable, Iterable, Iterator, Sequence
     from typing import Any
 
-    type CodeSeq = bytes | bytearray | array
+    type CodeSeq = bytes | bytearray | memoryview | array
 
     from dqutils.string_generator import AbstractStringGenerator, StringInfo
 
+_HEX_CODE = re.compile(r"\[([0-9A-F]{2,4})\]")
+"""The text of a code not in a charmap, see `get_text`."""
+
+_BYTE_CODES = 0x100
+
+TEXT_CHUNK_SIZE = 256
+"""The number of strings whose texts the record functions render at
+once with `get_texts`, e.g. `string_records`."""
+
+_COMPILED_CHARMAPS: dict[int, tuple[Mapping[int, str], list[str]]] = {}
+"""The charmaps compiled so far, keyed by the ID of the charmap."""
+
+_REVERSE_CHARMAPS: dict[int, tuple[Mapping[int, str], dict[str, tuple[int, ...]], int]] = {}
+"""The reverse charmaps built so far, keyed by the ID of the charmap."""
+
+
+class LazyCharmap(Mapping[int, str]):
+    """A charmap that is not imported until it is used.
+
+    Charmaps are large modules, most of which each command never
+    uses.
+
+    Parameters
+    ----------
+    module : str
+        The name of the module that defines the charmap as
+        ``CHARMAP``, e.g. ``"dqutils.dq6.charlarge"``.
+    """
+
+    __slots__ = ("_charmap", "module")
+
+    def __init__(self: Self, module: str) -> None:
+        self.module = module
+        self._charmap: Mapping[int, str] | None = None
+
+    @property
+    def charmap(self: Self) -> Mapping[int, str]:
+        """The charmap, which is imported on the first access."""
+
+        if self._charmap is None:
+            self._charmap = cast("Mapping[int, str]", import_module(self.module).CHARMAP)
+        return self._charmap
+
+    def __getitem__(self: Self, code: int) -> str:
+        return self.charmap[code]
+
+    def __iter__(self: Self) -> Iterator[int]:
+        return iter(self.charmap)
+
+    def __len__(self: Self) -> int:
+        return len(self.charmap)
+
+    def __repr__(self: Self) -> str:
+        return f"{type(self).__name__}({self.module!r})"
+
 
 def get_text(code_seq: CodeSeq, charmap: Mapping[int, str], delims: CodeSeq | None = None) -> str:
     """Return a text representation of a string.
@@ -40,10 +103,68 @@ def get_text(code_seq: CodeSeq, charmap: Mapping[int, str], delims: CodeSeq | No
         A human-readble text, e.g. "ひのきのぼう".
     """
 
-    if delims and code_seq[-1] in delims:
+    return _render(code_seq, _compile_charmap(charmap), delims)
+
+
+def get_texts(code_seqs: Iterable[CodeSeq], charmap: Mapping[int, str], delims: CodeSeq | None = None) -> list[str]:
+    """Return text representations of strings.
+
+    This is equivalent to, but faster than, calling `get_text` for
+    each string.
+
+    Parameters
+    ----------
+    code_seqs : iterable
+        The strings.
+    charmap : dict
+        The character dictionary.
+    delims : iterable of str, optional
+        The code of the delimiter characters.
+
+    Returns
+    -------
+    texts : list of str
+        The human-readble texts in the order of `code_seqs`.
+    """
+
+    table = _compile_charmap(charmap)
+    return [_render(i, table, delims) for i in code_seqs]
+
+
+def _render(code_seq: CodeSeq, table: list[str], delims: CodeSeq | None) -> str:
+    """Return a text representation of a string with a compiled
+    charmap."""
+
+    if delims and code_seq and code_seq[-1] in delims:
         code_seq = code_seq[0:-1]
 
-    return "".join(charmap.get(c, f"[{c:02X}]") for c in code_seq)
+    # The table covers all 8-bit codes.
+    if isinstance(code_seq, bytes | bytearray | memoryview):
+        return str(code_seq, "latin-1").translate(table)
+
+    try:
+        return "".join(map(table.__getitem__, code_seq))
+    except IndexError:
+        return "".join(table[c] if c < len(table) else f"[{c:02X}]" for c in code_seq)
+
+
+def _compile_charmap(charmap: Mapping[int, str]) -> list[str]:
+    """Return the text of each code of `charmap` in a list indexed by
+    code.
+
+    The codes missing in `charmap` are rendered in hex in advance.
+    """
+
+    entry = _COMPILED_CHARMAPS.get(id(charmap))
+    if entry and entry[0] is charmap:
+        return entry[1]
+
+    size = max(_BYTE_CODES, max(charmap, default=0) + 1)
+    table = [charmap.get(c, f"[{c:02X}]") for c in range(size)]
+
+    # Keep `charmap` alive so that its ID is never reused.
+    _COMPILED_CHARMAPS[id(charmap)] = (charmap, table)
+    return table
 
 
 def get_hex(code_seq: CodeSeq) -> str:
@@ -64,6 +185,71 @@ def get_hex(code_seq: CodeSeq) -> str:
     return " ".join(f"{c:02X}" for c in code_seq)
 
 
+def encode_text(text: str, charmap: Mapping[int, str]) -> list[tuple[int, ...]]:
+    """Return the character codes of a text, the reverse of `get_text`.
+
+    The text is divided greedily into the longest texts in `charmap`.
+    A code that `get_text` renders in hex, e.g. "[AC]", is accepted
+    as well.
+
+    Parameters
+    ----------
+    text : str
+        A human-readble text, e.g. "ひのきのぼう".
+    charmap : dict
+        The character dictionary.
+
+    Returns
+    -------
+    pattern : list of tuple of int
+        The codes of each character. A character may have more than
+        one code.
+
+    Raises
+    ------
+    ValueError
+        If `text` contains a character not in `charmap`.
+    """
+
+    reverse, longest = _get_reverse_charmap(charmap)
+    pattern: list[tuple[int, ...]] = []
+    i = 0
+    while i < len(text):
+        for size in range(min(longest, len(text) - i), 0, -1):
+            codes = reverse.get(text[i : i + size])
+            if codes:
+                pattern.append(codes)
+                i += size
+                break
+        else:
+            match = _HEX_CODE.match(text, i)
+            if not match:
+                msg = f"unknown character: {text[i]!r}"
+                raise ValueError(msg)
+            pattern.append((int(match[1], 16),))
+            i = match.end()
+
+    return pattern
+
+
+def _get_reverse_charmap(charmap: Mapping[int, str]) -> tuple[dict[str, tuple[int, ...]], int]:
+    """Return the codes of each text in `charmap` and the length of
+    the longest text."""
+
+    entry = _REVERSE_CHARMAPS.get(id(charmap))
+    if entry and entry[0] is charmap:
+        return entry[1], entry[2]
+
+    reverse: dict[str, tuple[int, ...]] = {}
+    for code, text in sorted(charmap.items()):
+        reverse[text] = (*reverse.get(text, ()), code)
+    longest = max(map(len, reverse), default=1)
+
+    # Keep `charmap` alive so that its ID is never reused.
+    _REVERSE_CHARMAPS[id(charmap)] = (charmap, reverse, longest)
+    return reverse, longest
+
+
 def enum_string(
     context: Mapping[str, Any],
     generator_t: type[AbstractStringGenerator],
@@ -111,11 +297,71 @@ def enum_string(
     yield from generator_t(context, first, last)
 
 
+def map_string_contexts[T](
+    contexts: Sequence[Mapping[str, Any]],
+    generator_t: type[AbstractStringGenerator],
+    func: Callable[[int, list[StringInfo]], T],
+    jobs: int = 1,
+) -> list[T]:
+    """Apply a function to the string data of several contexts of a
+    game.
+
+    The ROM image is opened and its mapper is detected only once for
+    all of the contexts, which are processed by `jobs` threads over the
+    same read-only image.
+
+    Parameters
+    ----------
+    contexts : sequence of dict
+        The string contexts of the same game. See `enum_string` for
+        details.
+    generator_t : `~AbstractStringGenerator`
+        The type of string generator. See the module
+        dqutils.string_generator for details.
+    func : callable
+        The function that receives the index of a context and all of
+        its string data.
+    jobs : int, optional
+        The number of threads.
+
+    Returns
+    -------
+    results : list
+        The return values of `func` in the order of `contexts`.
+    """
+
+    generators = [generator_t(i) for i in contexts]
+    if not generators:
+        return []
+
+    title = generators[0].title
+    assert all(i.title == title for i in generators)
+
+    if active_stats():
+        # Record each context as a run of its own.
+        return [func(i, list(generator)) for i, generator in enumerate(generators)]
+
+    with RomImage(title) as mem:
+        mapper = ROM_POOL.get_mapper(mem)
+
+        def process(i: int) -> T:
+            generator = generators[i]
+            if generator.first >= generator.last:
+                return func(i, [])
+            return func(i, list(generator.iter_table(generator.open_table(mem, mapper))))
+
+        from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415
+
+        with ThreadPoolExecutor(max(1, jobs)) as executor:
+            return list(executor.map(process, range(len(generators))))
+
+
 def print_string(
     context: Mapping[str, Any],
     generator_t: type[AbstractStringGenerator],
     first: int | None = None,
     last: int | None = None,
+    output_format: str = "text",
 ) -> None:
     """Print string data to sys.stdout.
 
@@ -146,11 +392,47 @@ def print_string(
         The first index of the range of indices you want.
     last : int, optional
         The last index + 1 of the range of indices you want.
+    output_format : str, optional
+        The output format, e.g. ``"jsonl"``. See `dqutils.writer`.
+    """
+
+    write_records(string_records(context, generator_t, first, last), output_format)
+
+
+def string_records(
+    context: Mapping[str, Any],
+    generator_t: type[AbstractStringGenerator],
+    first: int | None = None,
+    last: int | None = None,
+) -> Iterator[Record]:
+    """Return a generator iterator of string data with their texts.
+
+    String data those indices in [`first`, `last`) will be yielded.
+
+    Parameters
+    ----------
+    context : dict
+        The string context. See `print_string` for details.
+    generator_t : `~AbstractStringGenerator`
+        The type of string generator. See the module
+        dqutils.string_generator for details.
+    first : int, optional
+        The first index of the range of indices you want.
+    last : int, optional
+        The last index + 1 of the range of indices you want.
+
+    Yields
+    ------
+    record : Record
+        The string data in the order of indices. See
+        `dqutils.writer.Record`.
     """
 
     delim = cast(bytes, context["delimiters"])
     charmap = cast(dict[int, str], context["charmap"])
     start = 0 if first is None else int(first)
-    for i, item in enumerate(generator_t(context, start, last), start):
-        text = get_text(item[1], charmap, delim) if charmap else get_hex(item[1])
-        print(f"{i:04X}:{item[0]:06X}:{text}")  # noqa: T201
+    for chunk in batched(enumerate(generator_t(context, start, last), start), TEXT_CHUNK_SIZE):
+        code_seqs = [code_seq for _, (_, code_seq) in chunk]
+        texts = get_texts(code_seqs, charmap, delim) if charmap else [get_hex(i) for i in code_seqs]
+        for (i, (address, code_seq)), text in zip(chunk, texts, strict=True):
+            yield Record(i, address, None, code_seq, text)
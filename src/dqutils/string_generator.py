@@ -2,26 +2,62 @@
 
 from __future__ import annotations
 
+import re
+import threading
 from abc import ABCMeta, abstractmethod
+from array import array
+from functools import partial
+from itertools import islice
 from typing import TYPE_CHECKING, cast
 
-from dqutils.snescpu.mapper import AbstractMapper, make_mapper
-from dqutils.snescpu.rom_image import RomImage
+from dqutils.snescpu.mapper import AbstractMapper
+from dqutils.snescpu.rom_image import ROM_POOL, RomImage
+from dqutils.stats import CountingBuffer, active_stats
 
 if TYPE_CHECKING:
     import mmap
-    from collections.abc import Iterator, Mapping
-    from typing import Any, Self
+    from collections.abc import Callable, Iterator, Mapping
+    from typing import Any, Final, Self
 
-    type StringInfo = tuple[int, bytes | bytearray]
+    from dqutils.snescpu.rom_image import FileIdentity
+    from dqutils.stats import DecoderRun
+
+    type StringInfo = tuple[int, bytes | bytearray | memoryview]
     type ContextT = Mapping[str, Any]
 
+_SCAN_SIZE: Final[int] = 0x4000
+"""The number of bytes of a ROM image to scan for delimiters at once."""
+
+_OFFSETS: dict[tuple[FileIdentity, int, type[AbstractStringGenerator], bytes | None], array] = {}
+"""The ROM offsets of strings scanned so far, keyed by the identity of
+the ROM file, the offset of the first string, the type of the generator
+and the delimiters. See `AbstractStringGenerator.open_table`."""
+
+_OFFSETS_LOCK = threading.Lock()
+"""The lock of `_OFFSETS`."""
+
+
+def _drop_offsets(identity: FileIdentity) -> None:
+    """Forget the offsets of strings in a ROM file that is closed."""
+
+    with _OFFSETS_LOCK:
+        for key in [i for i in _OFFSETS if i[0] == identity]:
+            del _OFFSETS[key]
+
+
+ROM_POOL.add_release_hook(_drop_offsets)
+
 
 # pylint: disable=too-few-public-methods
 class AbstractStringGenerator(metaclass=ABCMeta):
     """The base class of StringGenerator subclasses."""
 
-    def __init__(self: Self, context: ContextT, first: int | None = None, last: int | None = None) -> None:
+    _PREFIX_SIZE: int = 0
+    """The number of bytes before the characters of a string."""
+
+    def __init__(
+        self: Self, context: ContextT, first: int | None = None, last: int | None = None, *, views: bool = False
+    ) -> None:
         """Create an object of class AbstractStringGenerator.
 
         Parameters
@@ -45,6 +81,12 @@ class AbstractStringGenerator(metaclass=ABCMeta):
             The first index of the range of indices you want.
         last : int, optional
             The last index + 1 of the range of indices you want.
+        views : bool, default: False
+            If True, yield `memoryview` slices of the ROM image instead
+            of copies of the strings. Each view is valid only until the
+            iteration ends or the iterator is closed, after which it is
+            released along with the ROM image. Copy the view with
+            ``bytes`` to keep the characters.
         """
 
         if first is None:
@@ -57,6 +99,7 @@ class AbstractStringGenerator(metaclass=ABCMeta):
         self.last: int = cast(int, last)
         self.addr: int = context.get("addr_string", context.get("addr_message"))
         self.delims: bytes | None = context.get("delimiters")
+        self.views = views
         self.mapper: type[AbstractMapper]
         self.assert_valid()
 
@@ -66,11 +109,76 @@ class AbstractStringGenerator(metaclass=ABCMeta):
         if self.first >= self.last:
             return
 
+        stats = active_stats()
         with RomImage(self.title) as mem:
-            self.mapper = make_mapper(rom=mem)
-            addr = self.addr
-            mem.seek(self.mapper.from_cpu(addr))
-            yield from self._do_iterate(mem, addr)
+            if stats:
+                yield from self._iter_instrumented(stats.start_run(self.title, self), mem)
+                return
+
+            yield from self._do_iterate(self.open_table(mem))
+
+    def _iter_instrumented(self: Self, run: DecoderRun, mem: mmap.mmap) -> Iterator[StringInfo]:
+        """Iterate pairs of string information, recording statistics.
+
+        Parameters
+        ----------
+        run : DecoderRun
+            The record of statistics.
+        mem : mmap
+            The ROM image.
+
+        Yields
+        ------
+        addr : int
+            An offset value of the ROM address space.
+        code_seq : bytes
+            A sequence of characters locating in `addr`.
+        """
+
+        reader = cast("mmap.mmap", CountingBuffer(mem, run))
+        table = self.open_table(reader)
+        run.setup_time = run.restart_clock()
+
+        for string_id, item in enumerate(self._do_iterate(table), self.first):
+            bits = len(item[1]) * 8
+            run.record(string_id, None, len(item[1]), bits, 0)
+            yield item
+            run.restart_clock()
+
+    def open_table(self: Self, mem: mmap.mmap, mapper: type[AbstractMapper] | None = None) -> StringTable:
+        """Return the strings of the context in a ROM image.
+
+        The offsets of the strings in a ROM image of `ROM_POOL` are
+        kept while the image is open, so that only the strings after
+        those scanned so far are scanned. This method may be called
+        from several threads on the same ROM image, and the tables read
+        it without its file position.
+
+        Parameters
+        ----------
+        mem : mmap
+            The ROM image, which shall be open while the table is used.
+        mapper : type[AbstractMapper], optional
+            The mapper of the ROM image, which is detected if not
+            specified.
+
+        Returns
+        -------
+        table : StringTable
+            The strings in [0, `last`).
+        """
+
+        self.assert_valid()
+        with _OFFSETS_LOCK:
+            self.mapper = mapper or ROM_POOL.get_mapper(mem)
+            start = self.mapper.from_cpu(self.addr)
+            identity = ROM_POOL.get_identity(mem)
+            offsets = array("I", (start,))
+            if identity:
+                offsets = _OFFSETS.setdefault((identity, start, type(self), self.delims), offsets)
+            if len(offsets) <= self.last:
+                self._scan(mem, offsets)
+        return StringTable(mem, offsets, self.last, self._PREFIX_SIZE, self._make_address(start))
 
     def assert_valid(self: Self) -> None:
         """Test if this instance is valid."""
@@ -80,68 +188,259 @@ class AbstractStringGenerator(metaclass=ABCMeta):
         assert self.delims is None or isinstance(self.delims, bytes)
 
     @abstractmethod
-    def _do_iterate(self: Self, mem: mmap.mmap, addr: int) -> Iterator[StringInfo]:
+    def _scan(self: Self, mem: mmap.mmap, offsets: array) -> None:
+        """Append the offsets of the strings that follow those in
+        `offsets`, up to the string `last`.
+
+        Parameters
+        ----------
+        mem : mmap
+            The ROM image.
+        offsets : array
+            The offset of each string scanned so far, followed by the
+            offset next to the last one.
+        """
+
+    @abstractmethod
+    def _make_address(self: Self, start: int) -> Callable[[int], int]:
+        """Return the function that returns the address of a string
+        from its ROM offset.
+
+        Parameters
+        ----------
+        start : int
+            The ROM offset of the first string.
+        """
+
+    def iter_table(self: Self, table: StringTable) -> Iterator[StringInfo]:
+        """Iterate pairs of string information in [`first`, `last`) of
+        a table.
+
+        Parameters
+        ----------
+        table : StringTable
+            The strings of the context, see `open_table`.
+
+        Yields
+        ------
+        addr : int
+            An offset value of the ROM address space.
+        code_seq : bytes or memoryview
+            A sequence of characters locating in `addr`.
+        """
+
+        return self._do_iterate(table)
+
+    def _do_iterate(self: Self, table: StringTable) -> Iterator[StringInfo]:
         """Iterate pairs of string information.
 
+        Parameters
+        ----------
+        table : StringTable
+            The strings of the context.
+
+        Yields
+        ------
+        addr : int
+            An offset value of the ROM address space.
+        code_seq : bytes
+            A sequence of characters locating in `addr`.
+        """
+
+        if self.views:
+            yield from table.iter_views(self.first, self.last)
+        else:
+            yield from table.iter_range(self.first, self.last)
+
+
+class StringTable:
+    """The strings of a context in an open ROM image.
+
+    Any string is read in constant time by its index.
+
+    Examples
+    --------
+    >>> with RomImage("DRAGONQUEST5") as mem:
+    ...     table = StringGeneratorPascalStyle(context).open_table(mem)
+    ...     addr, code_seq = table.get(10)
+    """
+
+    def __init__(
+        self: Self, mem: mmap.mmap, offsets: array, count: int, prefix: int, address: Callable[[int], int]
+    ) -> None:
+        """Create an object of class StringTable.
+
         Parameters
         ----------
         mem : mmap
             The ROM image.
+        offsets : array
+            The ROM offset of each string, followed by the offset next
+            to the last one.
+        count : int
+            The number of strings.
+        prefix : int
+            The number of bytes before the characters of a string.
+        address : callable
+            The function that returns the address of a string from its
+            ROM offset.
+        """
+
+        assert len(offsets) > count
+        self.mem = mem
+        self.offsets = offsets
+        self.count = count
+        self.prefix = prefix
+        self.address = address
+
+    def __len__(self: Self) -> int:
+        return self.count
+
+    def get(self: Self, i: int) -> StringInfo:
+        """Return a string.
+
+        Parameters
+        ----------
+        i : int
+            The index of the string.
+
+        Returns
+        -------
         addr : int
-            An offset value in which a character string locates.
+            An offset value of the ROM address space.
+        code_seq : bytes
+            A sequence of characters locating in `addr`.
+        """
+
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        offset = self.offsets[i]
+        return (self.address(offset), self.mem[offset + self.prefix : self.offsets[i + 1]])
+
+    def __getitem__(self: Self, key: slice) -> list[StringInfo]:
+        start, stop, step = key.indices(self.count)
+        if step == 1:
+            return list(self.iter_range(start, stop))
+        return [self.get(i) for i in range(start, stop, step)]
+
+    def iter_range(self: Self, first: int = 0, last: int | None = None) -> Iterator[StringInfo]:
+        """Return a generator iterator of the strings.
+
+        Parameters
+        ----------
+        first : int, optional
+            The first index of the range of indices you want.
+        last : int, optional
+            The last index + 1 of the range of indices you want.
 
         Yields
         ------
         addr : int
             An offset value of the ROM address space.
-        code_seq : bytearray
+        code_seq : bytes
             A sequence of characters locating in `addr`.
         """
-        raise StopIteration
+
+        mem, offsets, prefix, address = self.mem, self.offsets, self.prefix, self.address
+        for i in range(first, self.count if last is None else min(last, self.count)):
+            offset = offsets[i]
+            yield (address(offset), mem[offset + prefix : offsets[i + 1]])
+
+    def iter_views(self: Self, first: int = 0, last: int | None = None) -> Iterator[tuple[int, memoryview]]:
+        """Return a generator iterator of the strings without copying
+        them.
+
+        Each view is valid only until the iteration ends or the
+        iterator is closed, when all of the views are released so that
+        the ROM image can be closed.
+
+        Parameters
+        ----------
+        first : int, optional
+            The first index of the range of indices you want.
+        last : int, optional
+            The last index + 1 of the range of indices you want.
+
+        Yields
+        ------
+        addr : int
+            An offset value of the ROM address space.
+        code_seq : memoryview
+            A view of the characters locating in `addr`.
+        """
+
+        offsets, prefix, address = self.offsets, self.prefix, self.address
+        views: list[memoryview] = []
+        with memoryview(self.mem) as view:
+            try:
+                for i in range(first, self.count if last is None else min(last, self.count)):
+                    offset = offsets[i]
+                    code_seq = view[offset + prefix : offsets[i + 1]]
+                    views.append(code_seq)
+                    yield (address(offset), code_seq)
+            finally:
+                for code_seq in views:
+                    code_seq.release()
 
 
 class StringGeneratorPascalStyle(AbstractStringGenerator):
     """Return generator iterators for Pascal-style (size-included)
     strings information.
+
+    Empty strings are skipped.
     """
 
-    def _do_iterate(self: Self, mem: mmap.mmap, addr: int) -> Iterator[StringInfo]:
-        first, last = self.first, self.last
-        assert first is not None
-        assert last is not None
+    _PREFIX_SIZE = 1
+
+    def _scan(self: Self, mem: mmap.mmap, offsets: array) -> None:
+        pos = offsets[-1]
+        for _ in range(len(offsets), self.last + 1):
+            pos += mem[pos] + 1
+            offsets.append(pos)
 
-        for i in range(last):
-            size = mem.read(1)[0]
-            if size and first <= i:
-                yield (addr, mem.read(size))
-            addr += size + 1
+    def _make_address(self: Self, start: int) -> Callable[[int], int]:
+        # The addresses are counted from that of the first string, even
+        # across banks.
+        return partial(int.__add__, self.addr - start)
+
+    def _do_iterate(self: Self, table: StringTable) -> Iterator[StringInfo]:
+        for i in super()._do_iterate(table):
+            if i[1]:
+                yield i
 
 
 class StringGeneratorCStyle(AbstractStringGenerator):
     """Return generator iterators for C-style (null-terminated)
     strings information.
+
+    The delimiters are found by scanning the ROM image in bulk.
     """
 
-    def _do_iterate(self: Self, mem: mmap.mmap, addr: int) -> Iterator[StringInfo]:
-        first, last = self.first, self.last
-        assert first is not None
-        assert last is not None
+    def _scan(self: Self, mem: mmap.mmap, offsets: array) -> None:
+        """Append the offsets of the strings that follow those in
+        `offsets`, up to the string `last`.
+
+        Raises
+        ------
+        ValueError
+            If the ROM image ends before a delimiter.
+        """
 
         delims = self.delims
         assert delims
 
-        from_rom_addr = self.mapper.from_rom
-        for i in range(last):
-            code_seq = bytearray()
-            addr = from_rom_addr(mem.tell())
-
-            # do-while loop
-            code = mem.read_byte()
-            code_seq.append(code)
-            while code not in delims:
-                code = mem.read_byte()
-                code_seq.append(code)
-
-            if first <= i:
-                assert code_seq[-1] in delims
-                yield (addr, code_seq)
+        pattern = re.compile(b"[" + re.escape(delims) + b"]")
+        size = _SCAN_SIZE
+        while len(offsets) <= self.last:
+            pos = offsets[-1]
+            chunk = mem[pos : pos + size]
+            ends = [pos + i.end() for i in islice(pattern.finditer(chunk), self.last + 1 - len(offsets))]
+            if not ends:
+                # A string is longer than a chunk.
+                if len(chunk) < size:
+                    raise ValueError(pos)
+                size *= 2
+            offsets.extend(ends)
+
+    def _make_address(self: Self, start: int) -> Callable[[int], int]:
+        return self.mapper.from_rom
@@ -0,0 +1,369 @@
+"""This module provides writers of message and string data in several
+output formats.
+
+The printing functions of dqutils pass every record to a writer, which
+writes it to a large buffer over the standard output instead of
+printing it line by line. The following formats are available:
+
+- ``"text"``: the human-readable lines, e.g.
+  ``"0000:C12345:80:ひのきのぼう"``.
+- ``"jsonl"``: a JSON object per line.
+- ``"csv"``: a CSV table with a header row.
+- ``"binary"``: length-prefixed records, see `BinaryWriter`.
+
+All formats but ``"binary"`` are encoded in UTF-8.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import struct
+import sys
+from abc import ABCMeta, abstractmethod
+from array import array
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from typing import BinaryIO, Final, Self
+
+    from dqutils.string import CodeSeq
+
+_BUFFER_SIZE: Final[int] = 1 << 20
+
+_BINARY_MAGIC: Final[bytes] = b"DQRB"
+_BINARY_FORMAT_VERSION: Final[int] = 1
+_BINARY_VERSION: Final[struct.Struct] = struct.Struct("<I")
+_BINARY_SIZE: Final[struct.Struct] = struct.Struct("<I")
+_BINARY_RECORD: Final[struct.Struct] = struct.Struct("<iIIiI")
+"""The group, the ID, the address, the shift and the number of codes
+of a binary record."""
+
+
+class Record(NamedTuple):
+    """A message or string to write."""
+
+    item_id: int
+    """The ID of the message or string."""
+
+    address: int
+    """The address of the data."""
+
+    shift: int | None
+    """The shift from `address`, or None if the data is not
+    compressed."""
+
+    codes: CodeSeq
+    """The character codes including the delimiter."""
+
+    text: str
+    """The human-readable text."""
+
+    group: int | None = None
+    """The index of the group of strings, or None if the data is not
+    grouped."""
+
+
+class AbstractWriter(metaclass=ABCMeta):
+    """The base class of writers."""
+
+    def __init__(self: Self, sink: BinaryIO) -> None:
+        """Create an object of class AbstractWriter.
+
+        Parameters
+        ----------
+        sink : BinaryIO
+            The binary stream to write to.
+        """
+
+        self.sink = sink
+
+    @abstractmethod
+    def write(self: Self, record: Record) -> None:
+        """Write a record."""
+
+    def begin_group(self: Self, group: int) -> None:
+        """Mark the beginning of a group of strings, which may be
+        empty.
+
+        Parameters
+        ----------
+        group : int
+            The index of the group.
+        """
+
+    def close(self: Self) -> None:
+        """Flush the records written so far. `sink` is left open."""
+
+        self.sink.flush()
+
+
+class _AbstractTextWriter(AbstractWriter):
+    """The base class of writers of UTF-8 text."""
+
+    def __init__(self: Self, sink: BinaryIO) -> None:
+        super().__init__(sink)
+        self.stream = io.TextIOWrapper(sink, encoding="utf-8", newline="\n")
+
+    def close(self: Self) -> None:
+        self.stream.flush()
+        self.stream.detach()
+        super().close()
+
+
+class TextWriter(_AbstractTextWriter):
+    """The writer of human-readable lines.
+
+    A line ``"Group #N"`` precedes the records of each group.
+    """
+
+    def write(self: Self, record: Record) -> None:
+        item_id, address, shift, _, text, _ = record
+        if shift is None:
+            self.stream.write(f"{item_id:04X}:{address:06X}:{text}\n")
+        else:
+            self.stream.write(f"{item_id:04X}:{address:06X}:{shift:02X}:{text}\n")
+
+    def begin_group(self: Self, group: int) -> None:
+        self.stream.write(f"Group #{group:d}\n")
+
+
+class JsonlWriter(_AbstractTextWriter):
+    """The writer of JSON Lines.
+
+    Each object has the keys ``"id"``, ``"address"``, ``"shift"``,
+    ``"codes"`` and ``"text"``, and ``"group"`` if the data is
+    grouped.
+    """
+
+    def write(self: Self, record: Record) -> None:
+        item_id, address, shift, codes, text, group = record
+        obj = {"id": item_id, "address": address, "shift": shift, "codes": list(codes), "text": text}
+        if group is not None:
+            obj["group"] = group
+        self.stream.write(json.dumps(obj, ensure_ascii=False))
+        self.stream.write("\n")
+
+
+class CsvWriter(_AbstractTextWriter):
+    """The writer of a CSV table.
+
+    The columns are ``group``, ``id``, ``address``, ``shift``,
+    ``codes`` and ``text``. Numbers are in hex as in the text format,
+    and the codes are separated by spaces. Empty cells stand for None.
+    """
+
+    def __init__(self: Self, sink: BinaryIO) -> None:
+        super().__init__(sink)
+        self.writer = csv.writer(self.stream, lineterminator="\n")
+        self.writer.writerow(("group", "id", "address", "shift", "codes", "text"))
+
+    def write(self: Self, record: Record) -> None:
+        item_id, address, shift, codes, text, group = record
+        self.writer.writerow(
+            (
+                "" if group is None else f"{group:d}",
+                f"{item_id:04X}",
+                f"{address:06X}",
+                "" if shift is None else f"{shift:02X}",
+                " ".join(f"{c:02X}" for c in codes),
+                text,
+            )
+        )
+
+
+class BinaryWriter(AbstractWriter):
+    """The writer of length-prefixed binary records.
+
+    The stream begins with the magic number ``b"DQRB"`` and the format
+    version in ``uint32``. Each record follows as:
+
+    - ``uint32``: the size of the rest of the record.
+    - ``int32``: the group, or -1 if not grouped.
+    - ``uint32``: the ID.
+    - ``uint32``: the address.
+    - ``int32``: the shift, or -1 if the data is not compressed.
+    - ``uint32``: the number of codes.
+    - ``uint16`` each: the codes.
+    - the text in UTF-8 for the rest of the record.
+
+    All values are little-endian. See `read_records` to read them.
+    """
+
+    def __init__(self: Self, sink: BinaryIO) -> None:
+        super().__init__(sink)
+        sink.write(_BINARY_MAGIC)
+        sink.write(_BINARY_VERSION.pack(_BINARY_FORMAT_VERSION))
+
+    def write(self: Self, record: Record) -> None:
+        item_id, address, shift, codes, text, group = record
+        code_bytes = pack_codes(codes)
+        text_bytes = text.encode()
+        header = _BINARY_RECORD.pack(
+            -1 if group is None else group, item_id, address, -1 if shift is None else shift, len(codes)
+        )
+        size = len(header) + len(code_bytes) + len(text_bytes)
+        self.sink.write(b"".join((_BINARY_SIZE.pack(size), header, code_bytes, text_bytes)))
+
+
+def pack_codes(codes: CodeSeq) -> bytes:
+    """Return character codes in little-endian ``uint16``.
+
+    Parameters
+    ----------
+    codes : bytes, bytearray or array
+        The character codes.
+
+    Returns
+    -------
+    data : bytes
+        Two bytes per code.
+    """
+
+    # array("H", codes) would take the bytes of a CodeSeq as is.
+    code_array = array("H")
+    code_array.extend(codes)
+    if sys.byteorder != "little":
+        code_array.byteswap()
+    return code_array.tobytes()
+
+
+WRITERS: Final[dict[str, type[AbstractWriter]]] = {
+    "text": TextWriter,
+    "jsonl": JsonlWriter,
+    "csv": CsvWriter,
+    "binary": BinaryWriter,
+}
+"""The writer of each output format."""
+
+
+def read_records(stream: BinaryIO) -> Iterator[Record]:
+    """Return a generator iterator of the records of the binary format.
+
+    Parameters
+    ----------
+    stream : BinaryIO
+        The stream that `BinaryWriter` has written.
+
+    Yields
+    ------
+    record : Record
+        The next record. The codes are in an ``array("H")``.
+
+    Raises
+    ------
+    ValueError
+        If the stream is broken or of another format version.
+    """
+
+    if stream.read(len(_BINARY_MAGIC)) != _BINARY_MAGIC:
+        raise ValueError(stream)
+    (version,) = _BINARY_VERSION.unpack(stream.read(_BINARY_VERSION.size))
+    if version != _BINARY_FORMAT_VERSION:
+        raise ValueError(stream)
+
+    while prefix := stream.read(_BINARY_SIZE.size):
+        (size,) = _BINARY_SIZE.unpack(prefix)
+        data = stream.read(size)
+        if len(data) != size:
+            raise ValueError(stream)
+
+        group, item_id, address, shift, count = _BINARY_RECORD.unpack_from(data)
+        start_text = _BINARY_RECORD.size + 2 * count
+        codes = array("H", data[_BINARY_RECORD.size : start_text])
+        if sys.byteorder != "little":
+            codes.byteswap()
+        yield Record(
+            item_id,
+            address,
+            None if shift < 0 else shift,
+            codes,
+            data[start_text:].decode(),
+            None if group < 0 else group,
+        )
+
+
+@contextmanager
+def open_sink(*, text: bool = True) -> Iterator[BinaryIO]:
+    """Open a large buffer over the standard output.
+
+    Parameters
+    ----------
+    text : bool, default: True
+        False if the data to write is not UTF-8 text.
+
+    Yields
+    ------
+    sink : BinaryIO
+        The binary stream, which is flushed at the end of the block.
+
+    Raises
+    ------
+    ValueError
+        If `text` is False and the standard output is replaced with a
+        text-only stream such as ``io.StringIO``.
+    """
+
+    stdout = sys.stdout
+    stdout.flush()
+    try:
+        fileno = stdout.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        # sys.stdout is replaced, e.g. with io.StringIO.
+        if buffer := getattr(stdout, "buffer", None):
+            yield buffer
+            return
+        if not text:
+            msg = "binary output requires the standard output to be a binary stream"
+            raise ValueError(msg) from None
+
+        with io.BytesIO() as buffer:
+            yield buffer
+            stdout.write(buffer.getvalue().decode())
+        return
+
+    with open(fileno, "wb", buffering=_BUFFER_SIZE, closefd=False) as sink:  # noqa: PTH123
+        yield sink
+
+
+def write_records(records: Iterable[Record], output_format: str = "text") -> None:
+    """Write records to the standard output.
+
+    Parameters
+    ----------
+    records : iterable of Record
+        The records.
+    output_format : str, optional
+        The output format, one of the keys of `WRITERS`.
+    """
+
+    with open_writer(output_format) as writer:
+        for i in records:
+            writer.write(i)
+
+
+@contextmanager
+def open_writer(output_format: str = "text") -> Iterator[AbstractWriter]:
+    """Open a writer over the standard output.
+
+    Parameters
+    ----------
+    output_format : str, optional
+        The output format, one of the keys of `WRITERS`.
+
+    Yields
+    ------
+    writer : AbstractWriter
+        The writer, which is closed at the end of the block.
+    """
+
+    writer_t = WRITERS[output_format]
+    with open_sink(text=issubclass(writer_t, _AbstractTextWriter)) as sink:
+        writer = writer_t(sink)
+        try:
+            yield writer
+        finally:
+            writer.close()
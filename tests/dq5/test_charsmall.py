@@ -79,3 +79,15 @@ class DQ5CharSmallTestCase(TestCase):
 
         for i in data:
             self.assertEqual(process_dakuten(i), i)
+
+    def test_process_text(self):
+        """Test function dqutils.dq5.process_dakuten."""
+
+        data = (
+            ("あ゛かい゜はな", "あがいぱな"),
+            ("゛゛か゜゛は", "゛が゜ば"),
+            ("゛あ゜か", "゛あ゜か"),
+        )
+
+        for i, j in data:
+            self.assertEqual(process_dakuten(i), j)
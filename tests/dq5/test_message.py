@@ -4,7 +4,8 @@
 from array import array
 from unittest import TestCase
 
-from dqutils.dq5.message import enum_battle, enum_scenario
+from dqutils.dq5.message import CONTEXT_MESSAGE_SCENARIO, enum_battle, enum_scenario
+from dqutils.message_generator import MessageGeneratorV
 
 
 class DQ5MessageTestCase(TestCase):
@@ -45,3 +46,10 @@ class DQ5MessageTestCase(TestCase):
             next(enum_scenario(0x0B95, 0x0B95))
         with self.assertRaises(StopIteration):
             next(enum_scenario(0x00FF, 0x0020))
+
+    def test_decoding_engine(self):
+        """Test that both decoding engines yield the same messages."""
+
+        bitwise = MessageGeneratorV({**CONTEXT_MESSAGE_SCENARIO, "decoding_engine": "bit"}, 0x0B90, 0x0BA0)
+        table = MessageGeneratorV({**CONTEXT_MESSAGE_SCENARIO, "decoding_engine": "table"}, 0x0B90, 0x0BA0)
+        self.assertEqual(list(bitwise), list(table))
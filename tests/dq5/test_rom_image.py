@@ -4,7 +4,8 @@ Tests for dqutils.snescpu.rom_image.
 
 from unittest import TestCase
 
-from dqutils.snescpu.rom_image import RomImage, get_snes_header
+from dqutils.snescpu.mapper import LoROM
+from dqutils.snescpu.rom_image import ROM_POOL, RomImage, get_snes_header
 
 
 class RomImageTestCase(TestCase):
@@ -31,3 +32,17 @@ class RomImageTestCase(TestCase):
         self.assertEqual(header[0x1D] ^ header[0x1F], 0xFF)
         self.assertEqual(header[0x15] & 0x01, 0x00)  # LoROM
         self.assertEqual(header[0x17], 0x0B)  # 1.5M => 2M
+
+    def test_rom_pool(self):
+        """Test that a ROM image is shared while it is held."""
+
+        with ROM_POOL.hold("DRAGONQUEST5") as held:
+            with RomImage("DRAGONQUEST5") as mem:
+                self.assertIs(mem, held)
+                self.assertIs(ROM_POOL.get_mapper(mem), LoROM)
+                self.assertIs(ROM_POOL.get_mapper(mem), LoROM)
+            self.assertFalse(held.closed)
+        self.assertTrue(held.closed)
+
+        with RomImage("DRAGONQUEST5") as mem:
+            self.assertIsNot(mem, held)
@@ -21,6 +21,16 @@ class StateMachineTestCase(AbstractStateMachineTestCase):
         """Test the initial condition of StateMachine for DQ5."""
         self._do_test_initial()
 
+    def test_read(self):
+        """Test that StateMachine reads without the file position."""
+
+        fsm = self.fsm
+        position = self.rom.tell()
+        fsm.rom_addr = 0x7FC0
+        self.assertEqual(fsm.read(12), b"DRAGONQUEST5")
+        self.assertEqual(fsm.program_counter, 0x00FFCC)
+        self.assertEqual(self.rom.tell(), position)
+
     def test_disassembled_code(self):
         """Test disassembled code for DQ5."""
 
@@ -3,7 +3,12 @@
 from unittest import TestCase
 
 from dqutils.dq5.charsmall import process_dakuten
-from dqutils.dq5.string import CONTEXT_GROUP, enum_string
+from dqutils.dq5.string import (
+    CONTEXT_GROUP,
+    all_group_records,
+    enum_string,
+    group_records,
+)
 from dqutils.string import get_text
 
 
@@ -29,6 +34,13 @@ class DQ5StringTestCase(TestCase):
                 with self.assertRaises(StopIteration):
                     next(enum_string(ctx))
 
+    def test_all_group_records(self):
+        """Test function dqutils.dq5.string.all_group_records."""
+
+        records = all_group_records(jobs=4)
+        self.assertEqual(records, [group_records(i) for i in range(len(CONTEXT_GROUP))])
+        self.assertEqual(records[5][0].text, "ひのきのぼう")
+
     def test_make_text(self):
         """Test function dqutils.dq5.charmapsmall.process_dakuten."""
 
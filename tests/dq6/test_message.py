@@ -2,9 +2,21 @@
 
 # ruff: noqa: RUF003
 from array import array
-from unittest import TestCase
+from importlib.util import find_spec
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
 
-from dqutils.dq6.message import enum_battle, enum_scenario
+from dqutils.dq6.message import (
+    CONTEXT_MESSAGE_SCENARIO,
+    enum_battle,
+    enum_scenario,
+    scenario_store,
+)
+from dqutils.message_cache import MessageCache
+from dqutils.message_generator import _MESSAGE_INDEXES, MessageGeneratorW
+from dqutils.snescpu.rom_image import RomImage
 
 
 class DQ6MessageTestCase(TestCase):
@@ -51,8 +63,118 @@ class DQ6MessageTestCase(TestCase):
             # [-1] is one of the delimiter characters.
             self.assertEqual(result[-1][:-1], code)
 
+    def test_enum_scenario_jobs(self):
+        """Test decoding message groups in worker processes."""
+
+        self.assertEqual(list(enum_scenario(0x0023, 0x0123, jobs=2)), list(enum_scenario(0x0023, 0x0123)))
+
+    def test_enum_scenario_jobs_cache(self):
+        """Test creating the message cache with worker processes."""
+
+        expected = list(enum_scenario(0x0023, 0x0123))
+        with (
+            TemporaryDirectory() as tmpdir,
+            patch("dqutils.message_cache.cache_dir", return_value=Path(tmpdir)),
+        ):
+            self.assertEqual(list(enum_scenario(0x0023, 0x0123, jobs=2, cache=True)), expected)
+            self.assertTrue(any(Path(tmpdir).glob("*.bin")))
+
+            # An up-to-date cache file is read without worker processes.
+            with patch("concurrent.futures.ProcessPoolExecutor") as executor:
+                self.assertEqual(list(enum_scenario(0x0023, 0x0123, jobs=2, cache=True)), expected)
+            executor.assert_not_called()
+
     def test_enum_scenario_invalid_range(self):
         with self.assertRaises(StopIteration):
             next(enum_scenario(0x0023, 0x0023))
         with self.assertRaises(StopIteration):
             next(enum_scenario(0x00FF, 0x0020))
+
+    def test_decoding_engine(self):
+        """Test that both decoding engines yield the same messages."""
+
+        bitwise = MessageGeneratorW({**CONTEXT_MESSAGE_SCENARIO, "decoding_engine": "bit"}, 0x1B00, 0x1B2D)
+        table = MessageGeneratorW({**CONTEXT_MESSAGE_SCENARIO, "decoding_engine": "table"}, 0x1B00, 0x1B2D)
+        self.assertEqual(list(bitwise), list(table))
+
+    @skipUnless(find_spec("numpy"), "NumPy is not installed")
+    def test_decoding_engine_numpy(self):
+        """Test that bulk decoding with NumPy yields the same messages,
+        even if the range begins in the middle of a group."""
+
+        expected = list(enum_scenario(0x1B03, 0x1B2D))
+        self.assertEqual(list(enum_scenario(0x1B03, 0x1B2D, engine="numpy")), expected)
+
+    def test_message_index(self):
+        """Test that the message index locates the same messages as
+        decoding does."""
+
+        decoded = MessageGeneratorW({**CONTEXT_MESSAGE_SCENARIO, "message_index": False}, 0x1B03, 0x1B06)
+        indexed = MessageGeneratorW({**CONTEXT_MESSAGE_SCENARIO, "message_index": True}, 0x1B03, 0x1B06)
+        self.assertEqual(list(decoded), list(indexed))
+
+    def test_message_index_from_cache(self):
+        """Test that the message index is built once per ROM image, or
+        taken from the message cache of the ROM image."""
+
+        generator = MessageGeneratorW(CONTEXT_MESSAGE_SCENARIO)
+        decoder = MessageGeneratorW({**CONTEXT_MESSAGE_SCENARIO, "message_index": False})
+        with (
+            TemporaryDirectory() as tmpdir,
+            patch("dqutils.message_cache.cache_dir", return_value=Path(tmpdir)),
+            patch.dict(_MESSAGE_INDEXES, clear=True),
+            RomImage(generator.title) as mem,
+        ):
+            generator.setup(mem)
+            decoder.setup(mem)
+            built = generator.get_message_index(mem)
+            self.assertIsNotNone(built)
+            self.assertEqual(len(built), generator.message_count)
+            self.assertEqual(built[0x1B05], decoder.locate_message(mem, 0x1B05))
+            self.assertIs(generator.get_message_index(memoryview(mem)), built)
+
+            generator.update_message_cache(mem)
+            _MESSAGE_INDEXES.clear()
+            with patch.object(generator, "build_message_index") as build:
+                index = generator.get_message_index(mem)
+            build.assert_not_called()
+            self.assertEqual([index[i] for i in range(len(index))], [built[i] for i in range(len(built))])
+
+            # Only ROM images in the pool are identified.
+            self.assertIsNone(generator.get_message_index(bytes(mem)))
+
+    def test_build_message_cache(self):
+        """Test that only the message groups changed since the previous
+        cache are decoded again."""
+
+        generator = MessageGeneratorW(CONTEXT_MESSAGE_SCENARIO)
+        with RomImage(generator.title) as mem, TemporaryDirectory() as tmpdir:
+            generator.setup(mem)
+            data, changed = generator.build_message_cache(mem)
+            self.assertEqual(changed, list(range(len(data.messages))))
+
+            path = Path(tmpdir, "DRAGONQUEST6-0123-aaaa.bin")
+            MessageCache.write(path, data)
+
+            # Patch a character of message 1B00h.
+            patched = bytearray(mem)
+            patched[generator.mapper.from_cpu(data.messages[0x1B00][0]) + 1] ^= 0xFF
+            with MessageCache(path) as previous:
+                patched_data, changed = generator.build_message_cache(memoryview(patched), previous)
+
+        self.assertIn(0x1B00, changed)
+        self.assertTrue(all(0x1B00 <= i < 0x1B08 for i in changed))
+        self.assertEqual(patched_data.messages[:0x1B00], data.messages[:0x1B00])
+        self.assertEqual(patched_data.messages[0x1B08:], data.messages[0x1B08:])
+
+    def test_scenario_store(self):
+        """Test random access to messages through MessageStore."""
+
+        expected = list(enum_scenario(0x0023, 0x0026))
+        with scenario_store(cache_size=2) as store:
+            self.assertEqual(store.get(0x0024), expected[1])
+            self.assertEqual(store.get_many((0x0025, 0x0023, 0x0024)), [expected[2], expected[0], expected[1]])
+            self.assertIs(store.get(0x0024), store.get(0x0024))
+            self.assertEqual(len(store._codes), 2)
+            with self.assertRaises(IndexError):
+                store.get(len(store))
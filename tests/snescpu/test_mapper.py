@@ -3,6 +3,8 @@ Tests for dqutils.mapper module.
 """
 
 import unittest
+from array import array
+from importlib.util import find_spec
 
 from dqutils.snescpu.mapper import HiROM, LoROM, make_mapper
 
@@ -61,6 +63,30 @@ class HiROMTestCase(unittest.TestCase):
         """Test property dqutils.mapper.HiROM.bank_offset_size."""
         self.assertEqual(self.mapper.bank_offset_size, 0x10000)
 
+    def test_make_bank_map(self):
+        """Test method dqutils.mapper.HiROM.make_bank_map."""
+
+        bank_map = self.mapper.make_bank_map(0xC0FFFE)
+        self.assertEqual(bank_map.from_rom(0x00FFFF), 0xC0FFFF)
+        self.assertEqual(bank_map.from_rom(0x010000), 0xC10000)
+        self.assertEqual(bank_map.from_rom(0x020123), 0xC20123)
+
+    def test_address_arrays(self):
+        """Test the methods of dqutils.mapper.HiROM for arrays."""
+
+        mapper = self.mapper
+        cpuaddrs = array("I", (0xC00000, 0xC0FFFF, 0xC20123))
+        self.assertEqual(mapper.from_cpu_array(cpuaddrs), array("I", (0x000000, 0x00FFFF, 0x020123)))
+        self.assertEqual(mapper.from_rom_array(mapper.from_cpu_array(cpuaddrs)), cpuaddrs)
+        self.assertEqual(mapper.increment_address_array(cpuaddrs), array("I", (0xC00001, 0xC10000, 0xC20124)))
+
+    def test_rom_spans(self):
+        """Test method dqutils.mapper.HiROM.rom_spans."""
+
+        mapper = self.mapper
+        self.assertEqual(mapper.rom_spans(0xC0FFF0, 0xC20010), [(0x00FFF0, 0x020010)])
+        self.assertEqual(mapper.rom_spans(0xC00000, 0xC00000), [])
+
 
 class LoROMTestCase(unittest.TestCase):
     """Test functions defined in dqutils.mapper."""
@@ -106,3 +132,54 @@ class LoROMTestCase(unittest.TestCase):
     def test_bank_offset_size(self):
         """Test property dqutils.mapper.HiROM.bank_offset_size."""
         self.assertEqual(self.mapper.bank_offset_size, 0x8000)
+
+    def test_make_bank_map(self):
+        """Test method dqutils.mapper.LoROM.make_bank_map."""
+
+        mapper = self.mapper
+        bank_map = mapper.make_bank_map(0x80FFFE)
+        self.assertEqual(bank_map.from_rom(0x007FFF), 0x80FFFF)
+        self.assertEqual(bank_map.from_rom(0x008000), 0x818000)
+        self.assertEqual(bank_map.from_rom(0x010123), 0x828123)
+
+        # The same as stepping increment_address.
+        addr = 0x01FFF0
+        for romaddr in range(0x00FFF0, 0x018010):
+            self.assertEqual(mapper.make_bank_map(0x01FFF0).from_rom(romaddr), addr)
+            addr = mapper.increment_address(addr)
+
+    def test_address_arrays(self):
+        """Test the methods of dqutils.mapper.LoROM for arrays."""
+
+        mapper = self.mapper
+        cpuaddrs = array("I", range(0x01FFF0, 0x020010))
+        self.assertEqual(list(mapper.from_cpu_array(cpuaddrs)), [mapper.from_cpu(i) for i in cpuaddrs])
+        self.assertEqual(
+            list(mapper.increment_address_array(cpuaddrs)), [mapper.increment_address(i) for i in cpuaddrs]
+        )
+        romaddrs = array("I", range(0x00FFF0, 0x018010))
+        self.assertEqual(list(mapper.from_rom_array(romaddrs)), [mapper.from_rom(i) for i in romaddrs])
+
+    @unittest.skipUnless(find_spec("numpy"), "NumPy is not installed")
+    def test_address_arrays_numpy(self):
+        """Test the methods of dqutils.mapper.LoROM for NumPy arrays."""
+
+        import numpy as np  # noqa: PLC0415
+
+        mapper = self.mapper
+        romaddrs = np.arange(0x00FFF0, 0x018010, dtype=np.uint32)
+        cpuaddrs = mapper.from_rom_array(romaddrs)
+        self.assertEqual(cpuaddrs.dtype, np.uint32)
+        self.assertEqual(cpuaddrs.tolist(), [mapper.from_rom(i) for i in romaddrs.tolist()])
+        self.assertEqual(mapper.from_cpu_array(cpuaddrs).tolist(), romaddrs.tolist())
+
+        # The same as BankMap.from_rom.
+        bank_map = mapper.make_bank_map(0x01FFF0)
+        self.assertEqual(bank_map.from_rom_array(romaddrs).tolist(), cpuaddrs.tolist())
+
+    def test_rom_spans(self):
+        """Test method dqutils.mapper.LoROM.rom_spans."""
+
+        mapper = self.mapper
+        self.assertEqual(mapper.rom_spans(0x00FFF0, 0x018010), [(0x007FF0, 0x008010)])
+        self.assertEqual(mapper.rom_spans(0x008000, 0x008010), [(0x000000, 0x000010)])
@@ -0,0 +1,72 @@
+"""
+Tests for dqutils.snescpu.rom_image.
+"""
+
+from configparser import ConfigParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from dqutils.snescpu.mapper import HiROM, make_mapper
+from dqutils.snescpu.rom_image import (
+    ROM_POOL,
+    parse_snes_header,
+    read_snes_header,
+    scan_snes_headers,
+)
+
+
+def make_image(title: bytes, map_mode: int) -> bytes:
+    """Return the first 64 KiB of a HiROM image."""
+
+    header = bytearray(title.ljust(0x15))
+    header += bytes((map_mode, 0x02, 0x0C, 0x03, 0x00, 0x00, 0x00, 0xCD, 0xAB, 0x32, 0x54))
+    header += bytes(0x40 - len(header))
+    return bytes(0xFFC0) + header
+
+
+class SnesHeaderTestCase(TestCase):
+    """Test functions that read SNES headers."""
+
+    def test_parse_snes_header(self):
+        """Test function dqutils.snescpu.rom_image.parse_snes_header."""
+
+        header = parse_snes_header(make_image(b"DRAGONQUEST6", 0x31))
+        self.assertEqual(header.offset, 0xFFC0)
+        self.assertEqual(header.title, "DRAGONQUEST6")
+        self.assertEqual(header.map_mode, 0x31)
+        self.assertEqual(header.rom_size, 0x400000)
+        self.assertEqual(header.checksum, 0x5432)
+        self.assertIs(make_mapper(header=header), HiROM)
+
+    def test_read_snes_header(self):
+        """Test that headers are read and cached by file."""
+
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "DRAGONQUEST6.smc")
+            path.write_bytes(make_image(b"DRAGONQUEST6", 0x31))
+            header = read_snes_header(path)
+            self.assertIs(read_snes_header(str(path)), header)
+
+            broken = Path(tmpdir, "broken.smc")
+            broken.write_bytes(bytes(0x10000))
+            self.assertEqual(scan_snes_headers([path, broken]), {path: header, broken: None})
+
+    def test_get_header_replaced(self):
+        """Test that the header of a ROM image in the pool is parsed
+        from the mapping, even if the file has been replaced since."""
+
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "TEST.smc")
+            path.write_bytes(make_image(b"TEST", 0x31))
+            conf = ConfigParser()
+            conf["ROM"] = {"TEST": str(path)}
+            with patch("dqutils.snescpu.rom_image.get_config", return_value=conf), ROM_POOL.hold("TEST") as mem:
+                replacement = Path(tmpdir, "TEST.new")
+                replacement.write_bytes(make_image(b"PATCHED", 0x30))
+                replacement.replace(path)
+
+                header = ROM_POOL.get_header(mem)
+                self.assertEqual(header.title, "TEST")
+                self.assertEqual(header.map_mode, 0x31)
@@ -2,6 +2,8 @@
 Tests for dqutils.dq3.main
 """
 
+import os
+import subprocess
 import sys
 from io import StringIO
 from unittest import TestCase
@@ -22,3 +24,28 @@ class AbstractRunTestCase(TestCase):
             main()
             self.assertEqual(cm.exception.code, 0)
             self.assertIn("usage", output.getvalue())
+
+
+class ImportTestCase(TestCase):
+    """Test that the CLI imports only what it needs to start up."""
+
+    def test_lazy_imports(self):
+        """Test that modules for the sub-commands are not imported by --help."""
+
+        code = "import sys\nfrom dqutils.dq6 import main\ntry:\n    main()\nexcept SystemExit:\n    print(*sys.modules)"
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+        result = subprocess.run(
+            [sys.executable, "-c", code, "--help"], capture_output=True, text=True, env=env, check=True
+        )
+        modules = set(result.stdout.split())
+        self.assertIn("dqutils.dq6", modules)
+        for name in (
+            "concurrent.futures",
+            "configparser",
+            "dqutils.dq6.charlarge",
+            "dqutils.dq6.charsmall",
+            "dqutils.dq6.message",
+            "dqutils.dq6.string",
+            "dqutils.snescpu.instructions",
+        ):
+            self.assertNotIn(name, modules)
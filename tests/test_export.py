@@ -0,0 +1,42 @@
+"""Tests for dqutils.export module."""
+
+import sqlite3
+import unittest
+from contextlib import closing
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from dqutils.export import ExportSource, export_sqlite
+from dqutils.writer import Record
+
+
+class ExportSqliteTestCase(unittest.TestCase):
+    """Test function dqutils.export.export_sqlite."""
+
+    def test_export_sqlite(self):
+        """Test that records are exported, searched and replaced."""
+
+        records = [
+            Record(0x0000, 0xC12345, None, b"\x01\x02\xac", "ゆうしゃの"),
+            Record(0x0001, 0xC12348, 0x80, b"\xac", "ひのきのぼう"),
+        ]
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "dq.db")
+            export_sqlite(path, "DRAGONQUEST6", [ExportSource("string", lambda: records)])
+            export_sqlite(path, "DRAGONQUEST5", [ExportSource("string", lambda: records[:1])])
+            export_sqlite(path, "DRAGONQUEST6", [ExportSource("string", lambda: records[1:])])
+
+            with closing(sqlite3.connect(path)) as conn:
+                rows = conn.execute("SELECT title, item_id, address, shift, codes, text FROM records ORDER BY title")
+                self.assertEqual(
+                    rows.fetchall(),
+                    [
+                        ("DRAGONQUEST5", 0x0000, 0xC12345, None, b"\x01\x00\x02\x00\xac\x00", "ゆうしゃの"),
+                        ("DRAGONQUEST6", 0x0001, 0xC12348, 0x80, b"\xac\x00", "ひのきのぼう"),
+                    ],
+                )
+                rows = conn.execute(
+                    "SELECT title FROM records WHERE text_id IN "
+                    "(SELECT rowid FROM texts_fts WHERE texts_fts MATCH 'のぼう')"
+                )
+                self.assertEqual(rows.fetchall(), [("DRAGONQUEST6",)])
@@ -0,0 +1,123 @@
+"""Tests for dqutils.message_cache module."""
+
+import hashlib
+import os
+import unittest
+from array import array
+from configparser import ConfigParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from snescpu.test_rom_image import make_image
+
+from dqutils.message_cache import (
+    DIGEST_SIZE,
+    MAX_FILES,
+    MessageCache,
+    MessageCacheData,
+    prune,
+    rom_digest,
+    write_atomic,
+)
+from dqutils.snescpu.rom_image import ROM_POOL
+
+
+class MessageCacheTestCase(unittest.TestCase):
+    """Test class dqutils.message_cache.MessageCache."""
+
+    def test_write_and_get(self):
+        """Test that messages survive a round trip through a file."""
+
+        messages = [
+            (0xC12345, 0x80, array("H", (0x0001, 0x0002, 0x00AC))),
+            (0xC12348, 0x10, array("H", (0x1001,))),
+            (0xC1234A, 0x01, array("H", (0x0203, 0x0405, 0x00AC))),
+        ]
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "DRAGONQUEST6-0123-bbbb.bin")
+            digests = [b"\x01" * DIGEST_SIZE, b"\x02" * DIGEST_SIZE]
+            MessageCache.write(path, MessageCacheData(messages, array("I", (0x7D0, 0x7F0)), digests, b"T" * 16))
+            self.assertEqual(list(Path(tmpdir).iterdir()), [path])
+
+            with MessageCache(path) as cache:
+                self.assertEqual(len(cache), 3)
+                self.assertEqual(cache.get(1), messages[1])
+                self.assertEqual(list(cache.iter_range(0, 3)), messages)
+                self.assertEqual(list(cache.group_ends), [0x7D0, 0x7F0])
+                self.assertEqual(cache.group_digest(1), digests[1])
+                self.assertEqual(cache.tables_digest, b"T" * 16)
+
+    def test_broken_file(self):
+        """Test that a broken file is rejected."""
+
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "DRAGONQUEST6-0123-cccc.bin")
+            messages = [(0xC12345, 0x80, array("H", (0x00AC,)))]
+            MessageCache.write(path, MessageCacheData(messages, array("I", (0x7D0,)), [b"\x01" * 16], b"T" * 16))
+            path.write_bytes(path.read_bytes()[:-1])
+            with self.assertRaises(ValueError):
+                MessageCache(path).open()
+
+
+class CacheFilesTestCase(unittest.TestCase):
+    """Test the management of cache files."""
+
+    def test_prune(self):
+        """Test that the least recently used files of a context are
+        removed."""
+
+        with TemporaryDirectory() as tmpdir:
+            paths = [Path(tmpdir, f"DRAGONQUEST6-0123-{i:04x}.bin") for i in range(MAX_FILES + 2)]
+            for i, path in enumerate(paths):
+                path.write_bytes(b"")
+                os.utime(path, ns=(i * 10**9, i * 10**9))
+            other = Path(tmpdir, "DRAGONQUEST6-4567-0000.bin")
+            other.write_bytes(b"")
+
+            # Opening a file marks it as used.
+            os.utime(paths[0])
+            prune(paths[-1])
+            kept = {paths[0], *paths[-MAX_FILES + 1 :], other}
+            self.assertEqual(set(Path(tmpdir).iterdir()), kept)
+
+    def test_write_atomic_failure(self):
+        """Test that no temporary file is left when writing fails."""
+
+        def chunks():
+            yield b"DQMC"
+            raise OSError
+
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "DRAGONQUEST6-0123-aaaa.bin")
+            with self.assertRaises(OSError):
+                write_atomic(path, chunks())
+            self.assertEqual(list(Path(tmpdir).iterdir()), [])
+
+
+class RomDigestTestCase(unittest.TestCase):
+    """Test function dqutils.message_cache.rom_digest."""
+
+    def test_memoised(self):
+        """Test that the digest of a ROM image in the pool is computed
+        once per ROM file."""
+
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "TEST.smc")
+            path.write_bytes(make_image(b"TEST", 0x31))
+            conf = ConfigParser()
+            conf["ROM"] = {"TEST": str(path)}
+            with (
+                patch("dqutils.snescpu.rom_image.get_config", return_value=conf),
+                ROM_POOL.hold("TEST") as mem,
+                patch("hashlib.sha256", wraps=hashlib.sha256) as sha256,
+            ):
+                expected = hashlib.sha256(mem).hexdigest()
+                sha256.reset_mock()
+                self.assertEqual(rom_digest(mem), expected)
+                self.assertEqual(rom_digest(memoryview(mem)), expected)
+                self.assertEqual(sha256.call_count, 1)
+
+                # Buffers out of the pool are always hashed.
+                self.assertEqual(rom_digest(bytes(mem)), expected)
+                self.assertEqual(sha256.call_count, 2)
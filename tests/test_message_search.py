@@ -0,0 +1,55 @@
+"""Tests for dqutils.message_search module."""
+
+import unittest
+from array import array
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from dqutils.message_search import MessageSearchIndex
+from dqutils.string import encode_text
+
+CHARMAP = {0x01: "あ", 0x02: "い", 0x03: "う", 0x04: " ", 0x05: " ", 0x06: "Lv", 0xAC: "\n"}
+
+
+class MessageSearchIndexTestCase(unittest.TestCase):
+    """Test class dqutils.message_search.MessageSearchIndex."""
+
+    def setUp(self):
+        self.messages = [
+            (0, array("H", (0x01, 0x02, 0x03, 0xAC))),
+            (1, array("H", (0x02, 0x03, 0x01, 0x02, 0x03, 0xAC))),
+            (2, array("H", (0x06, 0x04, 0x01, 0x05, 0x01, 0xAC))),
+        ]
+
+    def test_find(self):
+        """Test that occurrences are found at their positions."""
+
+        with TemporaryDirectory() as tmpdir:
+            # The index of another ROM image is kept.
+            other = Path(tmpdir, "DRAGONQUEST6-0123-aaaa.idx")
+            other.write_bytes(b"")
+            path = Path(tmpdir, "DRAGONQUEST6-0123-bbbb.idx")
+            MessageSearchIndex.write(path, MessageSearchIndex.build(self.messages))
+            self.assertTrue(other.exists())
+
+            with MessageSearchIndex(path) as index:
+                self.assertEqual(index.find(encode_text("いう", CHARMAP)), [(0, 1), (1, 0), (1, 3)])
+                self.assertEqual(index.find(encode_text("あいう", CHARMAP)), [(0, 0), (1, 2)])
+                self.assertEqual(index.find(encode_text("あ", CHARMAP)), [(0, 0), (1, 2), (2, 2), (2, 4)])
+                self.assertEqual(index.find(encode_text("Lv あ", CHARMAP)), [(2, 0)])
+                self.assertEqual(index.find(encode_text(" あ", CHARMAP)), [(2, 1), (2, 3)])
+                self.assertEqual(index.find(encode_text("う[AC]", CHARMAP)), [(0, 2), (1, 4)])
+                self.assertEqual(index.find(encode_text("ういう", CHARMAP)), [])
+
+    def test_broken_data(self):
+        """Test that broken data is rejected."""
+
+        with self.assertRaises(ValueError):
+            MessageSearchIndex(None).load(MessageSearchIndex.build(self.messages)[:-1])
+
+    def test_encode_text(self):
+        """Test that an unknown character is rejected."""
+
+        self.assertEqual(encode_text(" ", CHARMAP), [(0x04, 0x05)])
+        with self.assertRaises(ValueError):
+            encode_text("え", CHARMAP)
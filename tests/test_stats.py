@@ -0,0 +1,49 @@
+"""Tests for dqutils.stats module."""
+
+import mmap
+import unittest
+from tempfile import TemporaryFile
+
+from dqutils.stats import CountingBuffer, DecoderRun, active_stats, collect_stats
+
+
+class StatsTestCase(unittest.TestCase):
+    """Test functions and classes defined in dqutils.stats."""
+
+    def test_collect_stats(self):
+        """Test that a collector is active only in the block."""
+
+        self.assertIsNone(active_stats())
+        with collect_stats() as stats:
+            self.assertIs(active_stats(), stats)
+            run = stats.start_run("DRAGONQUEST6", self)
+            run.record(0x0010, 0x0002, 4, 30, 30)
+            run.record(0x0011, 0x0002, 2, 10, 10)
+            run.record(0x0018, 0x0003, 1, 5, 5)
+        self.assertIsNone(active_stats())
+
+        report = stats.report()["runs"][0]
+        self.assertEqual(report["generator"], "StatsTestCase")
+        self.assertEqual(report["totals"]["messages"], 3)
+        self.assertEqual(report["totals"]["bits"], 45)
+        self.assertEqual(
+            [(i["group"], i["messages"], i["characters"]) for i in report["groups"]], [(2, 2, 6), (3, 1, 1)]
+        )
+        self.assertEqual(report["messages"][1]["message_id"], 0x0011)
+
+    def test_counting_buffer(self):
+        """Test that seeks and reads are counted."""
+
+        run = DecoderRun("DRAGONQUEST6", "StringGeneratorCStyle")
+        with TemporaryFile() as fout:
+            fout.write(b"\x00\x01\x02\x03\x04\x05\x06\x07")
+            fout.flush()
+            with mmap.mmap(fout.fileno(), 0, access=mmap.ACCESS_READ) as mem:
+                reader = CountingBuffer(mem, run)
+                reader.seek(2)
+                self.assertEqual(reader.read(3), b"\x02\x03\x04")
+                self.assertEqual(reader.read_byte(), 0x05)
+                self.assertEqual(reader[1:3], b"\x01\x02")
+                self.assertEqual(reader.tell(), 6)
+
+        self.assertEqual((run.seeks, run.reads, run.bytes_read), (1, 3, 6))
@@ -0,0 +1,40 @@
+"""Tests for dqutils.string module."""
+
+import sys
+import unittest
+from array import array
+
+from dqutils.string import LazyCharmap, get_text, get_texts
+
+CHARMAP = {0x01: "あ", 0x02: "い", 0x80: "Lv", 0x0201: "愛"}
+
+
+class GetTextTestCase(unittest.TestCase):
+    """Test functions dqutils.string.get_text and get_texts."""
+
+    def test_get_text(self):
+        """Test that codes are rendered either by charmap or in hex."""
+
+        self.assertEqual(get_text(b"\x01\x80\x03\xac", CHARMAP, b"\xac\xae"), "あLv[03]")
+        self.assertEqual(get_text(bytearray(b"\x02\xff"), CHARMAP), "い[FF]")
+        self.assertEqual(get_text(array("H", (0x0201, 0x0202, 0x1001)), CHARMAP, array("H", (0x1001,))), "愛[202]")
+        self.assertEqual(get_text(array("H", (0x01, 0x2345)), CHARMAP), "あ[2345]")
+        self.assertEqual(get_text(b"", CHARMAP, b"\xac"), "")
+
+    def test_get_texts(self):
+        """Test that get_texts renders the same as get_text."""
+
+        code_seqs = [array("H", (0x01, 0x02, 0xAC)), array("H", (0x0201, 0xFFFF, 0xAC)), array("H", (0xAC,))]
+        delims = array("H", (0xAC,))
+        self.assertEqual(get_texts(code_seqs, CHARMAP, delims), [get_text(i, CHARMAP, delims) for i in code_seqs])
+
+
+class LazyCharmapTestCase(unittest.TestCase):
+    """Test class dqutils.string.LazyCharmap."""
+
+    def test_lazy_charmap(self):
+        """Test that the charmap is the same as the one it imports."""
+
+        charmap = LazyCharmap("dqutils.dq6.charsmall")
+        self.assertEqual(dict(charmap), sys.modules["dqutils.dq6.charsmall"].CHARMAP)
+        self.assertEqual(get_text(b"\x2a\x28\x16\x28\xdc\x12\xac", charmap, b"\xac"), "ひのきのぼう")
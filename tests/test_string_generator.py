@@ -0,0 +1,104 @@
+"""Tests for dqutils.string_generator module."""
+
+import mmap
+import unittest
+from array import array
+from configparser import ConfigParser
+from pathlib import Path
+from tempfile import TemporaryDirectory, TemporaryFile
+from unittest.mock import patch
+
+from snescpu.test_rom_image import make_image
+
+from dqutils.snescpu.rom_image import ROM_POOL
+from dqutils.string_generator import (
+    _OFFSETS,
+    _SCAN_SIZE,
+    StringGeneratorCStyle,
+    StringTable,
+)
+
+CONTEXT = {"title": "TEST", "addr_string": 0xC10000, "delimiters": b"\xac\xae"}
+
+
+class StringTableTestCase(unittest.TestCase):
+    """Test class dqutils.string_generator.StringTable."""
+
+    def test_get(self):
+        """Test that strings are read by their indices."""
+
+        with TemporaryFile() as fout:
+            fout.write(b"\x00\x02AB\x00\x01C")
+            fout.flush()
+            with mmap.mmap(fout.fileno(), 0, access=mmap.ACCESS_READ) as mem:
+                table = StringTable(mem, array("I", (1, 4, 5, 7)), 3, 1, lambda offset: 0xC00000 | offset)
+                self.assertEqual(len(table), 3)
+                self.assertEqual(table.get(2), (0xC00005, b"C"))
+                self.assertEqual(table[0:2], [(0xC00001, b"AB"), (0xC00004, b"")])
+                with self.assertRaises(IndexError):
+                    table.get(3)
+
+                views = table.iter_views(1)
+                self.assertEqual([(addr, bytes(view)) for addr, view in views], [(0xC00004, b""), (0xC00005, b"C")])
+                # The views have been released so that mem can be closed.
+
+
+class StringGeneratorCStyleTestCase(unittest.TestCase):
+    """Test class dqutils.string_generator.StringGeneratorCStyle."""
+
+    def setUp(self):
+        tmpdir = TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = Path(tmpdir.name, "TEST.smc")
+
+        conf = ConfigParser()
+        conf["ROM"] = {"TEST": str(self.path)}
+        patcher = patch("dqutils.snescpu.rom_image.get_config", return_value=conf)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write(self, strings):
+        """Write a ROM image whose strings begin at $C10000."""
+
+        self.path.write_bytes(make_image(b"TEST", 0x31) + strings)
+
+    def test_chunk_boundary(self):
+        """Test that a string longer than a chunk is scanned."""
+
+        long = b"A" * (_SCAN_SIZE + 0x100) + b"\xac"
+        self.write(b"B\xac" + long + b"C\xac")
+        expected = [(0xC10000, b"B\xac"), (0xC10002, long), (0xC10002 + len(long), b"C\xac")]
+        self.assertEqual(list(StringGeneratorCStyle(CONTEXT, 0, 3)), expected)
+
+    def test_delimiters(self):
+        """Test that any of the delimiters ends a string."""
+
+        self.write(b"AB\xacC\xae\xacD\xae")
+        expected = [(0xC10000, b"AB\xac"), (0xC10003, b"C\xae"), (0xC10005, b"\xac"), (0xC10006, b"D\xae")]
+        self.assertEqual(list(StringGeneratorCStyle(CONTEXT, 0, 4)), expected)
+
+    def test_table(self):
+        """Test that strings after `first` are read from the offsets
+        scanned so far while the ROM image is open."""
+
+        self.write(b"A\xacB\xacC\xacD\xac")
+        with ROM_POOL.hold("TEST") as mem:
+            self.assertEqual(list(StringGeneratorCStyle(CONTEXT, 0, 2)), [(0xC10000, b"A\xac"), (0xC10002, b"B\xac")])
+            identity = ROM_POOL.get_identity(mem)
+            (offsets,) = (v for k, v in _OFFSETS.items() if k[0] == identity)
+            self.assertEqual(list(offsets), [0x10000, 0x10002, 0x10004])
+
+            self.assertEqual(list(StringGeneratorCStyle(CONTEXT, 1, 3)), [(0xC10002, b"B\xac"), (0xC10004, b"C\xac")])
+            self.assertEqual(len(offsets), 4)
+        self.assertFalse(any(k[0] == identity for k in _OFFSETS))
+
+        # A patched ROM image is scanned again.
+        self.write(b"A\xacB\xac\xac\xacD\xac")
+        self.assertEqual(list(StringGeneratorCStyle(CONTEXT, 2, 4)), [(0xC10004, b"\xac"), (0xC10005, b"\xac")])
+
+    def test_no_delimiter(self):
+        """Test that the ROM image must not end in a string."""
+
+        self.write(b"A\xacBC")
+        with self.assertRaises(ValueError):
+            list(StringGeneratorCStyle(CONTEXT, 0, 2))
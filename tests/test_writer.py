@@ -0,0 +1,96 @@
+"""Tests for dqutils.writer module."""
+
+import json
+import unittest
+from array import array
+from io import BytesIO, StringIO, TextIOWrapper
+from unittest.mock import patch
+
+from dqutils.writer import (
+    BinaryWriter,
+    CsvWriter,
+    JsonlWriter,
+    Record,
+    TextWriter,
+    read_records,
+    write_records,
+)
+
+RECORDS = (
+    Record(0x0000, 0xC12345, 0x80, array("H", (0x0201, 0x00AC)), "愛"),
+    Record(0x0001, 0xC12348, None, b"\x01\x02\xac", "あい", 0),
+    Record(0x0002, 0xC1234B, None, b"\xac", "", 1),
+)
+
+
+def _write(writer_t, records=RECORDS):
+    sink = BytesIO()
+    writer = writer_t(sink)
+    for i in records:
+        if i.group is not None:
+            writer.begin_group(i.group)
+        writer.write(i)
+    writer.close()
+    return sink.getvalue()
+
+
+class WriterTestCase(unittest.TestCase):
+    """Test the writers of dqutils.writer."""
+
+    def test_text(self):
+        """Test class dqutils.writer.TextWriter."""
+
+        self.assertEqual(
+            _write(TextWriter).decode(),
+            "0000:C12345:80:愛\nGroup #0\n0001:C12348:あい\nGroup #1\n0002:C1234B:\n",
+        )
+
+    def test_jsonl(self):
+        """Test class dqutils.writer.JsonlWriter."""
+
+        objs = [json.loads(i) for i in _write(JsonlWriter).decode().splitlines()]
+        self.assertEqual(objs[0]["address"], 0xC12345)
+        self.assertEqual(objs[0]["shift"], 0x80)
+        self.assertEqual(objs[0]["text"], "愛")
+        self.assertEqual(objs[1]["codes"], [0x01, 0x02, 0xAC])
+        self.assertEqual(objs[2]["group"], 1)
+
+    def test_csv(self):
+        """Test class dqutils.writer.CsvWriter."""
+
+        lines = _write(CsvWriter).decode().splitlines()
+        self.assertEqual(lines[0], "group,id,address,shift,codes,text")
+        self.assertEqual(lines[1], ",0000,C12345,80,201 AC,愛")
+        self.assertEqual(lines[2], "0,0001,C12348,,01 02 AC,あい")
+
+    def test_binary(self):
+        """Test that records survive a round trip through the binary
+        format."""
+
+        records = list(read_records(BytesIO(_write(BinaryWriter))))
+        self.assertEqual(records, [i._replace(codes=array("H", list(i.codes))) for i in RECORDS])
+
+        with self.assertRaises(ValueError):
+            list(read_records(BytesIO(_write(BinaryWriter)[:-1])))
+
+
+class OpenSinkTestCase(unittest.TestCase):
+    """Test the output to a standard output without a file descriptor."""
+
+    def test_buffer(self):
+        """Test that the bytes go to the underlying binary buffer."""
+
+        stdout = TextIOWrapper(BytesIO(), write_through=True)
+        with patch("sys.stdout", stdout):
+            write_records(RECORDS[:1], "binary")
+        self.assertEqual(stdout.buffer.getvalue(), _write(BinaryWriter, RECORDS[:1]))
+
+    def test_text_only(self):
+        """Test a standard output which accepts text only."""
+
+        with patch("sys.stdout", StringIO()) as stdout:
+            write_records(RECORDS[:1], "text")
+        self.assertEqual(stdout.getvalue(), _write(TextWriter, RECORDS[:1]).decode())
+
+        with patch("sys.stdout", StringIO()), self.assertRaises(ValueError):
+            write_records(RECORDS[:1], "binary")